@@ -17,7 +17,82 @@ class Config:
     
     # upload limits
     MAX_FILE_MB = float(os.getenv("MAX_FILE_MB", "10"))
+    MAX_BATCH_RESUMES = int(os.getenv("MAX_BATCH_RESUMES", "500"))
+    MAX_MATRIX_JDS = int(os.getenv("MAX_MATRIX_JDS", "50"))
+    MAX_BULK_SCANS = int(os.getenv("MAX_BULK_SCANS", "10000"))
+
+    # bulk scan saves: docs per insert_many (<=20k chars of text each, so ~10MB per chunk)
+    BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+
+    # pdf backends in preference order; later ones are fallbacks
+    PDF_BACKEND = os.getenv("PDF_BACKEND", "pymupdf,pypdf,pypdf2")
+
+    # pdf extraction pool (0 workers = extract inline in the request thread)
+    PDF_WORKERS = int(os.getenv("PDF_WORKERS", "2"))
+    PDF_TIMEOUT_S = float(os.getenv("PDF_TIMEOUT_S", "20"))
+    PDF_SPLIT_PAGES = int(os.getenv("PDF_SPLIT_PAGES", "40"))
+    PDF_START_METHOD = os.getenv("PDF_START_METHOD", "forkserver")
     
+    # scan result cache (in-process LRU + shared mongo tier)
+    SCAN_CACHE_SIZE = int(os.getenv("SCAN_CACHE_SIZE", "1024"))
+    SCAN_CACHE_TTL_S = int(os.getenv("SCAN_CACHE_TTL_S", "3600"))
+    SCAN_CACHE_SHARED = os.getenv("SCAN_CACHE_SHARED", "1") == "1"
+
+    # parsed JD profiles kept in memory
+    JD_CACHE_SIZE = int(os.getenv("JD_CACHE_SIZE", "256"))
+    JD_CACHE_TTL_S = int(os.getenv("JD_CACHE_TTL_S", "86400"))
+    
+    # resume analyses kept for resume_id rescans (memory LRU + mongo with TTL)
+    RESUME_CACHE_SIZE = int(os.getenv("RESUME_CACHE_SIZE", "512"))
+    RESUME_TTL_S = int(os.getenv("RESUME_TTL_S", "2592000"))
+    RESUME_STORE_SHARED = os.getenv("RESUME_STORE_SHARED", "1") == "1"
+
+    # talent pool: per-user feature matrices kept in memory; semantic rerank cap per query;
+    # outdated feature records recomputed in the background this many at a time
+    POOL_CACHE_SIZE = int(os.getenv("POOL_CACHE_SIZE", "8"))
+    POOL_TTL_S = int(os.getenv("POOL_TTL_S", "3600"))
+    POOL_RERANK_MAX = int(os.getenv("POOL_RERANK_MAX", "1000"))
+    POOL_REFRESH_BATCH = int(os.getenv("POOL_REFRESH_BATCH", "200"))
+
+    # resume / JD bodies of saved scans: zlib level, decompressed bodies kept per worker
+    TEXT_ZLIB_LEVEL = int(os.getenv("TEXT_ZLIB_LEVEL", "6"))
+    TEXT_CACHE_SIZE = int(os.getenv("TEXT_CACHE_SIZE", "1024"))
+    TEXT_CACHE_TTL_S = int(os.getenv("TEXT_CACHE_TTL_S", "86400"))
+
+    # near-duplicate resumes on save: MinHash slots in LSH bands, Jaccard at which a copy is linked
+    DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "1") == "1"
+    DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.85"))
+    DEDUP_PERMS = int(os.getenv("DEDUP_PERMS", "128"))
+    DEDUP_BANDS = int(os.getenv("DEDUP_BANDS", "16"))
+    DEDUP_MAX_CANDIDATES = int(os.getenv("DEDUP_MAX_CANDIDATES", "50"))
+
+    # skill taxonomy file (empty = app/taxonomy.json); workers re-read it when it changes
+    TAXONOMY_PATH = os.getenv("TAXONOMY_PATH", "")
+    TAXONOMY_POLL_S = float(os.getenv("TAXONOMY_POLL_S", "5"))
+    # shared secret for /api/admin (unset = admin routes disabled)
+    ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+    # background scan jobs (0 workers = job mode off)
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_RETRY_BACKOFF_S = float(os.getenv("JOB_RETRY_BACKOFF_S", "5"))
+    JOB_LEASE_S = float(os.getenv("JOB_LEASE_S", "120"))
+    JOB_TTL_S = int(os.getenv("JOB_TTL_S", "604800"))
+    JOB_SWEEP_S = float(os.getenv("JOB_SWEEP_S", "10"))
+
+    # bcrypt cost for new hashes; cheaper stored hashes are upgraded on login
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+    # ASGI mode (asgi.py): threads serving the WSGI routes, threads for CPU work off the event loop
+    ASGI_THREADS = int(os.getenv("ASGI_THREADS", "32"))
+    CPU_WORKERS = int(os.getenv("CPU_WORKERS", str(os.cpu_count() or 2)))
+
+    # stage timing histograms (/api/metrics) and Server-Timing headers
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+    # shared secret for /api/metrics (unset = ADMIN_TOKEN; both unset = endpoint disabled)
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
     # semantic scoring feature flag
     USE_SEMANTIC = os.getenv("USE_SEMANTIC", "1") == "1"
     
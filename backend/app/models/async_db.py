@@ -0,0 +1,32 @@
+"""
+Motor (asyncio) handles for the ASGI fast paths in app/routes/async_api.py.
+
+Same database as get_db(): the name is taken from the PyMongo handle that
+run.py stores in app.config, so both drivers always agree. The client is
+created on first use inside the running event loop, once per process.
+"""
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.services import metrics
+
+_client = None
+_db = None
+
+
+def get_async_db(app):
+    global _client, _db
+    if _db is None:
+        listeners = [metrics.MongoTimingListener()] if metrics.ENABLED else []
+        _client = AsyncIOMotorClient(app.config["MONGO_URI"], event_listeners=listeners)
+        _db = _client[app.config["MONGO_DB"].name]
+    return _db
+
+
+def users_col_async(app):
+
+    return get_async_db(app)["users"]
+
+
+def scans_col_async(app):
+
+    return get_async_db(app)["scans"]
@@ -1,31 +1,125 @@
+import logging
+
 from flask import current_app
-from pymongo import ASCENDING
+from pymongo import ASCENDING, DESCENDING
+
+from app.config import Config
+
+log = logging.getLogger("resume_backend")
 
 
 def get_db():
-   
+
     return current_app.config["MONGO_DB"]
 
 
 def users_col():
-    
-    return get_db()["users"]
 
+    return get_db()["users"]
 
-def ensure_indexes():
-   
-    db = get_db()
 
-    # unique usernames for auth
-    db.users.create_index(
-        [("username", ASCENDING)],
-        unique=True,
-        name="uniq_username",
-    )
 def scans_col():
+
     return get_db()["scans"]
 
-    db.scans.create_index([("user_id",1),("created_at",-1)], name="idx_scans_user_created")
 
-   
-    
\ No newline at end of file
+def scan_cache_col():
+
+    return get_db()["scan_cache"]
+
+
+def postings_col():
+
+    return get_db()["postings"]
+
+
+def resume_analyses_col():
+
+    return get_db()["resume_analyses"]
+
+
+def scan_jobs_col():
+
+    return get_db()["scan_jobs"]
+
+
+# every query path has an index here: (collection, keys, options incl. a unique name)
+INDEXES = [
+    # auth: login / register look up by username
+    ("users", [("username", ASCENDING)], {"name": "uniq_username", "unique": True}),
+    # history: list_scans filters by user, keyset-paged on (created_at, _id) newest first
+    ("scans", [("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+     {"name": "idx_scans_user_created_id"}),
+    # skill search over saved scans (multikey on skills)
+    ("scans", [("user_id", ASCENDING), ("skills", ASCENDING), ("created_at", DESCENDING)],
+     {"name": "idx_scans_user_skills_created"}),
+    # near-duplicate lookup on save: scans sharing an LSH band key (multikey on lsh)
+    ("scans", [("user_id", ASCENDING), ("lsh", ASCENDING)], {"name": "idx_scans_user_lsh"}),
+    # ?dedup=1 history (dup_of null), copy counts and listings per cluster root
+    ("scans", [("user_id", ASCENDING), ("dup_of", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+     {"name": "idx_scans_user_dup_created_id"}),
+    # talent pool: a user's feature records in save (_id) order, topped up past the last _id held
+    ("scans", [("user_id", ASCENDING), ("_id", ASCENDING)], {"name": "idx_scans_user_id"}),
+    # shared scan result cache; mongo drops entries once they pass the TTL
+    ("scan_cache", [("created_at", ASCENDING)],
+     {"name": "ttl_scan_cache", "expireAfterSeconds": Config.SCAN_CACHE_TTL_S}),
+    # registered job postings, listed per user; one posting per (user, JD hash)
+    ("postings", [("user_id", ASCENDING), ("created_at", DESCENDING)], {"name": "idx_postings_user_created"}),
+    ("postings", [("user_id", ASCENDING), ("jd_hash", ASCENDING)],
+     {"name": "uniq_postings_user_hash", "unique": True}),
+    # per-resume analyses behind resume_id rescans; looked up by _id, dropped after the TTL
+    ("resume_analyses", [("created_at", ASCENDING)],
+     {"name": "ttl_resume_analyses", "expireAfterSeconds": Config.RESUME_TTL_S}),
+    # background scan jobs: the sweeper looks for due/expired work; finished jobs expire
+    ("scan_jobs", [("status", ASCENDING), ("run_after", ASCENDING)], {"name": "idx_scan_jobs_status_due"}),
+    ("scan_jobs", [("expires_at", ASCENDING)], {"name": "ttl_scan_jobs", "expireAfterSeconds": 0}),
+]
+
+
+# superseded registry entries, dropped before their replacement (same keys) is built
+RETIRED_INDEXES = [
+    ("postings", "idx_postings_user_hash"),
+]
+
+
+def _existing(db) -> dict:
+    # collection -> set of index names already on the server
+    out = {}
+    for coll in {c for c, _, _ in INDEXES}:
+        out[coll] = set(db[coll].index_information())
+    return out
+
+
+def ensure_indexes() -> dict:
+    """Create any registry index that is missing. Returns {"created": [...], "present": [...], "failed": [...]}."""
+    db = get_db()
+    have = _existing(db)
+    report = {"created": [], "present": [], "failed": []}
+    for coll, old in RETIRED_INDEXES:
+        if old in have.get(coll, ()):
+            try:
+                db[coll].drop_index(old)
+                log.info("index_dropped index=%s.%s", coll, old)
+            except Exception as e:
+                log.warning("index_drop_failed index=%s.%s error=%s", coll, old, e)
+    for coll, keys, opts in INDEXES:
+        name = f"{coll}.{opts['name']}"
+        if opts["name"] in have[coll]:
+            report["present"].append(name)
+            continue
+        try:
+            db[coll].create_index(keys, **opts)
+            report["created"].append(name)
+            log.info("index_created index=%s", name)
+        except Exception as e:
+            # e.g. an index with the same keys but different options already exists
+            report["failed"].append(name)
+            log.warning("index_create_failed index=%s error=%s", name, e)
+    log.info("indexes_checked created=%d present=%d failed=%d",
+             len(report["created"]), len(report["present"]), len(report["failed"]))
+    return report
+
+
+def missing_indexes() -> list[str]:
+    have = _existing(get_db())
+    return [f"{c}.{o['name']}" for c, _, o in INDEXES if o["name"] not in have[c]]
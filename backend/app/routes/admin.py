@@ -0,0 +1,52 @@
+from flask import Blueprint, request, current_app
+import hmac
+import logging
+
+from app.services import taxonomy
+from app.utils.responses import ok, fail
+
+admin_bp = Blueprint("admin", __name__, url_prefix="/api/admin")
+log = logging.getLogger("resume_backend")
+
+
+@admin_bp.before_request
+def _require_admin():
+    token = current_app.config.get("ADMIN_TOKEN") or ""
+    if not token:
+        return fail("admin routes are disabled", 403)
+    if not hmac.compare_digest(request.headers.get("X-Admin-Token", ""), token):
+        return fail("forbidden", 403)
+
+
+@admin_bp.get("/taxonomy")
+def get_taxonomy():
+    """Loaded version and counts; ?full=1 includes the taxonomy itself."""
+    tax = taxonomy.current()
+    extra = {"taxonomy": tax.to_dict()} if request.args.get("full") == "1" else {}
+    return ok("taxonomy", **tax.summary(), **extra)
+
+
+@admin_bp.post("/taxonomy/reload")
+def reload_taxonomy():
+    """Re-read the taxonomy file now (other workers follow within TAXONOMY_POLL_S)."""
+    try:
+        tax, changed = taxonomy.reload()
+    except Exception as e:
+        log.error("taxonomy_reload_failed error=%s", e)
+        return fail("could not load taxonomy", 422, details=str(e))
+    return ok("reloaded" if changed else "unchanged", changed=changed, **tax.summary())
+
+
+@admin_bp.put("/taxonomy")
+def put_taxonomy():
+    """Replace the taxonomy file (validated, written atomically) and load it."""
+    data = request.get_json(silent=True)
+    try:
+        before = taxonomy.current().version
+        tax = taxonomy.save(data)
+    except ValueError as e:
+        return fail("invalid taxonomy", 422, details=str(e))
+    except OSError as e:
+        return fail("could not write taxonomy", 500, details=str(e))
+    log.info("taxonomy_replaced version=%s previous=%s", tax.version, before)
+    return ok("saved", changed=tax.version != before, **tax.summary())
@@ -0,0 +1,290 @@
+"""
+Native async handlers for the hot users/scans paths, mounted by asgi.py.
+
+Under `uvicorn asgi:application` these requests hold no thread while they
+wait on Mongo: queries go through Motor, and bcrypt / skill extraction run
+on the CPU pool (app.services.offload). Bodies, status codes, CORS and
+Server-Timing headers match the Flask routes, which share their input
+helpers. Every other request (uploads, scoring, jobs, admin, OPTIONS) falls
+through to the Flask app on its bounded thread pool.
+"""
+import json
+import logging
+import re
+import time
+from datetime import timedelta
+from urllib.parse import parse_qs
+
+from bson import ObjectId
+from flask import jsonify
+from flask_jwt_extended import create_access_token, decode_token
+from jwt import ExpiredSignatureError
+from pymongo.errors import DuplicateKeyError
+
+from app.models.async_db import get_async_db, scans_col_async, users_col_async
+from app.routes.auth import credentials, registration_problem, rehash_update
+from app.routes.scans import (
+    _DEDUP_PROJECTION, _SUMMARY_PROJECTION, _dup_fields, _full, dedup_query, duplicate_counts_pipeline,
+    history_page, link_duplicates, list_query, save_inputs, scan_doc,
+)
+from app.services import metrics, taxonomy, text_store
+from app.services.offload import run_cpu
+from app.services.passwords import hash_password, verify
+from app.utils.responses import created, fail, ok
+
+log = logging.getLogger("resume_backend")
+
+
+class _Request:
+    __slots__ = ("method", "path", "args", "headers", "body", "params")
+
+    def __init__(self, scope: dict, body: bytes, params: dict):
+        self.method = scope["method"]
+        self.path = scope["path"]
+        qs = parse_qs(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)
+        self.args = {k: v[0] for k, v in qs.items()}  # first value wins, like request.args.get
+        self.headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+        self.body = body
+        self.params = params
+
+    def json(self) -> dict:
+        # request.get_json(silent=True) or {}
+        if "application/json" not in self.headers.get("content-type", ""):
+            return {}
+        try:
+            data = json.loads(self.body or b"null")
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+
+def _identity(app, req: _Request):
+    """(user id, None) or (None, error response) with flask-jwt-extended's default bodies."""
+    auth = req.headers.get("authorization")
+    if not auth:
+        return None, (jsonify(msg="Missing Authorization Header"), 401)
+    scheme, _, token = auth.partition(" ")
+    if scheme != "Bearer" or not token:
+        return None, (jsonify(msg="Bad Authorization header. Expected 'Authorization: Bearer <JWT>'"), 422)
+    try:
+        claims = decode_token(token)
+    except ExpiredSignatureError:
+        return None, (jsonify(msg="Token has expired"), 401)
+    except Exception as e:
+        return None, (jsonify(msg=str(e)), 422)
+    if claims.get("type") != "access":
+        return None, (jsonify(msg="Only non-refresh tokens are allowed"), 422)
+    return claims[app.config["JWT_IDENTITY_CLAIM"]], None
+
+
+# ------------------ users ------------------
+async def register(app, req):
+    username, password = credentials(req.json())
+    problem = registration_problem(username, password)
+    if problem:
+        return fail(problem, 422)
+
+    try:
+        with metrics.timed("bcrypt_hash"):
+            password_hash = await run_cpu(hash_password, password)
+        await users_col_async(app).insert_one({"username": username, "password_hash": password_hash})
+    except DuplicateKeyError:
+        return fail("username already exists", 409)
+    except Exception as e:
+        log.exception("db_insert_error collection=users username=%s", username)
+        return fail("could not register user", 500, details=str(e))
+
+    log.info("user_registered username=%s", username)
+    return created("registered", username=username)
+
+
+async def login(app, req):
+    username, password = credentials(req.json())
+    if not username or not password:
+        return fail("username and password are required", 422)
+
+    users = users_col_async(app)
+    user = await users.find_one({"username": username})
+    if not user:
+        log.info("login_no_user username=%s", username)
+        return fail("invalid credentials", 401)
+
+    try:
+        with metrics.timed("bcrypt_verify"):
+            ok_hash, new_hash = await run_cpu(verify, password, user.get("password_hash", ""))
+    except Exception:
+        log.exception("bcrypt_verify_error username=%s", username)
+        return fail("server error verifying password", 500)
+
+    if not ok_hash:
+        log.info("login_bad_password username=%s", username)
+        return fail("invalid credentials", 401)
+    if new_hash:
+        try:
+            await users.update_one(*rehash_update(user, new_hash))
+            log.info("password_rehashed user_id=%s", user["_id"])
+        except Exception as e:
+            log.warning("password_rehash_failed user_id=%s error=%s", user["_id"], e)
+
+    token = create_access_token(identity=str(user["_id"]), expires_delta=timedelta(hours=8))
+    log.info("user_login_success username=%s", username)
+    return ok("login successful", access_token=token)
+
+
+# ------------------ scans ------------------
+async def save_scan(app, req, uid):
+    resume_text, jd_text, result = save_inputs(req.json())
+    if not resume_text or not jd_text or not isinstance(result, dict):
+        return fail("resume_text, jd_text and result are required", 422)
+    try:
+        # summary fields run the skill matcher: CPU work, kept off the loop
+        doc = await run_cpu(scan_doc, uid, resume_text, jd_text, result)
+        col = scans_col_async(app)
+        q = dedup_query(uid, [doc])
+        candidates = []
+        if q is not None:
+            try:
+                limit = app.config["DEDUP_MAX_CANDIDATES"]
+                candidates = await col.find(q, _DEDUP_PROJECTION).limit(limit).to_list(limit)
+            except Exception as e:
+                log.warning("dedup_lookup_failed count=1 error=%s", e)
+        link_duplicates([doc], candidates, app.config["DEDUP_THRESHOLD"])
+        await text_store.save_async(get_async_db(app), text_store.pack([doc]))
+        ins = await col.insert_one(doc)
+        return created("saved", id=str(ins.inserted_id), **_dup_fields(doc))
+    except Exception as e:
+        return fail("could not save scan", 500, details=str(e))
+
+
+async def list_scans(app, req, uid):
+    try:
+        q, limit, full = list_query(uid, req.args)
+    except ValueError as e:
+        return fail(str(e), 422)
+    try:
+        col = scans_col_async(app)
+        cur = (col
+               .find(q, None if full else _SUMMARY_PROJECTION)
+               .sort([("created_at", -1), ("_id", -1)])
+               .limit(limit + 1))
+        docs = await cur.to_list(limit + 1)
+        if full:
+            await text_store.hydrate_async(get_async_db(app), docs[:limit])
+        dups = None
+        if "dup_of" in q and q["dup_of"] is None and docs:  # ?dedup=1: count each root's copies
+            rows = await col.aggregate(duplicate_counts_pipeline(uid, docs[:limit])).to_list(None)
+            dups = {r["_id"]: r["n"] for r in rows}
+        items, next_cursor = history_page(docs, limit, full, dups)
+        return ok("fetched", items=items, next_cursor=next_cursor)
+    except Exception as e:
+        return fail("could not list scans", 500, details=str(e))
+
+
+async def get_scan(app, req, uid):
+    try:
+        d = await scans_col_async(app).find_one({"_id": ObjectId(req.params["scan_id"]), "user_id": ObjectId(uid)})
+    except Exception as e:
+        return fail("could not load scan", 400, details=str(e))
+    if not d:
+        return fail("scan not found", 404)
+    try:
+        await text_store.hydrate_async(get_async_db(app), [d])
+    except Exception as e:
+        return fail("could not load scan", 500, details=str(e))
+    return ok("fetched", **_full(d))
+
+
+# (method, path pattern, handler, route label, needs jwt); /api/scans/search stays on Flask
+ROUTES = [
+    ("POST", re.compile(r"/api/auth/register"), register, "/api/auth/register", False),
+    ("POST", re.compile(r"/api/auth/login"), login, "/api/auth/login", False),
+    ("POST", re.compile(r"/api/scans/"), save_scan, "/api/scans/", True),
+    ("GET", re.compile(r"/api/scans/"), list_scans, "/api/scans/", True),
+    ("GET", re.compile(r"/api/scans/(?P<scan_id>(?!search$)[^/]+)"), get_scan, "/api/scans/<scan_id>", True),
+]
+
+
+class AsyncRoutes:
+    """ASGI app: ROUTES are served natively, anything else goes to `fallback` (the wrapped Flask app)."""
+
+    def __init__(self, app, fallback, allowed_origins: set, norm_origin):
+        self.app = app
+        self.fallback = fallback
+        self.allowed_origins = allowed_origins
+        self.norm_origin = norm_origin
+        self.max_body = int(app.config.get("MAX_CONTENT_LENGTH") or 16 * 1024 * 1024)
+
+    def _match(self, method: str, path: str):
+        for m, pattern, handler, label, auth in ROUTES:
+            if m == method:
+                hit = pattern.fullmatch(path)
+                if hit:
+                    return handler, label, auth, hit.groupdict()
+        return None
+
+    async def __call__(self, scope, receive, send):
+        route = self._match(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if route is None:
+            return await self.fallback(scope, receive, send)
+
+        t0 = time.perf_counter()
+        handler, label, auth, params = route
+        body = await self._read_body(receive)
+        if body is None:
+            status, payload, headers = 413, b'{"message":"request body too large","status":"error"}\n', {}
+        else:
+            taxonomy.maybe_reload()
+            req = _Request(scope, body, params)
+            with self.app.app_context():
+                if auth:
+                    uid, err = _identity(self.app, req)
+                    rv = err or await handler(self.app, req, uid)
+                else:
+                    rv = await handler(self.app, req)
+                resp, status = rv
+                payload = resp.get_data()
+            headers = {}
+
+        total = time.perf_counter() - t0
+        if metrics.ENABLED:
+            metrics.ROUTES.observe((label, scope["method"], str(status)), total)
+            headers["Server-Timing"] = f"total;dur={total * 1000:.2f}"
+        headers.update(self._cors(scope))
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())]
+                       + [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        })
+        await send({"type": "http.response.body", "body": payload})
+
+    async def _read_body(self, receive) -> bytes | None:
+        chunks, size = [], 0
+        while True:
+            msg = await receive()
+            if msg["type"] == "http.disconnect":
+                break
+            chunk = msg.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body:
+                return None
+            chunks.append(chunk)
+            if not msg.get("more_body"):
+                break
+        return b"".join(chunks)
+
+    def _cors(self, scope) -> dict:
+        # same headers as run.py's _add_cors_headers + flask-cors' expose list
+        origin = None
+        for k, v in scope["headers"]:
+            if k.lower() == b"origin":
+                origin = self.norm_origin(v.decode("latin-1"))
+        if origin not in self.allowed_origins:
+            return {}
+        return {
+            "Access-Control-Allow-Origin": origin,
+            "Vary": "Origin",
+            "Access-Control-Allow-Headers": "Authorization, Content-Type, X-Admin-Token",
+            "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
+            "Access-Control-Expose-Headers": "Authorization, X-Cache, X-Cache-Tier, Server-Timing",
+        }
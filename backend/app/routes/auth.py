@@ -1,9 +1,12 @@
 from flask import Blueprint, request, current_app
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-from passlib.hash import bcrypt
+from pymongo.errors import DuplicateKeyError
 from datetime import timedelta
 from app.models.db import users_col
 from app.utils.responses import ok, created, fail
+from app.services.metrics import timed
+from app.services.offload import call_cpu
+from app.services.passwords import hash_password, verify
 import logging
 import os
 
@@ -14,28 +17,39 @@ log: logging.Logger = logging.getLogger("resume_backend")
 def _payload():
     return request.get_json(silent=True) or {}
 
-# ------------------ REGISTER ------------------
-@auth_bp.post("/register")
-def register():
-    data = _payload()
-    username = (data.get("username") or "").strip().lower()
-    password = (data.get("password") or "").strip()  # trim to avoid trailing-space trap
 
+def credentials(data: dict) -> tuple[str, str]:
+    # usernames are case-insensitive; trim the password to avoid the trailing-space trap
+    return (data.get("username") or "").strip().lower(), (data.get("password") or "").strip()
+
+
+def registration_problem(username: str, password: str) -> str | None:
     if not username:
-        return fail("username is required", 422)
+        return "username is required"
     if not password:
-        return fail("password is required", 422)
+        return "password is required"
     if len(password) < 8:
-        return fail("password must be at least 8 characters", 422)
+        return "password must be at least 8 characters"
+    return None
 
-    if users_col().find_one({"username": username}):
-        return fail("username already exists", 409)
+# ------------------ REGISTER ------------------
+@auth_bp.post("/register")
+def register():
+    username, password = credentials(_payload())
+    problem = registration_problem(username, password)
+    if problem:
+        return fail(problem, 422)
 
     try:
+        with timed("bcrypt_hash"):
+            password_hash = call_cpu(hash_password, password)
+        # one write: the uniq_username index rejects a taken name, even under a race
         users_col().insert_one({
             "username": username,
-            "password_hash": bcrypt.hash(password)
+            "password_hash": password_hash
         })
+    except DuplicateKeyError:
+        return fail("username already exists", 409)
     except Exception as e:
         log.exception("db_insert_error collection=users username=%s", username)
         return fail("could not register user", 500, details=str(e))
@@ -44,11 +58,23 @@ def register():
     return created("registered", username=username)
 
 # ------------------ LOGIN ------------------
+def rehash_update(user: dict, new_hash: str) -> tuple[dict, dict]:
+    # only if the hash is still the one we verified (a password change in between wins)
+    return {"_id": user["_id"], "password_hash": user.get("password_hash")}, {"$set": {"password_hash": new_hash}}
+
+
+def rehash(col, user: dict, new_hash: str):
+    try:
+        col.update_one(*rehash_update(user, new_hash))
+        log.info("password_rehashed user_id=%s", user["_id"])
+    except Exception as e:
+        # the old hash still works; try again next login
+        log.warning("password_rehash_failed user_id=%s error=%s", user["_id"], e)
+
+
 @auth_bp.post("/login")
 def login():
-    data = _payload()
-    username = (data.get("username") or "").strip().lower()
-    password = (data.get("password") or "").strip()  # trim here too
+    username, password = credentials(_payload())
 
     if not username or not password:
         return fail("username and password are required", 422)
@@ -59,7 +85,8 @@ def login():
         return fail("invalid credentials", 401)
 
     try:
-        ok_hash = bcrypt.verify(password, user.get("password_hash", ""))
+        with timed("bcrypt_verify"):
+            ok_hash, new_hash = call_cpu(verify, password, user.get("password_hash", ""))
     except Exception:
         log.exception("bcrypt_verify_error username=%s", username)
         return fail("server error verifying password", 500)
@@ -67,6 +94,8 @@ def login():
     if not ok_hash:
         log.info("login_bad_password username=%s", username)
         return fail("invalid credentials", 401)
+    if new_hash:
+        rehash(users_col(), user, new_hash)
 
     token = create_access_token(identity=str(user["_id"]), expires_delta=timedelta(hours=8))
     log.info("user_login_success username=%s", username)
@@ -101,5 +130,5 @@ if DEV_TOOLS:
         new_pw = (data.get("new_password") or "").strip()
         if not username or len(new_pw) < 8:
             return fail("username and new_password required (>=8 chars)", 422)
-        users_col().update_one({"username": username}, {"$set": {"password_hash": bcrypt.hash(new_pw)}})
+        users_col().update_one({"username": username}, {"$set": {"password_hash": hash_password(new_pw)}})
         return ok("password reset", username=username)
@@ -0,0 +1,189 @@
+from flask import Blueprint, request, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from bson import Binary, ObjectId
+from pymongo.errors import DuplicateKeyError
+import time
+
+from app.models.db import get_db, scan_jobs_col, scans_col
+from app.routes.scan import (
+    _SCAN_CACHE, _clean, _pdf_to_text, _resolve_jd, _score_resume, job_profile, scan_cache_version,
+)
+from app.routes.scans import scan_doc
+from app.services import text_store
+from app.services.cache import ScanResultCache
+from app.services.jobs import DONE, FAILED, PermanentError, QueueFull, from_config
+from app.utils.responses import created, ok, fail
+
+jobs_bp = Blueprint("scan_jobs", __name__, url_prefix="/api/scan/jobs")
+
+_PDF_TYPES = ("application/pdf", "application/x-pdf")
+
+
+# -------- worker side --------
+def run_scan_job(app, job: dict) -> dict:
+    """Extract + score one job and store it as a saved scan. The scan reuses the job id, so a retry never saves twice."""
+    inp = job["input"]
+    jd_text = inp["jd_text"]
+    profile = job_profile(jd_text)
+    pdf = inp.get("pdf")
+    key = ScanResultCache.key(bytes(pdf) if pdf is not None else inp["resume_text"], jd_text, scan_cache_version())
+    if pdf is not None:
+        try:
+            resume_text = _pdf_to_text(bytes(pdf))
+        except Exception as e:
+            if "timed out" in str(e):
+                raise  # pool was busy; worth another attempt
+            raise PermanentError(str(e))
+    else:
+        resume_text = inp["resume_text"]
+
+    result, _ = _SCAN_CACHE.get(key)
+    if result is None:
+        result = _score_resume(resume_text, profile)
+        _SCAN_CACHE.set(key, result)
+
+    doc = {**scan_doc(job["user_id"], resume_text, jd_text, result, "pdf" if pdf is not None else "text"),
+           "_id": job["_id"]}
+    text_store.save(get_db(), text_store.pack([doc]))
+    try:
+        scans_col().insert_one(doc)
+    except DuplicateKeyError:
+        pass  # saved by an earlier attempt that died before marking the job done
+    return {"scan_id": job["_id"], "score": result["score"]}
+
+
+QUEUE = from_config(run_scan_job)
+
+
+# -------- routes --------
+def _job_inputs():
+    """
+    Returns (jd_text, inputs, error). inputs are (label, input dict | None, error | None).
+    JSON: {"jd_text" | "posting_id", "resume_text": "..."} or {"resumes": ["text", {"id", "resume_text"}]}
+    multipart: jd_text (or posting_id) + one "file" or several "files" PDFs
+    """
+    items = []
+    max_n = int(current_app.config.get("MAX_BATCH_RESUMES", 500))
+    if request.content_type and "multipart/form-data" in request.content_type:
+        jd_text = _clean(request.form.get("jd_text"))
+        posting_id = request.form.get("posting_id")
+        files = request.files.getlist("files") or request.files.getlist("file")
+        if not files or not (jd_text or posting_id):
+            return None, items, fail("pdf file(s) and jd_text (or posting_id) are required", 422)
+        if len(files) > max_n:
+            return None, items, fail(f"too many resumes (>{max_n})", 413)
+        max_mb = float(current_app.config.get("MAX_FILE_MB", 10))
+        for i, f in enumerate(files):
+            label = f.filename or str(i)
+            data = f.read()
+            if len(data) > max_mb * 1024 * 1024:
+                items.append((label, None, f"file too large (>{max_mb}MB)"))
+            elif f.mimetype not in _PDF_TYPES:
+                items.append((label, None, "only PDF files are allowed"))
+            else:
+                items.append((label, {"pdf": Binary(data), "filename": f.filename}, None))
+    else:
+        data = request.get_json(silent=True) or {}
+        jd_text = _clean(data.get("jd_text"))
+        posting_id = data.get("posting_id")
+        resumes = data.get("resumes")
+        if resumes is None and data.get("resume_text") is not None:
+            resumes = [data.get("resume_text")]
+        if not (jd_text or posting_id) or not isinstance(resumes, list) or not resumes:
+            return None, items, fail("resume_text (or resumes) and jd_text (or posting_id) are required", 422)
+        if len(resumes) > max_n:
+            return None, items, fail(f"too many resumes (>{max_n})", 413)
+        for i, r in enumerate(resumes):
+            label, text = (str(r.get("id") or i), r.get("resume_text")) if isinstance(r, dict) else (str(i), r)
+            text = _clean(text) if isinstance(text, str) else ""
+            items.append((label, {"resume_text": text}, None) if text else (label, None, "resume_text is required"))
+
+    # resolved now: posting lookups need the caller's identity, workers only see jd_text
+    profile, err = _resolve_jd(jd_text, posting_id)
+    if err:
+        return None, items, err
+    return profile.jd_text, items, None
+
+
+@jobs_bp.post("/")
+@jwt_required()
+def submit_jobs():
+    if QUEUE.workers <= 0:
+        return fail("scan jobs are disabled", 503)
+    QUEUE.start(current_app._get_current_object())
+
+    jd_text, items, err = _job_inputs()
+    if err:
+        return err
+    valid = [it for it in items if not it[2]]
+    if len(valid) > QUEUE.free():
+        # all or nothing, so a client retry doesn't duplicate half a batch
+        body, _ = fail("job queue is full, retry later", 503)
+        return body, 503, {"Retry-After": str(max(1, int(QUEUE.sweep_s)))}
+
+    uid = ObjectId(get_jwt_identity())
+    jobs, errors = [], [{"id": label, "error": e} for label, _, e in items if e]
+    for label, inp, _ in valid:
+        try:
+            job_id = QUEUE.submit({"user_id": uid, "input": {**inp, "jd_text": jd_text}})
+            jobs.append({"id": label, "job_id": str(job_id), "status": "queued"})
+        except QueueFull:
+            errors.append({"id": label, "error": "job queue is full"})
+        except Exception as e:
+            errors.append({"id": label, "error": f"could not queue job: {e}"})
+
+    body, _ = created("jobs queued", jobs=jobs, errors=errors)
+    return body, 202
+
+
+def _job_view(d: dict) -> dict:
+    out = {
+        "job_id": str(d["_id"]),
+        "status": d["status"],
+        "attempts": d.get("attempts", 0),
+        "created_at": d["created_at"].isoformat() + "Z",
+        "updated_at": d["updated_at"].isoformat() + "Z",
+    }
+    if d.get("error"):
+        out["error"] = d["error"]
+    if d["status"] == DONE:
+        out["scan_id"] = str(d["scan_id"])
+        out["score"] = d.get("score")
+    return out
+
+
+# a sync worker is held for the whole wait, so long-polling stays short; clients poll
+_MAX_WAIT_S = 2.0
+
+
+@jobs_bp.get("/<job_id>")
+@jwt_required()
+def get_job(job_id: str):
+    """
+    Job status. ?wait=N waits up to N seconds (max 2) for the job to finish;
+    clients poll until status is done or failed (Retry-After says when).
+    Finished jobs include the saved scan's result (skip it with ?result=0).
+    """
+    try:
+        q = {"_id": ObjectId(job_id), "user_id": ObjectId(get_jwt_identity())}
+        wait = max(0.0, min(float(request.args.get("wait", 0)), _MAX_WAIT_S))
+    except Exception as e:
+        return fail("invalid job id or wait", 422, details=str(e))
+
+    projection = {"input": 0}
+    deadline = time.monotonic() + wait
+    d = scan_jobs_col().find_one(q, projection)
+    while d and d["status"] not in (DONE, FAILED) and time.monotonic() < deadline:
+        time.sleep(0.25)
+        d = scan_jobs_col().find_one(q, projection)
+    if not d:
+        return fail("job not found", 404)
+
+    view = _job_view(d)
+    if d["status"] == DONE and request.args.get("result", "1") != "0":
+        s = scans_col().find_one({"_id": d["scan_id"]}, {"result": 1})
+        view["result"] = (s or {}).get("result")
+    body, code = ok("fetched", **view)
+    if d["status"] not in (DONE, FAILED):
+        return body, code, {"Retry-After": "1"}
+    return body, code
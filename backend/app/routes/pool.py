@@ -0,0 +1,230 @@
+from flask import Blueprint, current_app, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from pymongo import UpdateOne
+from bson import ObjectId
+import logging
+import threading
+import time
+
+from app.config import Config
+from app.models.db import get_db, scans_col
+from app.routes.scan import (
+    USE_SEMANTIC, _SEM_FULL_AT, _chunks, _clean, _resolve_jd, _semantic_sims, analysis_text, analyze_resume,
+    grid_breakdown, grid_scores, jd_arrays, np, pool_features, taxonomy_version,
+)
+from app.services import taxonomy, text_store
+from app.services.cache import TTLCache
+from app.services.metrics import timed
+from app.utils.responses import ok, fail
+
+pool_bp = Blueprint("pool", __name__, url_prefix="/api/pool")
+log = logging.getLogger("resume_backend")
+
+# user id + taxonomy version -> (TalentPool, scans covered, last _id read, built with outdated records)
+_POOLS = TTLCache(maxsize=Config.POOL_CACHE_SIZE, ttl=Config.POOL_TTL_S)
+_POOL_LOCK = threading.Lock()
+_REFRESHING = set()  # user ids whose outdated feature records are being recomputed
+_REFRESH_LOCK = threading.Lock()
+
+
+def _feature_rows(col, q: dict, version: str, key_tag: str) -> tuple:
+    """
+    (rows, outdated ids, scans read, last _id) for matching scans in save order.
+    rows are (scan _id, features); a record from an older scoring version is
+    served as it is until refresh_features rewrites it, but only when it was
+    built on the same key_index (key positions are its bits / columns). Other
+    scans are left out until then.
+    """
+    rows, stale, n, last = [], [], 0, None
+    for d in col.find(q, {"features": 1}).sort("_id", 1):
+        n, last = n + 1, d["_id"]
+        f = d.get("features")
+        if f and f.get("version") == version:
+            rows.append((d["_id"], f))
+            continue
+        stale.append(d["_id"])
+        if f and f.get("keys") == key_tag:
+            rows.append((d["_id"], f))
+    return rows, stale, n, last
+
+
+def refresh_features(col, ids: list, version: str) -> int:
+    """Recompute the feature records of scans `ids`, POOL_REFRESH_BATCH at a time, writing each batch back."""
+    done = 0
+    for block in _chunks(ids, max(1, Config.POOL_REFRESH_BATCH)):
+        docs = list(col.find({"_id": {"$in": block}, "features.version": {"$ne": version}},
+                             {"resume_text": 1, "resume_ref": 1, "resume_source": 1}))
+        text_store.hydrate(col.database, docs, ("resume_text",))
+        ops = [UpdateOne({"_id": d["_id"]}, {"$set": {"features": pool_features(analyze_resume(
+            analysis_text(d.get("resume_text", ""), d.get("resume_source", "text"))))}}) for d in docs]
+        if ops:
+            col.bulk_write(ops, ordered=False)
+        done += len(ops)
+    log.info("pool_features_recomputed count=%d", done)
+    return done
+
+
+def _refresh_later(uid: str, ids: list, version: str):
+    # one background refresh per user; pool requests keep serving the old records meanwhile
+    with _REFRESH_LOCK:
+        if uid in _REFRESHING:
+            return
+        _REFRESHING.add(uid)
+    app = current_app._get_current_object()
+
+    def run():
+        try:
+            with app.app_context():
+                refresh_features(scans_col(), ids, version)
+        except Exception as e:
+            log.warning("pool_features_refresh_failed user=%s count=%d error=%s", uid, len(ids), e)
+        finally:
+            with _REFRESH_LOCK:
+                _REFRESHING.discard(uid)
+
+    threading.Thread(target=run, name="pool-refresh", daemon=True).start()
+
+
+def load_pool(uid: str):
+    """
+    The caller's pool, topped up with scans saved since it was built. Outdated
+    feature records (after a taxonomy or weight change) are recomputed in the
+    background; the pool is rebuilt from them once that finishes.
+    """
+    from app.services.talent_pool import TalentPool  # numpy only loads when the pool is used
+
+    version = taxonomy_version()
+    tax = taxonomy.active()
+    nkeys = len(tax.key_index)
+    key = f"{uid}:{version}"
+    q = {"user_id": ObjectId(uid)}
+    col = scans_col()
+    with _POOL_LOCK:  # one build at a time per worker; a warm pool costs a count + one indexed find
+        hit = _POOLS.get(key)
+        total = col.count_documents(q)
+        if hit is not None and hit[3] and uid not in _REFRESHING:
+            hit = None  # its outdated records have been rewritten since
+        if hit is not None and hit[1] >= total:
+            return hit[0]
+        pool, seen, last, partial = hit or (TalentPool(version, nkeys), 0, None, False)
+        rows, stale, n, newest = _feature_rows(col, {**q, "_id": {"$gt": last}} if last is not None else q,
+                                               version, tax.key_tag)
+        if seen + n < total:
+            # a save landed with an older _id than the newest we hold: start over
+            pool, seen, last, partial = TalentPool(version, nkeys), 0, None, False
+            rows, stale, n, newest = _feature_rows(col, q, version, tax.key_tag)
+        pool = pool.extended(rows)
+        if stale:
+            _refresh_later(uid, stale, version)
+        _POOLS.set(key, (pool, seen + n, newest or last, partial or bool(stale)))
+        return pool
+
+
+def _pool_grid(pool, jd: dict, profile, rows=None, sem=None) -> dict:
+    """grid_scores for the pool (or a subset of its rows) against one JD."""
+    m_req = pool.matches(pool.mask(jd["req"][0]))
+    m_opt = pool.matches(pool.mask(jd["opt"][0]))
+    m_union = pool.matches(pool.mask(jd["union"][0]))
+    d_raw = pool.distribution_raw(jd["w"][0])
+    title = pool.title_hits(profile.title)
+    years = pool.years
+    if rows is not None:
+        m_req, m_opt, m_union, d_raw, title, years = (a[rows] for a in (m_req, m_opt, m_union, d_raw, title, years))
+    col = lambda a: a[:, None]  # noqa: E731  one JD column
+    return grid_scores(col(m_req), col(m_opt), col(m_union), col(d_raw), col(title), years, jd,
+                       None if sem is None else col(sem))
+
+
+def _top(scores, k: int):
+    # best first; ties keep pool (save) order
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    part = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+    return part[np.lexsort((part, -scores[part]))]
+
+
+def rank_pool(pool, profile, k: int) -> tuple[list, bool]:
+    """
+    Top-k of the pool against a JD as ([(row, score, breakdown)], exact). With
+    semantic scoring on, the lexical rubric bounds each resume's final score;
+    only rows whose upper bound reaches the k-th best lower bound are embedded
+    and rescored (at most POOL_RERANK_MAX), so the result is exact unless that cap binds.
+    """
+    jd = jd_arrays([profile])
+    exact = True
+    if not USE_SEMANTIC or not len(pool):
+        parts = _pool_grid(pool, jd, profile)
+        rows = np.arange(len(pool))
+    else:
+        lo = _pool_grid(pool, jd, profile, sem=np.zeros(len(pool)))["score"][:, 0]
+        hi = _pool_grid(pool, jd, profile, sem=np.full(len(pool), _SEM_FULL_AT))["score"][:, 0]
+        kth = -np.partition(-lo, min(k, len(lo)) - 1)[min(k, len(lo)) - 1]
+        rows = np.flatnonzero(hi >= kth)
+        if len(rows) > Config.POOL_RERANK_MAX:
+            exact = False
+            rows = np.sort(rows[_top(hi[rows], Config.POOL_RERANK_MAX)])
+        ids = [pool.ids[i] for i in rows]
+        docs = text_store.hydrate(get_db(), list(scans_col().find(
+            {"_id": {"$in": ids}}, {"resume_text": 1, "resume_ref": 1})), ("resume_text",))
+        texts = {d["_id"]: d.get("resume_text", "") for d in docs}
+        sims = np.array(_semantic_sims([texts.get(i, "") for i in ids], profile), dtype=float)
+        parts = _pool_grid(pool, jd, profile, rows=rows, sem=sims)
+    top = [(int(rows[p]), round(float(parts["score"][p, 0]), 4), grid_breakdown(parts, p, 0, jd))
+           for p in _top(parts["score"][:, 0], k)]
+    return top, exact
+
+
+@pool_bp.post("/rank")
+@jwt_required()
+def rank():
+    """
+    Rank every resume the caller has saved against a JD:
+    {"jd_text" | "posting_id", "top": 20}. Scores use the scan rubric on the
+    feature records stored with each saved scan; "refreshing" is true while
+    records from an older taxonomy are being recomputed (scores may shift).
+    """
+    if np is None:
+        return fail("talent pool ranking needs numpy", 503)
+    data = request.get_json(silent=True) or {}
+    jd_text = _clean(data.get("jd_text"))
+    posting_id = data.get("posting_id")
+    if not (jd_text or posting_id):
+        return fail("jd_text (or posting_id) is required", 422)
+    try:
+        k = max(1, min(int(data.get("top", 20)), 500))
+    except (TypeError, ValueError):
+        return fail("top must be an integer", 422)
+    profile, err = _resolve_jd(jd_text, posting_id)
+    if err:
+        return err
+
+    uid = get_jwt_identity()
+    try:
+        with timed("pool_load"):
+            pool = load_pool(uid)
+    except Exception as e:
+        return fail("could not load saved scans", 500, details=str(e))
+    t0 = time.perf_counter()
+    with timed("pool_score"):
+        top, exact = rank_pool(pool, profile, k)
+    score_ms = (time.perf_counter() - t0) * 1000
+
+    keys = list(taxonomy.active().key_index)
+    meta = {d["_id"]: d for d in scans_col().find(
+        {"_id": {"$in": [pool.ids[r] for r, _, _ in top]}}, {"created_at": 1, "resume_preview": 1})}
+    results = []
+    for rank_no, (r, score, breakdown) in enumerate(top, 1):
+        have = pool.skill_keys(r, keys)
+        d = meta.get(pool.ids[r], {})
+        results.append({
+            "rank": rank_no,
+            "scan_id": str(pool.ids[r]),
+            "score": score,
+            "breakdown": breakdown,
+            "matched_skills": sorted(have & profile.union),
+            "missing_required": sorted(profile.required - have),
+            "created_at": d["created_at"].isoformat() + "Z" if d.get("created_at") else None,
+            "resume_preview": d.get("resume_preview", ""),
+        })
+    return ok("ranked", total=len(pool), exact=exact, refreshing=uid in _REFRESHING, score_ms=round(score_ms, 2), results=results)
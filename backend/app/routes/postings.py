@@ -0,0 +1,89 @@
+from flask import Blueprint, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from pymongo.errors import DuplicateKeyError
+from app.models.db import postings_col
+from app.routes.scan import _clean, jd_hash, job_profile, profile_from_doc
+from app.utils.responses import ok, created, fail
+from datetime import datetime
+from bson import ObjectId
+
+postings_bp = Blueprint("postings", __name__, url_prefix="/api/postings")
+
+
+def _summary(d: dict) -> dict:
+    return {
+        "id": str(d["_id"]),
+        "name": d.get("name", ""),
+        "created_at": d.get("created_at").isoformat() + "Z",
+        "required": d.get("required", []),
+        "optional": d.get("optional", []),
+        "years": d.get("years"),
+    }
+
+
+@postings_bp.post("/")
+@jwt_required()
+def register_posting():
+    """Parse a JD once and store its profile; scans can then pass posting_id."""
+    data = request.get_json(silent=True) or {}
+    jd_text = _clean(data.get("jd_text"))[:10000]
+    name = _clean(data.get("name"))[:200]
+    if not jd_text:
+        return fail("jd_text is required", 422)
+
+    uid = ObjectId(get_jwt_identity())
+    h = jd_hash(jd_text)
+    try:
+        existing = postings_col().find_one({"user_id": uid, "jd_hash": h}, {"_id": 1})
+        if existing:
+            return ok("already registered", id=str(existing["_id"]))
+        doc = {
+            "user_id": uid,
+            "created_at": datetime.utcnow(),
+            "name": name,
+            "jd_hash": h,
+            **job_profile(jd_text).to_doc(),
+        }
+        ins = postings_col().insert_one(doc)
+        return created("registered", id=str(ins.inserted_id))
+    except DuplicateKeyError:
+        pass  # a concurrent request registered the same JD first (unique user_id + jd_hash)
+    except Exception as e:
+        return fail("could not register posting", 500, details=str(e))
+    try:
+        existing = postings_col().find_one({"user_id": uid, "jd_hash": h}, {"_id": 1})
+    except Exception as e:
+        return fail("could not register posting", 500, details=str(e))
+    if not existing:
+        return fail("could not register posting", 409)
+    return ok("already registered", id=str(existing["_id"]))
+
+
+@postings_bp.get("/")
+@jwt_required()
+def list_postings():
+    uid = ObjectId(get_jwt_identity())
+    try:
+        cur = (postings_col()
+               .find({"user_id": uid}, {"jd_text": 0, "title_tokens": 0})
+               .sort("created_at", -1)
+               .limit(100))
+        return ok("fetched", items=[_summary(d) for d in cur])
+    except Exception as e:
+        return fail("could not list postings", 500, details=str(e))
+
+
+@postings_bp.get("/<posting_id>")
+@jwt_required()
+def get_posting(posting_id: str):
+    try:
+        d = postings_col().find_one({"_id": ObjectId(posting_id), "user_id": ObjectId(get_jwt_identity())})
+    except Exception as e:
+        return fail("could not load posting", 400, details=str(e))
+    if not d:
+        return fail("posting not found", 404)
+    prof = profile_from_doc(d)  # re-derived if the taxonomy changed since registration
+    item = _summary(d)
+    item.update(required=sorted(prof.required), optional=sorted(prof.optional),
+                years=prof.years, jd_text=d.get("jd_text", ""))
+    return ok("fetched", **item)
@@ -1,71 +1,33 @@
 # backend/app/routes/scan.py
-from flask import Blueprint, request, current_app
-from flask_jwt_extended import jwt_required
+from flask import Blueprint, Response, request, current_app, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.utils.responses import ok, fail
-import json, os, re
+from app.services.matcher import SkillMatcher
+from app.services import taxonomy
+from app.services.extraction import extract_pdf_text, extract_many
+from app.services.cache import ScanResultCache, TTLCache, content_hash, version_tag
+from app.services.job_profile import JobProfile
+from app.services.resume_analysis import ResumeAnalysis
+from app.services import semantic
+from app.services.metrics import timed
+from app.services.patterns import PATTERNS
+from app.models.db import scan_cache_col, postings_col, resume_analyses_col
+from app.config import Config
+from bson import ObjectId
+from datetime import datetime
+import heapq, json, logging, re
+try:
+    import numpy as np
+except ImportError:  # vectorized scoring (talent pool, matrix) needs numpy
+    np = None
+from bisect import bisect_right
+from itertools import islice
 
 scan_bp = Blueprint("scan", __name__, url_prefix="/api/scan")
 
 # -------- skills + synonyms --------
-_SKILLS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "skills.json")
-try:
-    with open(_SKILLS_PATH, "r", encoding="utf-8") as f:
-        ALL_SKILLS = [s.strip() for s in json.load(f) if s and isinstance(s, str)]
-except Exception:
-    ALL_SKILLS = []
-
-if not ALL_SKILLS:  # fallback list
-    ALL_SKILLS = [
-        "python","java","javascript","typescript","react","node.js","express",
-        "html","css","rest","api","graphql","docker","kubernetes","aws","gcp","azure","linux",
-        "postgresql","mysql","mongodb","redis","git","github","ci/cd",
-        "unit testing","integration testing","pytest","jest",
-        "django","flask","fastapi","spring","next.js",
-        "pandas","numpy","scikit-learn","nlp","machine learning",
-        "data structures","algorithms"
-    ]
-
-_SYNONYMS = {
-    "c++": ["c++", "c plus plus", "c-plus-plus"],
-    "node.js": ["node.js", "nodejs", "node js"],
-    "react": ["reactjs", "react.js"],
-    "postgresql": ["postgres", "postgre sql"],
-    "mongodb": ["mongo", "mongo db"],
-    "mysql": ["my sql"],
-    "ci/cd": ["ci cd", "ci-cd", "continuous integration", "continuous delivery", "continuous deployment"],
-    "unit testing": ["unit tests", "unit test"],
-    "integration testing": ["integration tests", "integration test"],
-    "end-to-end testing": ["e2e testing", "e2e tests", "end to end testing"],
-    "code review": ["code reviews"],
-    "nlp": ["natural language processing"],
-    "ml": ["machine learning"],  # we block bare "ml" below; only phrase match via synonym
-    "http": ["https"],
-    "graphql": ["graph ql"],
-}
-
-# ignore very short/ambiguous tokens (and bare "ml")
-_BLOCKLIST = {"c", "r", "go", "ml"}
-
-# optional soft skills treated as "optional" requirements
-INCLUDE_SOFT_SKILLS = True
-SOFT_SKILLS = [
-    "teamwork", "collaboration", "communication", "leadership",
-    "problem solving", "ownership", "adaptability", "time management",
-    "agile", "scrum", "kanban"
-]
-SOFT_SYNONYMS = {
-    "teamwork": ["teamwork", "team player", "working in a team"],
-    "collaboration": ["collaboration", "collaborate", "collaborative"],
-    "communication": ["communication", "communicate", "communicator"],
-    "leadership": ["leadership", "lead", "led"],
-    "problem solving": ["problem solving", "problem-solving"],
-    "ownership": ["ownership", "own", "owned"],
-    "adaptability": ["adaptable", "adaptability", "flexible", "flexibility"],
-    "time management": ["time management"],
-    "agile": ["agile"],
-    "scrum": ["scrum"],
-    "kanban": ["kanban"]
-}
+# skills, synonyms, aliases, soft skills and blocklist live in the taxonomy
+# file (app/taxonomy.json); taxonomy.active() is the snapshot for this request
 
 # section weights used when counting occurrences
 _SECTION_W = {
@@ -85,116 +47,158 @@ W_DISTRIB  = 0.15
 W_TITLE    = 0.10
 W_YEARS    = 0.10
 
+# semantic similarity (Config.USE_SEMANTIC): blended in with this weight,
+# the lexical rubric above keeps the remaining (1 - W_SEMANTIC)
+W_SEMANTIC = 0.10
+_SEM_FULL_AT = 0.5  # cosine at/above which the semantic part scores 1.0
+USE_SEMANTIC = Config.USE_SEMANTIC and semantic.available()
+if Config.USE_SEMANTIC and not USE_SEMANTIC:
+    logging.getLogger("resume_backend").warning("semantic_disabled reason=numpy_missing")
+
 # penalty for each missing required skill (capped later)
 _REQ_MISS_PENALTY = 0.10
 
+# -------- result cache --------
+# any change to the taxonomy or weights yields a new tag, so old cache entries stop matching
+_TEXT_FORM = "text:clean,pdf:raw"  # see analysis_text
+_SCORING_TAG = version_tag(
+    _SECTION_W, [W_REQUIRED, W_OPTIONAL, W_DISTRIB, W_TITLE, W_YEARS, _REQ_MISS_PENALTY],
+    [USE_SEMANTIC, W_SEMANTIC, _SEM_FULL_AT, semantic.DIM, semantic.NGRAMS], _TEXT_FORM,
+)
+_VERSIONS = {}  # taxonomy version -> combined tag
+
+def taxonomy_version() -> str:
+    """Tag for the active taxonomy + scoring settings; cached results and JD profiles key on it."""
+    tv = taxonomy.active().version
+    tag = _VERSIONS.get(tv)
+    if tag is None:
+        tag = _VERSIONS[tv] = version_tag(tv, _SCORING_TAG)
+    return tag
+
+# a PDF's result also depends on which extractor read it
+_EXTRACT_TAG = version_tag(Config.PDF_BACKEND)[:8]
+
+def scan_cache_version() -> str:
+    """taxonomy_version() plus the PDF extractor chain: the version part of scan result cache keys."""
+    return f"{taxonomy_version()}:{_EXTRACT_TAG}"
+
+_SCAN_CACHE = ScanResultCache(
+    scan_cache_col,
+    maxsize=Config.SCAN_CACHE_SIZE,
+    ttl=Config.SCAN_CACHE_TTL_S,
+    shared=Config.SCAN_CACHE_SHARED,
+)
+_JD_CACHE = TTLCache(maxsize=Config.JD_CACHE_SIZE, ttl=Config.JD_CACHE_TTL_S)
+_RESUME_CACHE = TTLCache(maxsize=Config.RESUME_CACHE_SIZE, ttl=Config.RESUME_TTL_S)
+
 # -------- helpers --------
 _STOP = {
     "the","a","an","to","of","and","or","for","with","in","on","at","by","as","is","are",
     "be","this","that","your","our","we","you","their","his","her"
 }
 
+_WS = PATTERNS.get(r"\s+")
+
 def _clean(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "")).strip()
+    return _WS.sub(" ", (s or "")).strip()
+
+def analysis_text(text: str, source: str = "text") -> str:
+    """
+    A resume in the form the scan routes analyse it: typed text whitespace-
+    collapsed (_clean), extracted PDF text as is (its line breaks carry the
+    section headings). Saved scans keep the text they were given and re-derive this.
+    """
+    return (text or "") if source == "pdf" else _clean(text)
 
 def _lc(s: str) -> str:
     return (s or "").lower()
 
-def _word_in(text_lc: str, phrase: str) -> re.Match | None:
-    return re.search(rf"(?<!\w){re.escape((phrase or '').lower())}(?!\w)", text_lc)
+class _Text:
+    """
+    One input text with its derived forms, each computed at most once.
+    A scan builds one per resume/JD and hands it to every helper, which
+    would otherwise each clean and lowercase the same string again.
+    Helpers also accept plain strings.
+    """
+    __slots__ = ("raw", "_clean", "_clean_lc", "_lc", "_lc_offsets")
 
-def _first_snippet(original: str, variant: str, m: re.Match | None) -> str | None:
-    if not original or not variant:
-        return None
-    if not m:
-        m = re.search(rf"(?<!\w){re.escape(variant)}(?!\w)", original, flags=re.IGNORECASE)
-        if not m:
-            return None
-    start, end = m.start(), m.end()
+    def __init__(self, raw: str):
+        self.raw = raw or ""
+        self._clean = self._clean_lc = self._lc = self._lc_offsets = None
+
+    @property
+    def clean(self) -> str:
+        if self._clean is None:
+            self._clean = _clean(self.raw)
+        return self._clean
+
+    @property
+    def clean_lc(self) -> str:
+        if self._clean_lc is None:
+            self._clean_lc = self.clean.lower()
+        return self._clean_lc
+
+    @property
+    def lc(self) -> str:
+        if self._lc is None:
+            self._lc = self.raw.lower()
+        return self._lc
+
+    @property
+    def lc_offsets(self) -> str:
+        if self._lc_offsets is None:
+            lc = self.lc
+            self._lc_offsets = lc if len(lc) == len(self.raw) else _lc_keep_offsets(self.raw)
+        return self._lc_offsets
+
+def _as_text(x) -> _Text:
+    return x if isinstance(x, _Text) else _Text(x)
+
+def _snippet_at(original: str, start: int, end: int) -> str:
     lo = max(0, start - 40)
     hi = min(len(original), end + 40)
     return original[lo:hi].strip()
 
 # -------- skill extraction --------
-def _extract_skills_with_evidence(text: str):
-    original = text or ""
-    t = _lc(_clean(original))
+def _extract_with(matcher: SkillMatcher, text: str):
+    # one pass over the cleaned text; hits come back in registration order,
+    # so the first phrase registered for a key still provides its evidence
+    doc = _as_text(text)
+    original, t = doc.raw, doc.clean_lc
     found = set()
     evidence = {}
-
-    for sk in ALL_SKILLS:
-        s = (sk or "").strip().lower()
-        if not s or s in _BLOCKLIST:
-            continue
-        m = _word_in(t, s)
-        if m:
-            found.add(s)
-            evidence.setdefault(s, _first_snippet(original, s, m))
-
-    for canon, variants in _SYNONYMS.items():
-        for v in variants:
-            m = _word_in(t, v)
-            if m:
-                key = canon.lower()
-                found.add(key)
-                evidence.setdefault(key, _first_snippet(original, v, m))
-                break
-
-    aliases = {
-        "golang": "go",
-        "c sharp": "c#", "c-sharp": "c#",
-        "js": "javascript",
-        "ts": "typescript",
-        "sde": "software engineer", "software development engineer": "software engineer"
-    }
-    for a, canon in aliases.items():
-        m = _word_in(t, a)
-        if m:
-            key = canon.lower()
-            found.add(key)
-            evidence.setdefault(key, _first_snippet(original, a, m))
-
+    for key, _phrase, start, end in matcher.scan(t):
+        found.add(key)
+        evidence.setdefault(key, _snippet_at(original, start, end))
     return sorted(found), evidence
 
+def _extract_skills_with_evidence(text: str):
+    return _extract_with(taxonomy.active().skill_matcher, text)
+
 def _extract_soft_skills_with_evidence(text: str):
-    original = text or ""
-    t = _lc(_clean(original))
-    found = set()
-    evidence = {}
-    for sk in SOFT_SKILLS:
-        s = sk.lower()
-        m = _word_in(t, s)
-        if m:
-            found.add(s)
-            evidence.setdefault(s, _first_snippet(original, s, m))
-    for canon, variants in SOFT_SYNONYMS.items():
-        for v in variants:
-            m = _word_in(t, v)
-            if m:
-                key = canon.lower()
-                found.add(key)
-                evidence.setdefault(key, _first_snippet(original, v, m))
-                break
-    return sorted(found), evidence
+    return _extract_with(taxonomy.active().soft_matcher, text)
 
 # -------- JD parsing (required vs optional) --------
 def _slice_block(text_lc: str, start_key: str, *end_keys: str) -> str | None:
-    m = re.search(re.escape(start_key.lower()), text_lc)
+    m = PATTERNS.literal(start_key.lower()).search(text_lc)
     if not m:
         return None
     start = m.end()
     end = len(text_lc)
     for k in end_keys:
-        m2 = re.search(re.escape(k.lower()), text_lc[start:])
+        m2 = PATTERNS.literal(k.lower()).search(text_lc, start)
         if m2:
-            end = start + m2.start()
+            end = m2.start()
             break
     return text_lc[start:end].strip() or None
 
-def _parse_jd_skills(jd_text: str):
-    t = _lc(_clean(jd_text))
+_SKILLS_LINE = PATTERNS.get(r"\bskills?\s*:\s*([^\n]+)")
+
+def _parse_jd_skills(jd_text):
+    doc = _as_text(jd_text)
+    t = doc.clean_lc
 
-    m = re.search(r"\bskills?\s*:\s*([^\n]+)", t)
+    m = _SKILLS_LINE.search(t)
     if m:
         raw = [x.strip() for x in m.group(1).split(",") if x.strip()]
         req, _ = _extract_skills_with_evidence(", ".join(raw))
@@ -207,10 +211,10 @@ def _parse_jd_skills(jd_text: str):
     opt = set(_extract_skills_with_evidence(nice_blk or "")[0]) if nice_blk else set()
 
     if not req and not opt:
-        tech, _ = _extract_skills_with_evidence(jd_text)  # use original for better snippets
+        tech, _ = _extract_skills_with_evidence(doc)  # use original for better snippets
         req = set(tech)
-    if not req and not opt and INCLUDE_SOFT_SKILLS:
-        soft, _ = _extract_soft_skills_with_evidence(jd_text)
+    if not req and not opt and taxonomy.active().include_soft_skills:
+        soft, _ = _extract_soft_skills_with_evidence(doc)
         opt = set(soft)
 
     return req, opt
@@ -225,12 +229,14 @@ _HEADINGS = [
     ("summary", r"^\s*(summary|profile|objective)\b"),
 ]
 
-def _section_spans(original: str):
-    text = original or ""
-    lc = text.lower()
+_HEADING_RES = [(name, PATTERNS.get(pat, re.MULTILINE)) for name, pat in _HEADINGS]
+
+def _section_spans(original):
+    doc = _as_text(original)
+    text, lc = doc.raw, doc.lc
     hits = []
-    for name, pat in _HEADINGS:
-        for m in re.finditer(pat, lc, flags=re.MULTILINE):
+    for name, pat in _HEADING_RES:
+        for m in pat.finditer(lc):
             hits.append((m.start(), name))
     if not hits:
         return [("other", 0, len(text))]
@@ -246,27 +252,30 @@ def _section_spans(original: str):
         spans.append(("other", prev_end, len(text)))
     return spans
 
-def _locate_section_for_skill(skill: str, original: str, spans):
-    if not original:
-        return "other"
-    lc = original.lower()
-    variants = [skill] + _SYNONYMS.get(skill, [])
-    if skill == "go":        variants += ["golang"]
-    if skill == "c#":        variants += ["c sharp","c-sharp"]
-    if skill == "javascript":variants += ["js"]
-    if skill == "typescript":variants += ["ts"]
-    first_idx = None
-    for v in variants:
-        m = re.search(rf"(?<!\w){re.escape(v)}(?!\w)", lc)
-        if m:
-            idx = m.start()
-            first_idx = idx if first_idx is None else min(first_idx, idx)
-    if first_idx is None:
-        return "other"
-    for name, start, end in spans:
-        if start <= first_idx < end:
-            return name
-    return "other"
+def _lc_keep_offsets(text: str) -> str:
+    # lowercase without shifting offsets (a few chars, e.g. "İ", lowercase to 2 chars)
+    lc = text.lower()
+    if len(lc) == len(text):
+        return lc
+    return "".join(ch.lower() if len(ch.lower()) == 1 else ch for ch in text)
+
+def _occurrence_table(original, spans) -> dict:
+    """
+    One pass over the resume: skill -> [(offset, section), ...] in counting
+    order (variant order, then offset). Distribution and section lookup
+    both read from it instead of re-searching per skill and variant.
+    """
+    starts = [start for _, start, _ in spans]
+    table = {}
+    matcher = taxonomy.active().distrib_matcher
+    hits = matcher.all_hits(_as_text(original).lc_offsets)
+    for pid in sorted(hits):
+        rows = table.setdefault(matcher.keys[pid], [])
+        for idx, _ in hits[pid]:
+            i = bisect_right(starts, idx) - 1
+            name, start, end = spans[i] if i >= 0 else ("other", 0, 0)
+            rows.append((idx, name if start <= idx < end else "other"))
+    return table
 
 # -------- simple title + years parsing --------
 _ROLE_SYNS = {
@@ -278,38 +287,39 @@ _ROLE_SYNS = {
     "frontend engineer": {"frontend", "front-end", "react", "ui"},
 }
 
-def _first_line_tokens(text: str):
-    line = (_clean(text).split("\n") or [""])[0][:120].lower()
-    toks = [t for t in re.split(r"[^a-z0-9#+]+", line) if t and t not in _STOP]
+_TOKEN_SPLIT = PATTERNS.get(r"[^a-z0-9#+]+")
+
+def _first_line_tokens(text):
+    line = (_as_text(text).clean.split("\n") or [""])[0][:120].lower()
+    toks = [t for t in _TOKEN_SPLIT.split(line) if t and t not in _STOP]
     return set(toks)
 
-def _title_score(resume_text: str, jd_text: str) -> float:
-    r = _first_line_tokens(resume_text)
-    j = _first_line_tokens(jd_text)
-    def expand(token_set):
-        out = set(token_set)
-        for canon, syns in _ROLE_SYNS.items():
-            if (set(canon.split()) & token_set) or (syns & token_set):
-                out |= syns | set(canon.split())
-        return out
-    r2, j2 = expand(r), expand(j)
-    inter = len(r2 & j2)
-    denom = max(1, len(j2))
+def _expand_roles(token_set):
+    out = set(token_set)
+    for canon, syns in _ROLE_SYNS.items():
+        if (set(canon.split()) & token_set) or (syns & token_set):
+            out |= syns | set(canon.split())
+    return out
+
+def _title_overlap(resume_title: set, jd_title: set) -> float:
+    # both sides are expanded token sets
+    inter = len(resume_title & jd_title)
+    denom = max(1, len(jd_title))
     return min(1.0, inter / denom)
 
-def _extract_years(text: str) -> int | None:
-    t = _lc(text)
+_YEARS = PATTERNS.get(r"(\d+)\s*(\+)?\s*(years|year|yrs)")
+
+def _extract_years(text) -> int | None:
+    t = _as_text(text).lc
     years = []
-    for m in re.finditer(r"(\d+)\s*(\+)?\s*(years|year|yrs)", t):
+    for m in _YEARS.finditer(t):
         try:
             years.append(int(m.group(1)))
         except:
             pass
     return max(years) if years else None
 
-def _years_score(resume_text: str, jd_text: str) -> float:
-    need = _extract_years(jd_text)
-    have = _extract_years(resume_text)
+def _years_fit(have: int | None, need: int | None) -> float:
     if need is None:
         return 1.0
     if have is None:
@@ -319,54 +329,148 @@ def _years_score(resume_text: str, jd_text: str) -> float:
     return max(0.0, have / max(1, need))
 
 # -------- PDF --------
-def _pdf_to_text(file_storage):
-    try:
-        from PyPDF2 import PdfReader
-        reader = PdfReader(file_storage.stream)
-        pages = [p.extract_text() or "" for p in reader.pages]
-        return "\n".join(pages)
-    except Exception as e:
-        raise RuntimeError(f"pdf_read_error: {e}")
+def _pdf_to_text(data: bytes):
+    # parsed in the shared extraction pool, not in this request thread; kept as
+    # extracted, since its line breaks carry the section headings
+    with timed("pdf"):
+        return extract_pdf_text(data, timeout=float(current_app.config.get("PDF_TIMEOUT_S", 20)))
 
-# -------- route --------
-@scan_bp.post("/")
-@jwt_required()
-def scan():
-    resume_text, jd_text = "", ""
+# -------- JD profiles --------
+def jd_hash(jd_text) -> str:
+    # every JD fact is derived from the cleaned, lowercased text
+    return content_hash(_as_text(jd_text).clean_lc)
 
-    if request.content_type and "multipart/form-data" in request.content_type:
-        file = request.files.get("file")
+def _jd_key(jd_text: str) -> str:
+    return f"{taxonomy_version()}:{jd_hash(jd_text)}"
 
-        max_mb = float(current_app.config.get("MAX_FILE_MB", 10))
-        if file and getattr(file, "content_length", None):
-            if file.content_length > max_mb * 1024 * 1024:
-                return fail(f"file too large (>{max_mb}MB)", 413)
+def build_job_profile(jd_text: str) -> JobProfile:
+    doc = _Text(jd_text)
+    req, opt = _parse_jd_skills(doc)
+    return JobProfile(
+        jd_text,
+        req,
+        opt,
+        _extract_years(doc),
+        _expand_roles(_first_line_tokens(doc)),
+        taxonomy_version(),
+    )
 
-        if file and file.mimetype not in ("application/pdf", "application/x-pdf"):
-            return fail("only PDF files are allowed", 415)
+def job_profile(jd_text: str) -> JobProfile:
+    # parse once per distinct JD; most traffic scores many resumes against a few postings
+    key = _jd_key(jd_text)
+    prof = _JD_CACHE.get(key)
+    if prof is None:
+        with timed("jd_parse"):
+            prof = build_job_profile(jd_text)
+        _JD_CACHE.set(key, prof)
+    return prof
 
-        jd_text = _clean(request.form.get("jd_text"))
-        if not file or not jd_text:
-            return fail("pdf file and jd_text are required", 422)
+def profile_from_doc(doc: dict) -> JobProfile:
+    # stored postings parsed with an older taxonomy are re-derived from their text
+    if doc.get("taxonomy_version") == taxonomy_version():
+        return JobProfile.from_doc(doc)
+    return job_profile(doc.get("jd_text", ""))
+
+def _resolve_jd(jd_text: str, posting_id) -> tuple:
+    """(profile, error) from inline jd_text or a registered posting id."""
+    if not posting_id:
+        return (job_profile(jd_text), None) if jd_text else (None, None)
+    try:
+        doc = postings_col().find_one({"_id": ObjectId(posting_id), "user_id": ObjectId(get_jwt_identity())})
+    except Exception as e:
+        return None, fail("could not load posting", 400, details=str(e))
+    if not doc:
+        return None, fail("posting not found", 404)
+    return profile_from_doc(doc), None
+
+# -------- resume analyses --------
+def resume_id_for(user_id: str, content) -> str:
+    # stable per user + content, so re-uploading the same file finds its analysis
+    return content_hash(f"{user_id}:{content_hash(content)}")[:24]
+
+def store_analysis(user_id: str, resume_id: str, a: ResumeAnalysis):
+    _RESUME_CACHE.set(f"{user_id}:{resume_id}", a)
+    if not Config.RESUME_STORE_SHARED:
+        return
+    try:
+        resume_analyses_col().replace_one(
+            {"_id": resume_id},
+            {"user_id": user_id, "created_at": datetime.utcnow(), **a.to_doc()},
+            upsert=True,
+        )
+    except Exception as e:
+        # still usable from this worker's memory
+        logging.getLogger("resume_backend").warning("resume_analysis_store_failed resume_id=%s error=%s", resume_id, e)
+
+def load_analysis(user_id: str, resume_id: str) -> ResumeAnalysis | None:
+    """Memory, then mongo. Analyses from an older taxonomy are redone from the stored text."""
+    if not resume_id:
+        return None
+    mkey = f"{user_id}:{resume_id}"
+    a = _RESUME_CACHE.get(mkey)
+    if a is None:
+        if not Config.RESUME_STORE_SHARED:
+            return None
         try:
-            resume_text = _pdf_to_text(file)
+            doc = resume_analyses_col().find_one({"_id": str(resume_id), "user_id": user_id})
         except Exception as e:
-            return fail("could not read pdf", 400, details=str(e))
-    else:
-        data = request.get_json(silent=True) or {}
-        resume_text = _clean(data.get("resume_text"))
-        jd_text = _clean(data.get("jd_text"))
-        if not resume_text or not jd_text:
-            return fail("resume_text and jd_text are required", 422)
+            logging.getLogger("resume_backend").warning("resume_analysis_load_failed resume_id=%s error=%s", resume_id, e)
+            doc = None
+        if doc is None:
+            return None
+        a = ResumeAnalysis.from_doc(doc)
+        _RESUME_CACHE.set(mkey, a)
+    if a.version != taxonomy_version():
+        a = analyze_resume(a.text)
+        store_analysis(user_id, resume_id, a)
+    return a
 
-    # skills & sections
-    resume_skills, resume_ev = _extract_skills_with_evidence(resume_text)
-    jd_req, jd_opt = _parse_jd_skills(jd_text)
+# -------- semantic --------
+def _jd_vector(jd: JobProfile):
+    # embedded once and kept on the (cached) profile
+    if jd.vector is None:
+        jd.vector = semantic.embed(jd.jd_text, _STOP)
+    return jd.vector
+
+def _analysis_sim(a: ResumeAnalysis, jd: JobProfile) -> float:
+    # the resume embedding is kept on the analysis, so rescans don't re-embed
+    with timed("semantic"):
+        if a.vector is None:
+            a.vector = semantic.embed(a.text, _STOP)
+        return float(semantic.similarity(a.vector[None, :], _jd_vector(jd))[0])
+
+def _semantic_sims(texts, jd: JobProfile) -> list:
+    """Cosine similarity of each text with the JD, one matrix product for the batch."""
+    if not USE_SEMANTIC or not texts:
+        return [None] * len(texts)
+    with timed("semantic"):
+        r = np.stack([semantic.embed(t, _STOP) for t in texts])
+        return [float(x) for x in semantic.similarity(r, _jd_vector(jd))]
+
+# -------- scoring --------
+def analyze_resume(resume_text: str) -> ResumeAnalysis:
+    """The JD-independent half of scoring: skills, occurrence table, title, years."""
+    doc = _Text(resume_text)  # cleaned/lowercased once, shared by every stage below
+    with timed("skills"):
+        skills, evidence = _extract_skills_with_evidence(doc)
+    with timed("sections"):
+        table = _occurrence_table(doc, _section_spans(doc))
+    with timed("title_years"):
+        title = _expand_roles(_first_line_tokens(doc))
+        years = _extract_years(doc)
+    return ResumeAnalysis(resume_text, skills, evidence, table, title, years, taxonomy_version())
+
+def _score_resume(resume_text: str, jd: JobProfile, sem_sim: float | None = None) -> dict:
+    return _score_analysis(analyze_resume(resume_text), jd, sem_sim)
+
+def _score_analysis(a: ResumeAnalysis, jd: JobProfile, sem_sim: float | None = None) -> dict:
+    """Rubric for an analysed resume against a JD profile; only set math and weighting."""
+    resume_skills, resume_ev, table = a.skills, a.evidence, a.table
+    jd_req, jd_opt = set(jd.required), set(jd.optional)
     jd_union = jd_req | jd_opt
 
     if len(jd_union) == 0:
-        return ok(
-            "scan complete",
+        return dict(
             score=0.0, overlap_ratio=0.0,
             matched_skills=[], missing_skills=[], extra_skills=[],
             jd_required=[], jd_optional=[], evidence={},
@@ -383,35 +487,22 @@ def scan():
     overlap_union = len(matched_union) / max(1, len(jd_union))
 
     # distribution score (counts, capped, weighted by section)
-    spans = _section_spans(resume_text)
-    distrib_raw, distrib_max = 0.0, 0.0
-    for sk in jd_union:
-        w = 1.0 if sk in jd_req else 0.5
-        distrib_max += 2.0 * w
-        occ = 0.0
-        variants = [sk] + _SYNONYMS.get(sk, [])
-        if sk == "go":        variants += ["golang"]
-        if sk == "c#":        variants += ["c sharp","c-sharp"]
-        if sk == "javascript":variants += ["js"]
-        if sk == "typescript":variants += ["ts"]
-        for v in variants:
-            for m in re.finditer(rf"(?<!\w){re.escape(v)}(?!\w)", resume_text, flags=re.IGNORECASE):
-                idx = m.start()
-                sec = "other"
-                for name, start, end in spans:
-                    if start <= idx < end:
-                        sec = name; break
+    with timed("distribution"):
+        distrib_raw, distrib_max = 0.0, 0.0
+        for sk in jd_union:
+            w = 1.0 if sk in jd_req else 0.5
+            distrib_max += 2.0 * w
+            occ = 0.0
+            for _, sec in table.get(sk, ()):
                 occ += _SECTION_W.get(sec, 0.7)
                 if occ >= 2.0:
                     break
-            if occ >= 2.0:
-                break
-        distrib_raw += w * min(2.0, occ)
-    distrib_score = (distrib_raw / max(1.0, distrib_max)) if distrib_max > 0 else 1.0
+            distrib_raw += w * min(2.0, occ)
+        distrib_score = (distrib_raw / max(1.0, distrib_max)) if distrib_max > 0 else 1.0
 
     # title + years
-    title_score = _title_score(resume_text, jd_text)
-    years_score = _years_score(resume_text, jd_text)
+    title_score = _title_overlap(a.title, jd.title)
+    years_score = _years_fit(a.years, jd.years)
 
     # coverage parts
     req_cov = (len(match_req) / max(1, len(jd_req))) if jd_req else 1.0
@@ -426,6 +517,13 @@ def scan():
         W_YEARS    * years_score
     )
 
+    semantic_score = None
+    if USE_SEMANTIC:
+        if sem_sim is None:
+            sem_sim = _analysis_sim(a, jd)
+        semantic_score = max(0.0, min(1.0, sem_sim / _SEM_FULL_AT))
+        base = (1.0 - W_SEMANTIC) * base + W_SEMANTIC * semantic_score
+
     penalty = min(0.50, _REQ_MISS_PENALTY * len(miss_req))
     very_low_overlap = overlap_union < 0.03
 
@@ -436,8 +534,7 @@ def scan():
 
     evidence = {sk: resume_ev.get(sk) for sk in matched_union if resume_ev.get(sk)}
 
-    return ok(
-        "scan complete",
+    return dict(
         score=round(float(final), 4),
         overlap_ratio=round(float(overlap_union), 4),
         matched_skills=matched_union,
@@ -457,6 +554,7 @@ def scan():
             "title": round(title_score, 4),
             "years": round(years_score, 4),
             "penalty_missing_required": round(penalty, 4),
+            **({"semantic": round(semantic_score, 4)} if semantic_score is not None else {}),
         },
         diagnostics={
             "jd_total": len(jd_union),
@@ -464,6 +562,526 @@ def scan():
             "matched": len(matched_union),
             "overlap_union": round(float(overlap_union), 4),
             "base_before_penalty": round(float(base), 4),
-            "skills_count": len(ALL_SKILLS),
+            "skills_count": len(taxonomy.active().skills),
+            **({"semantic_similarity": round(sem_sim, 4)} if semantic_score is not None else {}),
         }
     )
+
+# -------- vectorized rubric --------
+# _score_analysis for many (resume, JD) pairs at once. Callers reduce resumes to
+# hit counts against each JD (bitsets, incidence matrices); everything after
+# that is the same weighting as above, as (M, N) array math.
+def _capped_occ(a: ResumeAnalysis, index: dict) -> list:
+    # [key id, min(2, section-weighted count)] per skill in the occurrence table
+    return [[index[sk], min(2.0, sum(_SECTION_W.get(sec, 0.7) for _, sec in rows))]
+            for sk, rows in a.table.items() if sk in index]
+
+def pool_features(a: ResumeAnalysis) -> dict:
+    """
+    Compact, JD-independent record of an analysed resume, stored on each saved
+    scan: skill bitset and capped section-weighted counts over the taxonomy's
+    key_index (tagged with its key_tag), years and expanded title tokens.
+    """
+    tax = taxonomy.active()
+    index = tax.key_index
+    bits = 0
+    for sk in a.skills:
+        bits |= 1 << index[sk]
+    return {
+        "version": taxonomy_version(),
+        "keys": tax.key_tag,
+        "skills": bits.to_bytes(8 * (-(-len(index) // 64)), "little"),
+        "occ": _capped_occ(a, index),
+        "years": a.years,
+        "title": sorted(a.title),
+    }
+
+def jd_arrays(profiles) -> dict:
+    """Per-JD vectors over key_index: required/optional incidence, distribution weights, years, title."""
+    index = taxonomy.active().key_index
+    n, k = len(profiles), len(index)
+    req, opt = np.zeros((n, k)), np.zeros((n, k))
+    for j, jd in enumerate(profiles):
+        req[j, [index[s] for s in jd.required if s in index]] = 1.0
+        opt[j, [index[s] for s in jd.optional if s in index]] = 1.0
+    union = np.maximum(req, opt)
+    return {
+        "req": req, "opt": opt, "union": union,
+        "w": np.where(req > 0, 1.0, 0.5 * opt),  # distribution weight per skill, as in _score_analysis
+        "years": np.array([np.nan if jd.years is None else jd.years for jd in profiles], dtype=float),
+        "title": [jd.title for jd in profiles],
+        "n_req": req.sum(1), "n_opt": opt.sum(1), "n_union": union.sum(1),
+    }
+
+def grid_scores(m_req, m_opt, m_union, d_raw, title_hits, years, jd: dict, sem=None) -> dict:
+    """
+    Rubric parts for M resumes x N JDs. m_*: (M, N) matched required/optional/union
+    counts, d_raw: (M, N) weighted capped occurrence sums, title_hits: (M, N)
+    |resume title & JD title|, years: (M,) with nan for unknown, sem: optional (M, N) cosine.
+    """
+    req_cov = np.where(jd["n_req"] > 0, m_req / np.maximum(1, jd["n_req"]), 1.0)
+    opt_cov = np.where(jd["n_opt"] > 0, m_opt / np.maximum(1, jd["n_opt"]), 1.0)
+    d_max = 2.0 * jd["w"].sum(1)
+    distrib = np.where(d_max > 0, d_raw / np.maximum(1.0, d_max), 1.0)
+    title = np.minimum(1.0, title_hits / np.maximum(1, [len(t) for t in jd["title"]]))
+    have, need = years[:, None], jd["years"][None, :]
+    with np.errstate(invalid="ignore"):
+        years_fit = np.where(np.isnan(need), 1.0, np.where(
+            np.isnan(have), 0.0, np.where(have >= need, 1.0, np.maximum(0.0, have / np.maximum(1, need)))))
+    base = (
+        W_REQUIRED * req_cov +
+        W_OPTIONAL * opt_cov +
+        W_DISTRIB  * distrib +
+        W_TITLE    * title +
+        W_YEARS    * years_fit
+    )
+    semantic_score = None
+    if sem is not None:
+        semantic_score = np.clip(sem / _SEM_FULL_AT, 0.0, 1.0)
+        base = (1.0 - W_SEMANTIC) * base + W_SEMANTIC * semantic_score
+    penalty = np.minimum(0.50, _REQ_MISS_PENALTY * (jd["n_req"] - m_req))
+    # no matched skill means overlap 0 (< 0.03): score 0; an empty JD scores 0 too
+    final = np.where((m_union == 0) | (jd["n_union"] == 0), 0.0, np.clip(base - penalty, 0.0, 1.0))
+    return {
+        "score": final, "required_coverage": req_cov, "optional_coverage": opt_cov,
+        "distribution": distrib, "title": title, "years": years_fit,
+        "penalty_missing_required": penalty, "semantic": semantic_score,
+    }
+
+def grid_breakdown(parts: dict, i: int, j: int, jd: dict) -> dict:
+    """One cell's breakdown, rounded like _score_analysis ({} for a JD without skills)."""
+    if not jd["n_union"][j]:
+        return {}
+    out = {name: round(float(parts[name][i, j]), 4) for name in (
+        "required_coverage", "optional_coverage", "distribution", "title", "years", "penalty_missing_required")}
+    if parts["semantic"] is not None:
+        out["semantic"] = round(float(parts["semantic"][i, j]), 4)
+    return out
+
+def score_matrix(analyses: list, profiles: list, sem=None) -> tuple[dict, dict]:
+    """
+    grid_scores for M analysed resumes x N JD profiles, as (parts, jd arrays).
+    Each side is reduced to sparse incidence rows over key_index (and over the
+    JDs' title tokens) once; every count the rubric needs is one matrix product.
+    """
+    index = taxonomy.active().key_index
+    jd = jd_arrays(profiles)
+    m, k = len(analyses), len(index)
+    vocab = {}
+    for p in profiles:
+        for t in p.title:
+            vocab.setdefault(t, len(vocab))
+    skills, occ = np.zeros((m, k)), np.zeros((m, k))
+    r_title, j_title = np.zeros((m, len(vocab))), np.zeros((len(profiles), len(vocab)))
+    for i, a in enumerate(analyses):
+        skills[i, [index[s] for s in a.skills if s in index]] = 1.0
+        for key, v in _capped_occ(a, index):
+            occ[i, key] = v
+        r_title[i, [vocab[t] for t in a.title if t in vocab]] = 1.0
+    for j, p in enumerate(profiles):
+        j_title[j, [vocab[t] for t in p.title]] = 1.0
+    years = np.array([np.nan if a.years is None else a.years for a in analyses], dtype=float)
+    parts = grid_scores(skills @ jd["req"].T, skills @ jd["opt"].T, skills @ jd["union"].T,
+                        occ @ jd["w"].T, r_title @ j_title.T, years, jd, sem)
+    return parts, jd
+
+def semantic_grid(analyses: list, profiles: list):
+    """(M, N) cosine of every resume with every JD; None with semantic scoring off."""
+    if not USE_SEMANTIC or not analyses or not profiles:
+        return None
+    with timed("semantic"):
+        for a in analyses:
+            if a.vector is None:
+                a.vector = semantic.embed(a.text, _STOP)
+        r = np.stack([a.vector for a in analyses])
+        return semantic.similarity(r, np.stack([_jd_vector(p) for p in profiles]).T).astype(float)
+
+# -------- route --------
+@scan_bp.post("/")
+@jwt_required()
+def scan():
+    """
+    Score one resume against a JD. The response carries a resume_id; send it
+    back instead of resume_text / file to rescan the same resume against
+    another JD without extracting or analysing it again (404 once it expired).
+    """
+    resume_text, jd_text, pdf_bytes = "", "", None
+
+    if request.content_type and "multipart/form-data" in request.content_type:
+        file = request.files.get("file")
+
+        max_mb = float(current_app.config.get("MAX_FILE_MB", 10))
+        if file and getattr(file, "content_length", None):
+            if file.content_length > max_mb * 1024 * 1024:
+                return fail(f"file too large (>{max_mb}MB)", 413)
+
+        if file and file.mimetype not in ("application/pdf", "application/x-pdf"):
+            return fail("only PDF files are allowed", 415)
+
+        jd_text = _clean(request.form.get("jd_text"))
+        posting_id = request.form.get("posting_id")
+        resume_id = request.form.get("resume_id")
+        if not (file or resume_id) or not (jd_text or posting_id):
+            return fail("pdf file (or resume_id) and jd_text (or posting_id) are required", 422)
+        pdf_bytes = file.read() if file else None
+    else:
+        data = request.get_json(silent=True) or {}
+        resume_text = _clean(data.get("resume_text"))
+        jd_text = _clean(data.get("jd_text"))
+        posting_id = data.get("posting_id")
+        resume_id = data.get("resume_id")
+        if not (resume_text or resume_id) or not (jd_text or posting_id):
+            return fail("resume_text (or resume_id) and jd_text (or posting_id) are required", 422)
+
+    profile, err = _resolve_jd(jd_text, posting_id)
+    if err:
+        return err
+    jd_text = profile.jd_text
+    uid = get_jwt_identity()
+    content = pdf_bytes if pdf_bytes is not None else resume_text
+
+    if content:
+        resume_id = resume_id_for(uid, content)
+        # same bytes/text + same JD + same taxonomy -> same result
+        key = ScanResultCache.key(content, jd_text, scan_cache_version())
+    else:
+        key = ScanResultCache.key(f"resume:{uid}:{resume_id}", jd_text, scan_cache_version())
+    with timed("cache"):
+        result, tier = _SCAN_CACHE.get(key)
+    if result is None:
+        # a resume seen before (any JD) skips PDF extraction and analysis
+        analysis = load_analysis(uid, resume_id)
+        if analysis is None:
+            if not content:
+                return fail("resume not found, send resume_text or the file again", 404)
+            if pdf_bytes is not None:
+                try:
+                    resume_text = _pdf_to_text(pdf_bytes)
+                except Exception as e:
+                    return fail("could not read pdf", 400, details=str(e))
+            analysis = analyze_resume(resume_text)
+            store_analysis(uid, resume_id, analysis)
+        result = _score_analysis(analysis, profile)
+        _SCAN_CACHE.set(key, result)
+    elif content and load_analysis(uid, resume_id) is None:
+        # a hit (maybe from another user's scan) never extracts the PDF; the resume_id
+        # is only returned once this user has an analysis stored under it
+        if pdf_bytes is None:
+            store_analysis(uid, resume_id, analyze_resume(resume_text))
+        else:
+            resume_id = None
+
+    body, code = ok("scan complete", **({"resume_id": resume_id} if resume_id else {}), **result)
+    return body, code, {"X-Cache": "HIT" if tier else "MISS", "X-Cache-Tier": tier or "none"}
+
+# -------- batch route --------
+def _batch_inputs():
+    """
+    Returns (profile, items, error). items are (id, resume_text | None, error | None).
+    JSON: {"jd_text": "..." | "posting_id": "...", "resumes": ["text", {"id": "...", "resume_text": "..."}]}
+    multipart: jd_text (or posting_id) field + one or more "files" PDFs
+    """
+    items = []
+    max_n = int(current_app.config.get("MAX_BATCH_RESUMES", 500))
+    if request.content_type and "multipart/form-data" in request.content_type:
+        jd_text = _clean(request.form.get("jd_text"))
+        posting_id = request.form.get("posting_id")
+        files = request.files.getlist("files") or request.files.getlist("file")
+        if not files or not (jd_text or posting_id):
+            return None, items, fail("pdf files and jd_text (or posting_id) are required", 422)
+        if len(files) > max_n:
+            return None, items, fail(f"too many resumes (>{max_n})", 413)
+        profile, err = _resolve_jd(jd_text, posting_id)
+        if err:
+            return None, items, err
+        items.extend(_pdf_items(files))  # same checks and extraction as /batch/stream
+    else:
+        data = request.get_json(silent=True) or {}
+        jd_text = _clean(data.get("jd_text"))
+        posting_id = data.get("posting_id")
+        resumes = data.get("resumes")
+        if not (jd_text or posting_id) or not isinstance(resumes, list) or not resumes:
+            return None, items, fail("jd_text (or posting_id) and a non-empty resumes list are required", 422)
+        if len(resumes) > max_n:
+            return None, items, fail(f"too many resumes (>{max_n})", 413)
+        profile, err = _resolve_jd(jd_text, posting_id)
+        if err:
+            return None, items, err
+        items.extend(_resume_item(i, r) for i, r in enumerate(resumes))
+    return profile, items, None
+
+@scan_bp.post("/batch")
+@jwt_required()
+def scan_batch():
+    jd, items, err = _batch_inputs()  # the JD is parsed once for the whole batch
+    if err:
+        return err
+
+    valid = [(rid, text) for rid, text, e in items if not e]
+    errors = [{"id": rid, "error": e} for rid, _, e in items if e]
+    sims = _semantic_sims([text for _, text in valid], jd)  # whole batch in one matrix op
+    results = [{"id": rid, **_score_resume(text, jd, sim)} for (rid, text), sim in zip(valid, sims)]
+
+    results.sort(key=lambda r: r["score"], reverse=True)  # stable: ties keep input order
+    for rank, r in enumerate(results, 1):
+        r["rank"] = rank
+    scored = len(results)
+
+    try:
+        top = int(request.args.get("top", 0))
+    except ValueError:
+        top = 0
+    if top > 0:
+        results = results[:top]
+
+    return ok(
+        "batch scan complete",
+        count=len(items),
+        scored=scored,
+        results=results,
+        errors=errors,
+    )
+
+# -------- streaming batch route --------
+_STREAM_CHUNK = 32  # resumes extracted / embedded together; bounds per-step memory
+
+def _chunks(it, n):
+    it = iter(it)
+    while True:
+        block = list(islice(it, n))
+        if not block:
+            return
+        yield block
+
+def _resume_item(i: int, r) -> tuple:
+    # one JSON resume entry, "text" or {"id", "resume_text"} -> (id, text | None, error | None)
+    if isinstance(r, dict):
+        rid, text = str(r.get("id") or i), r.get("resume_text")
+    else:
+        rid, text = str(i), r
+    text = _clean(text) if isinstance(text, str) else ""
+    return (rid, text, None) if text else (rid, None, "resume_text is required")
+
+def _ndjson_items(lines):
+    # body after the header line, one resume per line
+    i = 0
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield _resume_item(i, json.loads(line))
+        except ValueError:
+            yield str(i), None, "invalid json line"
+        i += 1
+
+def _pdf_items(files):
+    max_mb = float(current_app.config.get("MAX_FILE_MB", 10))
+    timeout = float(current_app.config.get("PDF_TIMEOUT_S", 20))
+    for block in _chunks(enumerate(files), _STREAM_CHUNK):
+        out, pending = [], []
+        for i, f in block:
+            rid = f.filename or str(i)
+            if getattr(f, "content_length", None) and f.content_length > max_mb * 1024 * 1024:
+                out.append((rid, None, f"file too large (>{max_mb}MB)"))
+            elif f.mimetype not in ("application/pdf", "application/x-pdf"):
+                out.append((rid, None, "only PDF files are allowed"))
+            else:
+                pending.append((len(out), f.read()))
+                out.append((rid, None, None))
+        with timed("pdf"):
+            texts = extract_many([data for _, data in pending], timeout=timeout)
+        for (slot, _), text in zip(pending, texts):
+            rid = out[slot][0]
+            out[slot] = (rid, None, str(text)) if isinstance(text, Exception) else (rid, text, None)
+        yield from out
+
+def _stream_inputs():
+    """
+    Returns (profile, item iterator, error); items are (id, resume_text | None, error | None)
+    and are produced lazily so nothing but the current chunk is held.
+    NDJSON (application/x-ndjson): first line {"jd_text" | "posting_id"}, then one resume per line.
+    JSON and multipart bodies take the same shape as /batch.
+    """
+    ctype = request.content_type or ""
+    max_n = int(current_app.config.get("MAX_BATCH_RESUMES", 500))
+    if "multipart/form-data" in ctype:
+        jd_text = _clean(request.form.get("jd_text"))
+        posting_id = request.form.get("posting_id")
+        files = request.files.getlist("files") or request.files.getlist("file")
+        if not files or not (jd_text or posting_id):
+            return None, None, fail("pdf files and jd_text (or posting_id) are required", 422)
+        if len(files) > max_n:
+            return None, None, fail(f"too many resumes (>{max_n})", 413)
+        items = _pdf_items(files)
+    elif "ndjson" in ctype:
+        lines = (raw.decode("utf-8", "replace") for raw in request.stream)
+        try:
+            head = json.loads(next((ln for ln in lines if ln.strip()), "{}"))
+        except ValueError:
+            return None, None, fail("first line must be a json object with jd_text or posting_id", 422)
+        if not isinstance(head, dict):
+            head = {}
+        jd_text, posting_id = _clean(head.get("jd_text")), head.get("posting_id")
+        if not (jd_text or posting_id):
+            return None, None, fail("first line must be a json object with jd_text or posting_id", 422)
+        items = _ndjson_items(lines)
+    else:
+        data = request.get_json(silent=True) or {}
+        jd_text = _clean(data.get("jd_text"))
+        posting_id = data.get("posting_id")
+        resumes = data.get("resumes")
+        if not (jd_text or posting_id) or not isinstance(resumes, list) or not resumes:
+            return None, None, fail("jd_text (or posting_id) and a non-empty resumes list are required", 422)
+        if len(resumes) > max_n:
+            return None, None, fail(f"too many resumes (>{max_n})", 413)
+        items = (_resume_item(i, r) for i, r in enumerate(resumes))
+    profile, err = _resolve_jd(jd_text, posting_id)
+    if err:
+        return None, None, err
+    return profile, items, None
+
+def _leaderboard(heap) -> list:
+    # heap holds (score, -index, id); best first, ties by input order like /batch
+    top = sorted(heap, reverse=True)
+    return [{"rank": n, "id": rid, "score": score} for n, (score, _, rid) in enumerate(top, 1)]
+
+def _ranked_events(jd: JobProfile, items, k: int):
+    """Score chunk by chunk and keep only a k-sized min-heap of the best results."""
+    heap, index, scored, errors = [], 0, 0, 0
+    for block in _chunks(items, _STREAM_CHUNK):
+        valid = [(rid, text) for rid, text, e in block if not e]
+        for rid, _, e in block:
+            if e:
+                errors += 1
+                yield "error", {"id": rid, "error": e}
+        sims = _semantic_sims([text for _, text in valid], jd)
+        for (rid, text), sim in zip(valid, sims):
+            result = _score_resume(text, jd, sim)
+            scored += 1
+            yield "result", {"id": rid, **result}
+            entry = (result["score"], -index, rid)
+            index += 1
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+            else:
+                continue
+            yield "leaderboard", {"scored": scored, "top": _leaderboard(heap)}
+    yield "done", {"count": scored + errors, "scored": scored, "errors": errors, "top": _leaderboard(heap)}
+
+@scan_bp.post("/batch/stream")
+@jwt_required()
+def scan_batch_stream():
+    """
+    Like /batch, but every result is written as soon as it is scored.
+    ?format=ndjson (default) or sse (also picked by Accept: text/event-stream).
+    Events: result, error, leaderboard (when the top-K changes) and a final done.
+    ?top=K sizes the leaderboard (default 10, max 100).
+    """
+    jd, items, err = _stream_inputs()
+    if err:
+        return err
+    try:
+        k = max(1, min(int(request.args.get("top", 10)), 100))
+    except ValueError:
+        k = 10
+    fmt = request.args.get("format") or (
+        "sse" if "text/event-stream" in (request.headers.get("Accept") or "") else "ndjson")
+
+    def body():
+        for event, data in _ranked_events(jd, items, k):
+            payload = json.dumps(data)
+            if fmt == "sse":
+                yield f"event: {event}\ndata: {payload}\n\n"
+            else:
+                yield json.dumps({"event": event, **data}) + "\n"
+
+    mimetype = "text/event-stream" if fmt == "sse" else "application/x-ndjson"
+    # no proxy buffering, or the client still sees everything at the end
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return Response(stream_with_context(body()), mimetype=mimetype, headers=headers)
+
+# -------- matrix route --------
+def _matrix_jds(jds: list, uid: str) -> list:
+    """(id, profile | None, error | None) per entry: "text", {"id", "jd_text"} or {"id", "posting_id"}."""
+    out, wanted = [], {}
+    for i, j in enumerate(jds):
+        if isinstance(j, dict):
+            jid, text, pid = str(j.get("id") or j.get("posting_id") or i), _clean(j.get("jd_text")), j.get("posting_id")
+        else:
+            jid, text, pid = str(i), _clean(j) if isinstance(j, str) else "", None
+        if text:
+            out.append((jid, job_profile(text), None))
+        elif pid and ObjectId.is_valid(str(pid)):
+            wanted[len(out)] = ObjectId(str(pid))
+            out.append((jid, None, None))
+        else:
+            out.append((jid, None, "jd_text or a valid posting_id is required"))
+    if wanted:
+        # every posting in one read
+        docs = {d["_id"]: d for d in postings_col().find(
+            {"_id": {"$in": list(wanted.values())}, "user_id": ObjectId(uid)})}
+        for slot, pid in wanted.items():
+            doc = docs.get(pid)
+            out[slot] = (out[slot][0], profile_from_doc(doc), None) if doc else (out[slot][0], None, "posting not found")
+    return out
+
+def _matrix_resume(i: int, r, uid: str) -> tuple:
+    # "text", {"id", "resume_text"} or {"id", "resume_id"} -> (id, analysis | None, error | None)
+    if isinstance(r, dict) and r.get("resume_id") and not r.get("resume_text"):
+        a = load_analysis(uid, str(r["resume_id"]))
+        return (str(r.get("id") or r["resume_id"]), a, None if a else "resume not found")
+    rid, text, err = _resume_item(i, r)
+    return (rid, None, err) if err else (rid, analyze_resume(text), None)
+
+@scan_bp.post("/matrix")
+@jwt_required()
+def scan_matrix():
+    """
+    Score M resumes against N JDs in one call:
+    {"resumes": [...], "jds": [...], "breakdown": false}. Resumes are texts,
+    {"id", "resume_text"} or {"id", "resume_id"}; JDs are texts, {"id", "jd_text"}
+    or {"id", "posting_id"}. scores[i][j] is resume i against JD j, the same
+    value POST /api/scan/ returns; breakdown adds the per-cell rubric parts.
+    """
+    if np is None:
+        return fail("matrix scoring needs numpy", 503)
+    data = request.get_json(silent=True) or {}
+    resumes, jds = data.get("resumes"), data.get("jds")
+    if not isinstance(resumes, list) or not resumes or not isinstance(jds, list) or not jds:
+        return fail("non-empty resumes and jds lists are required", 422)
+    max_m = int(current_app.config.get("MAX_BATCH_RESUMES", 500))
+    max_n = int(current_app.config.get("MAX_MATRIX_JDS", 50))
+    if len(resumes) > max_m:
+        return fail(f"too many resumes (>{max_m})", 413)
+    if len(jds) > max_n:
+        return fail(f"too many jds (>{max_n})", 413)
+
+    uid = get_jwt_identity()
+    try:
+        jd_items = _matrix_jds(jds, uid)
+    except Exception as e:
+        return fail("could not load postings", 400, details=str(e))
+    res_items = [_matrix_resume(i, r, uid) for i, r in enumerate(resumes)]
+    errors = ([{"resume": rid, "error": e} for rid, _, e in res_items if e] +
+              [{"jd": jid, "error": e} for jid, _, e in jd_items if e])
+    res_items = [(rid, a) for rid, a, e in res_items if not e]
+    jd_items = [(jid, p) for jid, p, e in jd_items if not e]
+    if not res_items or not jd_items:
+        return fail("nothing to score", 422, details=errors)
+
+    analyses, profiles = [a for _, a in res_items], [p for _, p in jd_items]
+    sem = semantic_grid(analyses, profiles)
+    with timed("matrix"):
+        parts, jd = score_matrix(analyses, profiles, sem)
+    out = {
+        "resumes": [rid for rid, _ in res_items],
+        "jds": [jid for jid, _ in jd_items],
+        "scores": [[round(x, 4) for x in row] for row in parts["score"].tolist()],
+    }
+    if data.get("breakdown"):
+        out["breakdown"] = [[grid_breakdown(parts, i, j, jd) for j in range(len(profiles))]
+                            for i in range(len(analyses))]
+    return ok("matrix scored", **out, errors=errors)
@@ -1,64 +1,463 @@
-from flask import Blueprint, request
+from flask import Blueprint, request, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models.db import scans_col
+from pymongo.errors import BulkWriteError
+from app.models.db import get_db, scans_col
+from app.routes.scan import _chunks, _extract_skills_with_evidence, analysis_text, analyze_resume, pool_features
+from app.services import minhash, text_store
 from app.utils.responses import ok, created, fail
 from datetime import datetime
 from bson import ObjectId
+import base64
+import json
+import logging
 
 scans_bp = Blueprint("scans", __name__, url_prefix="/api/scans")
+log = logging.getLogger("resume_backend")
+
+
+def _preview(text: str) -> str:
+    return (text[:120] + "...") if text else ""
+
+
+def scan_doc(user_id, resume_text: str, jd_text: str, result: dict, source: str = "text") -> dict:
+    """
+    A `scans` document as save_scan builds it (texts capped at 10k chars).
+    source "pdf" marks resume_text as extracted from a PDF (see analysis_text).
+    text_store.pack() moves the bodies out before it is written.
+    """
+    resume_text, jd_text = (resume_text or "")[:10000], (jd_text or "")[:10000]
+    return {
+        "user_id": ObjectId(user_id),
+        "created_at": datetime.utcnow(),
+        "resume_text": resume_text,
+        "jd_text": jd_text,
+        "result": result,
+        **({"resume_source": source} if source != "text" else {}),
+        **summary_fields(resume_text, jd_text, result, source),
+    }
+
+
+def summary_fields(resume_text: str, jd_text: str, result: dict, source: str = "text") -> dict:
+    """
+    Top-level fields computed at write time: skills/score back skill search,
+    the counts and previews let history pages skip the big text fields, and
+    features lets the talent pool rank saved resumes without re-reading them;
+    minhash/lsh find near-duplicate resumes (see link_duplicates). Skills and
+    features come from analysis_text, the form the scan analysed, so a saved
+    resume ranks in the pool with the score its scan returned.
+    """
+    try:
+        score = float(result.get("score", 0) or 0)
+    except (TypeError, ValueError):
+        score = 0.0
+    analysis = analyze_resume(analysis_text(resume_text, source))
+    sig = minhash.signature(resume_text) if minhash.available() else None
+    return {
+        "skills": analysis.skills,
+        "score": score,
+        "matched_count": len(result.get("matched_skills") or []),
+        "missing_count": len(result.get("missing_skills") or []),
+        "resume_preview": _preview(resume_text),
+        "jd_preview": _preview(jd_text),
+        "features": pool_features(analysis),
+        **({"minhash": sig, "lsh": minhash.band_keys(sig)} if sig else {}),
+    }
+
+
+# only these fields are read for a history page
+_SUMMARY_PROJECTION = {
+    "created_at": 1, "score": 1, "matched_count": 1, "missing_count": 1,
+    "resume_preview": 1, "jd_preview": 1, "dup_of": 1, "dup_score": 1,
+}
+
+
+def _dup_fields(d: dict) -> dict:
+    if not d.get("dup_of"):
+        return {}
+    return {"duplicate_of": str(d["dup_of"]), "similarity": d.get("dup_score")}
+
+
+def _summary(d: dict) -> dict:
+    return {
+        "id": str(d["_id"]),
+        "created_at": d.get("created_at").isoformat() + "Z",
+        "score": float(d.get("score", 0)),
+        "matched": d.get("matched_count", 0),
+        "missing": d.get("missing_count", 0),
+        "resume_preview": d.get("resume_preview", ""),
+        "jd_preview": d.get("jd_preview", ""),
+        **_dup_fields(d),
+    }
+
+
+def _full(d: dict) -> dict:
+    return {
+        "id": str(d["_id"]),
+        "created_at": d.get("created_at").isoformat() + "Z",
+        "score": float(d.get("result", {}).get("score", 0)),
+        "matched": len(d.get("result", {}).get("matched_skills", [])),
+        "missing": len(d.get("result", {}).get("missing_skills", [])),
+        "resume_preview": _preview(d.get("resume_text", "")),
+        "jd_preview": _preview(d.get("jd_text", "")),
+        "resume_text": d.get("resume_text", ""),
+        "jd_text": d.get("jd_text", ""),
+        "result": d.get("result", {}),
+        **_dup_fields(d),
+    }
+
+
+def _encode_cursor(d: dict) -> str:
+    raw = f"{d['created_at'].isoformat()}|{d['_id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _after_cursor(cursor: str) -> dict:
+    """Keyset condition for rows strictly after the cursor in (created_at, _id) desc order."""
+    created_at, oid = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+    created_at, oid = datetime.fromisoformat(created_at), ObjectId(oid)
+    return {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "_id": {"$lt": oid}},
+    ]}
+
+
+def save_inputs(data: dict) -> tuple:
+    """(resume_text, jd_text, result) from a save request body, texts capped like scan_doc."""
+    return (data.get("resume_text") or "")[:10000], (data.get("jd_text") or "")[:10000], data.get("result") or {}
+
+
+def list_query(uid: str, args) -> tuple[dict, int, bool]:
+    """
+    (mongo filter, limit, full view) for a history page; ValueError on a bad
+    cursor. ?dedup=1 keeps one scan per near-duplicate cluster (its first),
+    ?duplicates_of=<id> lists the copies linked to that scan.
+    """
+    try:
+        limit = max(1, min(int(args.get("limit", 20)), 100))
+    except (TypeError, ValueError):
+        limit = 20
+    q = {"user_id": ObjectId(uid)}
+    cursor = args.get("cursor")
+    if cursor:
+        try:
+            q.update(_after_cursor(cursor))
+        except Exception as e:
+            raise ValueError("invalid cursor") from e
+    if args.get("duplicates_of"):
+        if not ObjectId.is_valid(args["duplicates_of"]):
+            raise ValueError("invalid duplicates_of")
+        q["dup_of"] = ObjectId(args["duplicates_of"])
+    elif args.get("dedup") in ("1", "true"):
+        q["dup_of"] = None  # never linked, including scans saved before dedup existed
+    return q, limit, args.get("view") == "full"
+
+
+def history_page(docs: list, limit: int, full: bool, dups: dict | None = None) -> tuple[list, str | None]:
+    """
+    Items + next cursor from the limit + 1 docs a list_query() find returned;
+    dups (root _id -> copies, from duplicate_counts_pipeline) adds a duplicates count.
+    """
+    page = docs[:limit]
+    items = [_full(d) if full else _summary(d) for d in page]
+    if dups is not None:
+        for it, d in zip(items, page):
+            it["duplicates"] = dups.get(d["_id"], 0)
+    return items, _encode_cursor(page[-1]) if len(docs) > limit else None
+
+
+# ---------- near-duplicates ----------
+_DEDUP_PROJECTION = {"minhash": 1, "lsh": 1, "dup_of": 1}
+
+
+def dedup_query(user_id, docs: list) -> dict | None:
+    """Filter for stored scans sharing an LSH bucket with any of the docs (None: nothing to look up)."""
+    keys = sorted({k for d in docs for k in d.get("lsh", ())})
+    return {"user_id": ObjectId(user_id), "lsh": {"$in": keys}} if keys else None
+
+
+def link_duplicates(docs: list, candidates: list, threshold: float) -> int:
+    """
+    Link each new doc to its most similar LSH candidate (stored scans from
+    dedup_query, then earlier docs of the same batch) when the estimated
+    Jaccard reaches the threshold: dup_of is the candidate's cluster root, so
+    every copy points at the first scan. Gives unsaved docs their _id. Returns links made.
+    """
+    buckets = {}
+
+    def add(c):
+        for k in c.get("lsh", ()):
+            buckets.setdefault(k, []).append(c)
+
+    for c in candidates:
+        add(c)
+    linked = 0
+    for d in docs:
+        d.setdefault("_id", ObjectId())
+        if not d.get("minhash"):
+            continue
+        seen = {d["_id"]}
+        best, best_sim = None, threshold
+        for k in d["lsh"]:
+            for c in buckets.get(k, ()):
+                if c["_id"] in seen:
+                    continue
+                seen.add(c["_id"])
+                sim = minhash.similarity(d["minhash"], c.get("minhash"))
+                if sim >= best_sim:
+                    best, best_sim = c, sim
+        if best is not None:
+            d["dup_of"], d["dup_score"] = best.get("dup_of") or best["_id"], round(best_sim, 4)
+            linked += 1
+        add(d)
+    return linked
+
+
+def find_duplicates(col, user_id, docs: list) -> int:
+    """link_duplicates against the user's stored scans; lookup failures only skip linking."""
+    q = dedup_query(user_id, docs)
+    if q is None:
+        for d in docs:
+            d.setdefault("_id", ObjectId())
+        return 0
+    try:
+        limit = current_app.config["DEDUP_MAX_CANDIDATES"] * len(docs)
+        candidates = list(col.find(q, _DEDUP_PROJECTION).limit(limit))
+    except Exception as e:
+        log.warning("dedup_lookup_failed count=%d error=%s", len(docs), e)
+        candidates = []
+    return link_duplicates(docs, candidates, current_app.config["DEDUP_THRESHOLD"])
+
+
+def duplicate_counts_pipeline(user_id, docs: list) -> list:
+    """Aggregation counting the copies linked to each doc of a history page."""
+    return [
+        {"$match": {"user_id": ObjectId(user_id), "dup_of": {"$in": [d["_id"] for d in docs]}}},
+        {"$group": {"_id": "$dup_of", "n": {"$sum": 1}}},
+    ]
+
+
+# ---------- bulk save / import ----------
+def ndjson_records(lines):
+    """(record | None, error | None) per non-empty NDJSON line, lazily."""
+    for line in lines:
+        line = line.strip()
+        if line:
+            try:
+                yield json.loads(line), None
+            except ValueError:
+                yield None, "invalid json line"
+
+
+def _bulk_doc(user_id, rec) -> tuple:
+    """Validated + truncated like save_scan; an optional ISO created_at keeps imported history in order."""
+    if not isinstance(rec, dict):
+        return None, "scan must be a json object"
+    resume_text, jd_text, result = save_inputs(rec)
+    if not resume_text or not jd_text or not isinstance(result, dict):
+        return None, "resume_text, jd_text and result are required"
+    doc = scan_doc(user_id, resume_text, jd_text, result)
+    if rec.get("created_at"):
+        try:
+            doc["created_at"] = datetime.fromisoformat(str(rec["created_at"]).replace("Z", "+00:00")).replace(tzinfo=None)
+        except ValueError:
+            return None, "created_at must be an ISO 8601 timestamp"
+    return doc, None
+
+
+def insert_scans(col, user_id, records, chunk_size: int, dry_run: bool = False) -> tuple[list, int]:
+    """
+    Validate and insert (record, parse error) pairs in chunks with insert_many(ordered=False),
+    so one bad document doesn't stop the rest. Returns (per-item results in input order, inserted).
+    """
+    results, inserted = [], 0
+    for block in _chunks(enumerate(records), max(1, chunk_size)):
+        docs, slots = [], []
+        for i, (rec, err) in block:
+            doc, err = (None, err) if err else _bulk_doc(user_id, rec)
+            if err:
+                results.append({"index": i, "error": err})
+            else:
+                slots.append(len(results))
+                results.append({"index": i, "id": None})
+                docs.append(doc)
+        if not docs:
+            continue
+        failed = {}
+        try:
+            if not dry_run:
+                find_duplicates(col, user_id, docs)  # one bucket lookup per chunk; also assigns _ids
+                text_store.save(col.database, text_store.pack(docs))
+                col.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            failed = {w["index"]: w.get("errmsg", "write failed") for w in e.details.get("writeErrors", [])}
+        except Exception as e:
+            # no per-document outcome (e.g. connection lost); some of the chunk may be written
+            failed = dict.fromkeys(range(len(docs)), f"chunk not confirmed: {e}")
+        for k, (slot, doc) in enumerate(zip(slots, docs)):
+            if k in failed:
+                results[slot] = {"index": results[slot]["index"], "error": failed[k]}
+            else:
+                results[slot]["id"] = str(doc["_id"]) if "_id" in doc else None
+                results[slot].update(_dup_fields(doc))
+                inserted += 1
+    return results, inserted
+
+
+def _canonical_skill(term: str) -> str:
+    # "golang" -> "go", "ReactJS" -> "react"; unknown terms are used as typed
+    t = (term or "").strip().lower()
+    found = _extract_skills_with_evidence(t)[0]
+    return found[0] if len(found) == 1 else t
+
+
+def _skill_list(arg: str | None) -> list[str]:
+    return sorted({_canonical_skill(x) for x in (arg or "").split(",") if x.strip()})
 
 @scans_bp.post("/")
 @jwt_required()
 def save_scan():
-    data = request.get_json(silent=True) or {}
-    resume_text = (data.get("resume_text") or "")[:10000]
-    jd_text = (data.get("jd_text") or "")[:10000]
-    result = data.get("result") or {}
-
+    resume_text, jd_text, result = save_inputs(request.get_json(silent=True) or {})
     if not resume_text or not jd_text or not isinstance(result, dict):
         return fail("resume_text, jd_text and result are required", 422)
 
     uid = get_jwt_identity()
     try:
-        doc = {
-            "user_id": ObjectId(uid),
-            "created_at": datetime.utcnow(),
-            "resume_text": resume_text,
-            "jd_text": jd_text,
-            "result": result,
-        }
+        doc = scan_doc(uid, resume_text, jd_text, result)
+        find_duplicates(scans_col(), uid, [doc])
+        text_store.save(get_db(), text_store.pack([doc]))
         ins = scans_col().insert_one(doc)
-        return created("saved", id=str(ins.inserted_id))
+        return created("saved", id=str(ins.inserted_id), **_dup_fields(doc))
     except Exception as e:
         return fail("could not save scan", 500, details=str(e))
 
+@scans_bp.post("/bulk")
+@jwt_required()
+def bulk_save_scans():
+    """
+    Save many scans in one call: a JSON array (or {"scans": [...]}) or NDJSON
+    (application/x-ndjson), one {resume_text, jd_text, result[, created_at]} each.
+    Returns per-item ids or errors in input order.
+    """
+    max_n = int(current_app.config.get("MAX_BULK_SCANS", 10000))
+    if "ndjson" in (request.content_type or ""):
+        lines = (raw.decode("utf-8", "replace") for raw in request.stream)
+        records = ((rec, err) if i < max_n else (None, f"too many scans (>{max_n})")
+                   for i, (rec, err) in enumerate(ndjson_records(lines)))
+    else:
+        data = request.get_json(silent=True)
+        scans = data.get("scans") if isinstance(data, dict) else data
+        if not isinstance(scans, list) or not scans:
+            return fail("a non-empty json array of scans is required", 422)
+        if len(scans) > max_n:
+            return fail(f"too many scans (>{max_n})", 413)
+        records = ((r, None) for r in scans)
+
+    uid = get_jwt_identity()
+    chunk = int(current_app.config.get("BULK_CHUNK_SIZE", 500))
+    results, inserted = insert_scans(scans_col(), uid, records, chunk)
+    if not results:
+        return fail("a non-empty json array of scans is required", 422)
+    if not inserted:
+        return fail("no scans saved", 422, details=results)
+    return created("saved", inserted=inserted, failed=len(results) - inserted, items=results)
+
 @scans_bp.get("/")
 @jwt_required()
 def list_scans():
+    """
+    History page. Summaries only (projection) unless ?view=full.
+    Keyset pagination: pass the returned next_cursor as ?cursor= for the next page.
+    ?dedup=1 shows each near-duplicate cluster once, with a duplicates count.
+    """
     uid = get_jwt_identity()
+    try:
+        q, limit, full = list_query(uid, request.args)
+    except ValueError as e:
+        return fail(str(e), 422)
+    try:
+        cur = (scans_col()
+               .find(q, None if full else _SUMMARY_PROJECTION)
+               .sort([("created_at", -1), ("_id", -1)])
+               .limit(limit + 1))
+        docs = list(cur)
+        if full:
+            text_store.hydrate(get_db(), docs[:limit])
+        dups = None
+        if "dup_of" in q and q["dup_of"] is None and docs:  # ?dedup=1: count each root's copies
+            dups = {r["_id"]: r["n"] for r in scans_col().aggregate(duplicate_counts_pipeline(uid, docs[:limit]))}
+        items, next_cursor = history_page(docs, limit, full, dups)
+        return ok("fetched", items=items, next_cursor=next_cursor)
+    except Exception as e:
+        return fail("could not list scans", 500, details=str(e))
+
+@scans_bp.get("/<scan_id>")
+@jwt_required()
+def get_scan(scan_id: str):
+    try:
+        d = scans_col().find_one({"_id": ObjectId(scan_id), "user_id": ObjectId(get_jwt_identity())})
+    except Exception as e:
+        return fail("could not load scan", 400, details=str(e))
+    if not d:
+        return fail("scan not found", 404)
+    try:
+        text_store.hydrate(get_db(), [d])
+    except Exception as e:
+        return fail("could not load scan", 500, details=str(e))
+    return ok("fetched", **_full(d))
+
+@scans_bp.get("/search")
+@jwt_required()
+def search_scans():
+    """
+    Saved scans by skill, e.g. ?all=kubernetes,go&any=aws,gcp&min_score=0.5
+    Backed by the multikey {user_id, skills, created_at} index.
+    Paginate with ?limit=&offset=.
+    """
+    uid = get_jwt_identity()
+    all_of = _skill_list(request.args.get("all"))
+    any_of = _skill_list(request.args.get("any"))
+    if not all_of and not any_of:
+        return fail("at least one of all= or any= is required", 422)
     try:
         limit = max(1, min(int(request.args.get("limit", 20)), 100))
-    except:
-        limit = 20
+        offset = max(0, int(request.args.get("offset", 0)))
+        min_score = request.args.get("min_score")
+        max_score = request.args.get("max_score")
+        min_score = float(min_score) if min_score not in (None, "") else None
+        max_score = float(max_score) if max_score not in (None, "") else None
+    except ValueError:
+        return fail("limit, offset, min_score and max_score must be numbers", 422)
+
+    q = {"user_id": ObjectId(uid)}
+    if all_of and any_of:
+        q["$and"] = [{"skills": {"$all": all_of}}, {"skills": {"$in": any_of}}]
+    elif all_of:
+        q["skills"] = {"$all": all_of}
+    else:
+        q["skills"] = {"$in": any_of}
+    if min_score is not None or max_score is not None:
+        q["score"] = {}
+        if min_score is not None:
+            q["score"]["$gte"] = min_score
+        if max_score is not None:
+            q["score"]["$lte"] = max_score
+
     try:
         cur = (scans_col()
-               .find({"user_id": ObjectId(uid)})
+               .find(q, {"created_at": 1, "score": 1, "skills": 1, "resume_preview": 1})
                .sort("created_at", -1)
-               .limit(limit))
-        items = []
-        for d in cur:
-            items.append({
-                "id": str(d["_id"]),
-                "created_at": d.get("created_at").isoformat() + "Z",
-                "score": float(d.get("result", {}).get("score", 0)),
-                "matched": len(d.get("result", {}).get("matched_skills", [])),
-                "missing": len(d.get("result", {}).get("missing_skills", [])),
-                "resume_preview": (d.get("resume_text", "")[:120] + "...") if d.get("resume_text") else "",
-                "jd_preview": (d.get("jd_text", "")[:120] + "...") if d.get("jd_text") else "",
-                "resume_text": d.get("resume_text", ""),
-                "jd_text": d.get("jd_text", ""),
-                "result": d.get("result", {}),
-            })
-        return ok("fetched", items=items)
+               .skip(offset)
+               .limit(limit + 1))
+        docs = list(cur)
+        items = [{
+            "id": str(d["_id"]),
+            "created_at": d.get("created_at").isoformat() + "Z",
+            "score": float(d.get("score", 0)),
+            "skills": d.get("skills", []),
+            "resume_preview": d.get("resume_preview", ""),
+        } for d in docs[:limit]]
+        more = len(docs) > limit
+        return ok("fetched", items=items, all=all_of, any=any_of,
+                  next_offset=offset + limit if more else None)
     except Exception as e:
-        return fail("could not list scans", 500, details=str(e))
+        return fail("could not search scans", 500, details=str(e))
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+log = logging.getLogger("resume_backend")
+
+
+def content_hash(data) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data or b"").hexdigest()
+
+
+def version_tag(*parts) -> str:
+    # stable short hash of any JSON-able config (taxonomy, weights, ...)
+    blob = json.dumps(parts, sort_keys=True, default=sorted)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+class TTLCache:
+    """Thread-safe in-process LRU with a per-entry time to live."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class ScanResultCache:
+    """
+    Two tiers: in-process TTLCache, then a shared Mongo collection.
+    Keys are content hashes, so a changed resume, JD or version tag
+    (taxonomy, scoring, PDF extractor) simply never matches an old entry.
+    """
+
+    def __init__(self, collection_getter, maxsize: int = 1024, ttl: float = 3600, shared: bool = True):
+        self.local = TTLCache(maxsize, ttl)
+        self._col = collection_getter
+        self.shared = shared
+
+    @staticmethod
+    def key(resume, jd_text: str, version: str) -> str:
+        return f"{version}:{content_hash(resume)}:{content_hash(jd_text)}"
+
+    def get(self, key):
+        """(value, tier) where tier is "memory", "mongo" or None on a miss."""
+        value = self.local.get(key)
+        if value is not None:
+            return value, "memory"
+        if not self.shared:
+            return None, None
+        try:
+            doc = self._col().find_one({"_id": key}, {"result": 1})
+            value = json.loads(doc["result"]) if doc else None
+        except Exception as e:
+            log.warning("scan_cache_read_error error=%s", e)
+            return None, None
+        if value is None:
+            return None, None
+        self.local.set(key, value)
+        return value, "mongo"
+
+    def set(self, key, value):
+        self.local.set(key, value)
+        if not self.shared:
+            return
+        try:
+            self._col().replace_one(
+                {"_id": key},
+                # stored as JSON text: skill names like "node.js" are not safe field names
+                {"_id": key, "result": json.dumps(value), "created_at": datetime.utcnow()},
+                upsert=True,
+            )
+        except Exception as e:
+            log.warning("scan_cache_write_error error=%s", e)
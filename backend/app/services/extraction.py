@@ -0,0 +1,185 @@
+"""
+PDF text extraction off the request thread.
+
+A bounded process pool parses PDFs so a big upload doesn't hold the
+worker's GIL. Large documents can be split into page ranges that run on
+several workers; the page text is joined back in page order.
+"""
+import logging
+import math
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from app.config import Config
+from app.services import pdf_extractor
+
+log = logging.getLogger("resume_backend")
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+# ---- worker side (must stay importable without flask) ----
+def _page_count(data: bytes) -> int:
+    return pdf_extractor.page_count(data, Config.PDF_BACKEND)
+
+
+def _extract_pages(data: bytes, start: int = 0, stop: int | None = None) -> list[str]:
+    return pdf_extractor.extract_pages(data, start, stop, Config.PDF_BACKEND)
+
+
+# ---- pool ----
+class _Pool:
+    """A ProcessPoolExecutor that knows its in-flight futures, so it can be retired without hurting them."""
+
+    def __init__(self, workers: int, ctx):
+        self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+        self._inflight = set()
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args):
+        f = self.executor.submit(fn, *args)
+        with self._lock:
+            self._inflight.add(f)
+        f.add_done_callback(self._done)
+        return f
+
+    def _done(self, f):
+        with self._lock:
+            self._inflight.discard(f)
+
+    def retire(self, stuck, grace: float):
+        """
+        Take no more work; in the background, give every other caller's task up
+        to `grace` seconds, then terminate the workers still busy (the stuck
+        ones), so hung processes never pile up.
+        """
+        def run():
+            with self._lock:
+                others = [f for f in self._inflight if f not in stuck]
+            wait(others, timeout=grace)
+            self.terminate()
+
+        threading.Thread(target=run, name="pdf-pool-retire", daemon=True).start()
+
+    def terminate(self):
+        procs = list((getattr(self.executor, "_processes", None) or {}).values())
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        for p in procs:
+            if p.is_alive():
+                p.terminate()
+
+
+def get_pool() -> _Pool | None:
+    """Shared pool, created lazily per process (so it is safe after a gunicorn fork)."""
+    global _pool
+    if Config.PDF_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # never plain fork: the web process runs threads (request, job, pool
+            # threads) whose locks a forked child would inherit mid-use
+            method = Config.PDF_START_METHOD
+            if method not in multiprocessing.get_all_start_methods():
+                method = "spawn"
+            _pool = _Pool(Config.PDF_WORKERS, multiprocessing.get_context(method))
+            log.info("pdf_pool_started workers=%s start_method=%s", Config.PDF_WORKERS, method)
+        return _pool
+
+
+def shutdown_pool(wait: bool = True):
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.executor.shutdown(wait=wait, cancel_futures=True)
+            _pool = None
+
+
+def _reset_broken_pool(pool: _Pool, stuck, grace: float):
+    # a timed-out task keeps its worker busy: later requests get a fresh pool, and
+    # only this pool is retired once the other requests already on it are done
+    global _pool
+    with _pool_lock:
+        if _pool is not pool:
+            return  # another request already replaced it
+        _pool = None
+    log.warning("pdf_pool_reset reason=timeout stuck=%d", len(stuck))
+    pool.retire(stuck, grace)
+
+
+def _wait(pool: _Pool, futures, timeout: float | None):
+    done, not_done = wait(futures, timeout=timeout)  # one deadline for all parts
+    if not_done:
+        for f in not_done:
+            f.cancel()
+        _reset_broken_pool(pool, not_done, timeout or 0)
+        raise RuntimeError(f"pdf_read_error: timed out after {timeout}s")
+    return [f.result() for f in futures]
+
+
+# ---- public API ----
+def extract_pdf_text(data: bytes, *, timeout: float | None = None, split_pages: int | None = None) -> str:
+    """
+    Text of every page joined by newlines.
+    split_pages: documents with at least this many pages are split across
+    workers (0 disables; defaults to Config.PDF_SPLIT_PAGES).
+    """
+    timeout = Config.PDF_TIMEOUT_S if timeout is None else timeout
+    split_pages = Config.PDF_SPLIT_PAGES if split_pages is None else split_pages
+    try:
+        pool = get_pool()
+        if pool is None:
+            return "\n".join(_extract_pages(data))
+
+        n = _page_count(data) if split_pages > 0 else 0
+        if split_pages > 0 and n >= split_pages and Config.PDF_WORKERS > 1:
+            step = math.ceil(n / Config.PDF_WORKERS)
+            futures = [pool.submit(_extract_pages, data, lo, lo + step) for lo in range(0, n, step)]
+        else:
+            futures = [pool.submit(_extract_pages, data)]
+
+        pages = []
+        for chunk in _wait(pool, futures, timeout):
+            pages.extend(chunk)
+        return "\n".join(pages)
+    except Exception as e:
+        if str(e).startswith("pdf_read_error"):
+            raise
+        raise RuntimeError(f"pdf_read_error: {e}")
+
+
+def extract_many(docs: list[bytes], *, timeout: float | None = None) -> list:
+    """
+    Extract several documents concurrently, one task each.
+    Returns a list aligned with docs: the text, or the RuntimeError for that document.
+    The whole batch shares one deadline: timeout per wave of PDF_WORKERS documents.
+    """
+    timeout = Config.PDF_TIMEOUT_S if timeout is None else timeout
+    pool = get_pool()
+    if pool is None:
+        return [_safe(extract_pdf_text, d, timeout=timeout) for d in docs]
+
+    futures = [pool.submit(_extract_pages, d) for d in docs]
+    deadline = timeout * math.ceil(len(docs) / max(1, Config.PDF_WORKERS)) if timeout else None
+    _, not_done = wait(futures, timeout=deadline)
+    out = []
+    for f in futures:
+        if f in not_done:
+            f.cancel()
+            out.append(RuntimeError(f"pdf_read_error: timed out after {deadline}s"))
+            continue
+        try:
+            out.append("\n".join(f.result()))
+        except Exception as e:
+            out.append(RuntimeError(f"pdf_read_error: {e}"))
+    if not_done:
+        _reset_broken_pool(pool, not_done, timeout)
+    return out
+
+
+def _safe(fn, *args, **kwargs):
+    try:
+        return fn(*args, **kwargs)
+    except Exception as e:
+        return e
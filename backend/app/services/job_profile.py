@@ -0,0 +1,41 @@
+class JobProfile:
+    """
+    Everything the rubric needs from a JD, derived once per distinct JD.
+    Kept small (__slots__) because many live in the JD cache at once.
+    """
+
+    __slots__ = ("jd_text", "required", "optional", "years", "title", "version", "vector")
+
+    def __init__(self, jd_text: str, required: set, optional: set, years: int | None, title: set, version: str = ""):
+        self.jd_text = jd_text
+        self.required = frozenset(required)
+        self.optional = frozenset(optional)
+        self.years = years
+        self.title = frozenset(title)  # expanded title tokens
+        self.version = version  # taxonomy version it was parsed with
+        self.vector = None  # semantic embedding, filled lazily (never stored)
+
+    @property
+    def union(self) -> frozenset:
+        return self.required | self.optional
+
+    def to_doc(self) -> dict:
+        return {
+            "jd_text": self.jd_text,
+            "required": sorted(self.required),
+            "optional": sorted(self.optional),
+            "years": self.years,
+            "title_tokens": sorted(self.title),
+            "taxonomy_version": self.version,
+        }
+
+    @classmethod
+    def from_doc(cls, doc: dict) -> "JobProfile":
+        return cls(
+            doc.get("jd_text", ""),
+            doc.get("required", []),
+            doc.get("optional", []),
+            doc.get("years"),
+            doc.get("title_tokens", []),
+            doc.get("taxonomy_version", ""),
+        )
@@ -0,0 +1,222 @@
+"""
+Background job queue backed by the `scan_jobs` collection.
+
+Mongo is the source of truth: a job is a document that moves
+queued -> running -> done | failed. Each process runs a few worker threads
+fed by a bounded local queue; submit() refuses new work when that queue is
+full so callers can push back on the client. Workers claim a job with an
+atomic find_one_and_update, so several gunicorn workers (or hosts) can share
+one collection without running a job twice.
+
+A sweeper thread re-feeds the local queue from Mongo: jobs waiting for a
+retry, jobs submitted by a process that died, and running jobs whose lease
+expired (or fails them once they are out of attempts). A queued job handed
+to a local queue is marked dispatched_until, so it is not fed again, here
+or by another process, while it waits for a worker.
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+
+from pymongo import ReturnDocument
+
+from app.config import Config
+from app.models.db import scan_jobs_col
+
+log = logging.getLogger("resume_backend")
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class QueueFull(Exception):
+    pass
+
+
+class PermanentError(Exception):
+    """Raised by a handler when retrying cannot help (bad input)."""
+
+
+class JobQueue:
+    def __init__(self, handler, *, workers: int, maxsize: int, max_attempts: int,
+                 backoff_s: float, lease_s: float, ttl_s: int, sweep_s: float):
+        self.handler = handler  # handler(app, job_doc) -> dict of fields to $set on success
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_s = backoff_s
+        self.lease_s = lease_s
+        self.ttl_s = ttl_s
+        self.sweep_s = sweep_s
+        self._q = queue.Queue(maxsize=maxsize)
+        self._pending = set()  # job ids sitting in the local queue
+        self._app = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    # ---- lifecycle ----
+    def start(self, app):
+        """Start worker + sweeper threads once per process (threads do not survive a fork)."""
+        if self.workers <= 0:
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._app, self._pid = app, os.getpid()
+            self._q = queue.Queue(maxsize=self._q.maxsize)
+            self._pending = set()
+            for i in range(self.workers):
+                threading.Thread(target=self._work, name=f"scan-job-{i}", daemon=True).start()
+            threading.Thread(target=self._sweep, name="scan-job-sweeper", daemon=True).start()
+        log.info("job_workers_started workers=%d queue=%d", self.workers, self._q.maxsize)
+
+    def depth(self) -> int:
+        return self._q.qsize()
+
+    def free(self) -> int:
+        return self._q.maxsize - self._q.qsize()
+
+    # ---- producer ----
+    def submit(self, doc: dict):
+        """Insert a job and hand it to a local worker. Raises QueueFull under backpressure."""
+        if self.free() <= 0:
+            raise QueueFull()
+        now = datetime.utcnow()
+        doc = {**doc, "status": QUEUED, "attempts": 0, "created_at": now, "updated_at": now, "run_after": now,
+               "dispatched_until": now + timedelta(seconds=self.lease_s)}
+        job_id = scan_jobs_col().insert_one(doc).inserted_id
+        try:
+            self._enqueue(job_id)
+        except queue.Full:
+            # lost the race for the last slot
+            scan_jobs_col().delete_one({"_id": job_id})
+            raise QueueFull()
+        return job_id
+
+    def _enqueue(self, job_id):
+        with self._lock:
+            self._q.put_nowait(job_id)
+            self._pending.add(job_id)
+
+    # ---- consumer ----
+    def _claim(self, job_id):
+        now = datetime.utcnow()
+        return scan_jobs_col().find_one_and_update(
+            {"_id": job_id, "status": QUEUED, "run_after": {"$lte": now}},
+            {"$set": {"status": RUNNING, "updated_at": now, "lease_until": now + timedelta(seconds=self.lease_s)},
+             "$inc": {"attempts": 1}, "$unset": {"dispatched_until": ""}},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    def _work(self):
+        while True:
+            job_id = self._q.get()
+            with self._lock:
+                self._pending.discard(job_id)
+            try:
+                with self._app.app_context():
+                    job = self._claim(job_id)
+                    if job is not None:  # someone else took it, or it is not due yet
+                        self._run(job)
+            except Exception:
+                log.exception("job_worker_error job_id=%s", job_id)
+            finally:
+                self._q.task_done()
+
+    def _run(self, job: dict):
+        t0 = time.perf_counter()
+        try:
+            fields = self.handler(self._app, job) or {}
+        except Exception as e:
+            self._failed(job, e)
+            return
+        now = datetime.utcnow()
+        scan_jobs_col().update_one({"_id": job["_id"]}, {
+            "$set": {**fields, "status": DONE, "updated_at": now, "finished_at": now,
+                     "expires_at": now + timedelta(seconds=self.ttl_s)},
+            "$unset": {"input": "", "lease_until": "", "error": ""},
+        })
+        log.info("job_done job_id=%s attempts=%d ms=%.1f", job["_id"], job["attempts"],
+                 (time.perf_counter() - t0) * 1000)
+
+    def _failed(self, job: dict, e: Exception):
+        now = datetime.utcnow()
+        final = isinstance(e, PermanentError) or job["attempts"] >= self.max_attempts
+        if final:
+            scan_jobs_col().update_one({"_id": job["_id"]}, {
+                "$set": {"status": FAILED, "error": str(e), "updated_at": now, "finished_at": now,
+                         "expires_at": now + timedelta(seconds=self.ttl_s)},
+                "$unset": {"input": "", "lease_until": ""},
+            })
+            log.warning("job_failed job_id=%s attempts=%d error=%s", job["_id"], job["attempts"], e)
+            return
+        # exponential backoff; the sweeper re-queues it once run_after passes
+        delay = self.backoff_s * (2 ** (job["attempts"] - 1))
+        scan_jobs_col().update_one({"_id": job["_id"]}, {
+            "$set": {"status": QUEUED, "error": str(e), "updated_at": now,
+                     "run_after": now + timedelta(seconds=delay)},
+            "$unset": {"lease_until": "", "dispatched_until": ""},
+        })
+        log.info("job_retry job_id=%s attempts=%d delay_s=%.1f error=%s", job["_id"], job["attempts"], delay, e)
+
+    # ---- sweeper ----
+    def _sweep(self):
+        while True:
+            time.sleep(self.sweep_s)
+            try:
+                with self._app.app_context():
+                    self.sweep_once()
+            except Exception as e:
+                log.warning("job_sweep_error error=%s", e)
+
+    def sweep_once(self) -> int:
+        """Re-queue (or fail) expired leases and feed undispatched due jobs into free local slots. Returns jobs fed."""
+        col, now = scan_jobs_col(), datetime.utcnow()
+        expired = {"status": RUNNING, "lease_until": {"$lt": now}}
+        # the worker died mid-job (crash, OOM kill): a job that keeps doing that must not loop forever
+        out = col.update_many({**expired, "attempts": {"$gte": self.max_attempts}}, {
+            "$set": {"status": FAILED, "error": "lease expired (worker lost)", "updated_at": now, "finished_at": now,
+                     "expires_at": now + timedelta(seconds=self.ttl_s)},
+            "$unset": {"input": "", "lease_until": ""},
+        })
+        if out.modified_count:
+            log.warning("job_failed_lease_expired count=%d", out.modified_count)
+        col.update_many({**expired, "attempts": {"$lt": self.max_attempts}},
+                        {"$set": {"status": QUEUED, "run_after": now, "updated_at": now},
+                         "$unset": {"lease_until": "", "dispatched_until": ""}})
+        free = self.free()
+        if free <= 0:
+            return 0
+        undispatched = {"status": QUEUED, "run_after": {"$lte": now}, "$or": [
+            {"dispatched_until": {"$exists": False}}, {"dispatched_until": {"$lt": now}}]}
+        fed = 0
+        for d in col.find(undispatched, {"_id": 1}).sort("run_after", 1).limit(free):
+            with self._lock:
+                if d["_id"] in self._pending:
+                    continue
+            # take the dispatch atomically: another process's sweeper may be looking at the same job
+            took = col.update_one({**undispatched, "_id": d["_id"]},
+                                  {"$set": {"dispatched_until": now + timedelta(seconds=self.lease_s)}})
+            if not took.modified_count:
+                continue
+            try:
+                self._enqueue(d["_id"])
+                fed += 1
+            except queue.Full:
+                col.update_one({"_id": d["_id"]}, {"$unset": {"dispatched_until": ""}})
+                break
+        return fed
+
+
+def from_config(handler) -> JobQueue:
+    return JobQueue(
+        handler,
+        workers=Config.JOB_WORKERS,
+        maxsize=Config.JOB_QUEUE_SIZE,
+        max_attempts=Config.JOB_MAX_ATTEMPTS,
+        backoff_s=Config.JOB_RETRY_BACKOFF_S,
+        lease_s=Config.JOB_LEASE_S,
+        ttl_s=Config.JOB_TTL_S,
+        sweep_s=Config.JOB_SWEEP_S,
+    )
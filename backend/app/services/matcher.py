@@ -0,0 +1,101 @@
+import re
+
+
+def _is_word(ch: str) -> bool:
+    # same definition as regex \w for str patterns
+    return ch.isalnum() or ch == "_"
+
+
+class _Node:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children = {}
+        self.ids = []
+
+
+class SkillMatcher:
+    """
+    Single-pass phrase matcher.
+
+    Built once from (phrase, key) pairs. Each phrase matches the way
+    rf"(?<!\\w){re.escape(phrase)}(?!\\w)" would, but the text is scanned
+    once no matter how many phrases are registered:
+    - a trie-shaped regex finds every offset where at least one phrase starts
+    - a char trie walk at those offsets lists all phrases ending on a word boundary
+    """
+
+    def __init__(self, entries):
+        self.phrases = []  # registration order == priority order
+        self.keys = []
+        self._root = _Node()
+        for phrase, key in entries:
+            p = (phrase or "").strip().lower()
+            if not p:
+                continue
+            node = self._root
+            for ch in p:
+                node = node.children.setdefault(ch, _Node())
+            node.ids.append(len(self.phrases))
+            self.phrases.append(p)
+            self.keys.append((key or "").lower())
+        self._starts = re.compile(rf"(?<!\w)(?={self._node_re(self._root)})") if self.phrases else None
+
+    def __len__(self):
+        return len(self.phrases)
+
+    @classmethod
+    def _node_re(cls, node: _Node) -> str:
+        alts = [re.escape(ch) + cls._node_re(child) for ch, child in node.children.items()]
+        if node.ids:
+            alts.append(r"(?!\w)")
+        if len(alts) == 1:
+            return alts[0]
+        return "(?:" + "|".join(alts) + ")"
+
+    def _walk(self, text_lc: str):
+        # yields (phrase id, start, end) for every boundary-respecting match, by start offset
+        if not text_lc or self._starts is None:
+            return
+        n = len(text_lc)
+        for m in self._starts.finditer(text_lc):
+            i = m.start()
+            node = self._root
+            j = i
+            while j < n:
+                node = node.children.get(text_lc[j])
+                if node is None:
+                    break
+                j += 1
+                if node.ids and (j == n or not _is_word(text_lc[j])):
+                    for pid in node.ids:
+                        yield pid, i, j
+
+    def first_hits(self, text_lc: str) -> dict:
+        """
+        Map phrase id -> (start, end) of its first match in already-lowercased text.
+        """
+        hits = {}
+        for pid, i, j in self._walk(text_lc):
+            if pid not in hits:
+                hits[pid] = (i, j)
+        return hits
+
+    def all_hits(self, text_lc: str) -> dict:
+        """
+        Map phrase id -> [(start, end), ...] of every match, non-overlapping per
+        phrase like re.finditer would return them.
+        """
+        hits = {}
+        for pid, i, j in self._walk(text_lc):
+            spans = hits.setdefault(pid, [])
+            if not spans or i >= spans[-1][1]:
+                spans.append((i, j))
+        return hits
+
+    def scan(self, text_lc: str):
+        """
+        Hits in registration order as (key, phrase, start, end), one per matched phrase.
+        """
+        hits = self.first_hits(text_lc)
+        return [(self.keys[pid], self.phrases[pid], *hits[pid]) for pid in sorted(hits)]
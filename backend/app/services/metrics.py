@@ -0,0 +1,139 @@
+"""
+Lightweight timing layer: per-stage and per-route latency histograms,
+rendered in Prometheus text format, plus per-request Server-Timing entries.
+
+With METRICS_ENABLED=0 `timed()` hands back a shared no-op context manager,
+so instrumented code pays one function call and an attribute check.
+"""
+import threading
+import time
+from contextlib import nullcontext
+
+from flask import g, has_request_context
+from pymongo import monitoring
+
+from app.config import Config
+
+ENABLED = Config.METRICS_ENABLED
+
+# seconds; chosen to separate sub-ms regex work from multi-second PDF parses
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NOOP = nullcontext()
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, label_names: tuple):
+        self.name = name
+        self.help = help_text
+        self.label_names = label_names
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, seconds: float):
+        with self._lock:
+            row = self._series.get(labels)
+            if row is None:
+                row = self._series[labels] = [0] * len(BUCKETS) + [0.0, 0]
+            for i, b in enumerate(BUCKETS):
+                if seconds <= b:
+                    row[i] += 1
+            row[-2] += seconds
+            row[-1] += 1
+
+    def render(self) -> list[str]:
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted(self._series.items())
+            for labels, row in items:
+                base = ",".join(f'{k}="{_esc(v)}"' for k, v in zip(self.label_names, labels))
+                sep = "," if base else ""
+                for b, n in zip(BUCKETS, row):
+                    out.append(f'{self.name}_bucket{{{base}{sep}le="{b}"}} {n}')
+                out.append(f'{self.name}_bucket{{{base}{sep}le="+Inf"}} {row[-1]}')
+                out.append(f"{self.name}_sum{{{base}}} {row[-2]:.6f}")
+                out.append(f"{self.name}_count{{{base}}} {row[-1]}")
+        return out
+
+
+def _esc(v) -> str:
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+STAGES = Histogram("resume_stage_duration_seconds", "Time spent in one pipeline stage.", ("stage",))
+ROUTES = Histogram("resume_http_request_duration_seconds", "Request latency by route.",
+                   ("route", "method", "status"))
+
+
+def record(stage: str, seconds: float):
+    STAGES.observe((stage,), seconds)
+    if has_request_context():
+        t = g.get("_timings")
+        if t is None:
+            t = g._timings = {}
+        t[stage] = t.get(stage, 0.0) + seconds
+
+
+class _Timer:
+    __slots__ = ("stage", "t0")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.stage, time.perf_counter() - self.t0)
+        return False
+
+
+def timed(stage: str):
+    """`with timed("pdf"):` records the block under that stage name."""
+    return _Timer(stage) if ENABLED else _NOOP
+
+
+# ---- flask hooks ----
+def start_request():
+    if ENABLED:
+        g._t_start = time.perf_counter()
+
+
+def finish_request(resp, route: str, method: str):
+    if not ENABLED or "_t_start" not in g:
+        return resp
+    total = time.perf_counter() - g._t_start
+    ROUTES.observe((route, method, str(resp.status_code)), total)
+    parts = [f"{name.replace('.', '-')};dur={sec * 1000:.2f}" for name, sec in (g.get("_timings") or {}).items()]
+    parts.append(f"total;dur={total * 1000:.2f}")
+    resp.headers["Server-Timing"] = ", ".join(parts)
+    return resp
+
+
+def render() -> str:
+    return "\n".join(STAGES.render() + ROUTES.render()) + "\n"
+
+
+# ---- mongo ----
+class MongoTimingListener(monitoring.CommandListener):
+    """Times every driver command as stage mongo.<collection>.<command>."""
+
+    def __init__(self):
+        self._pending = {}
+
+    def started(self, event):
+        coll = event.command.get(event.command_name)
+        name = f"mongo.{coll}.{event.command_name}" if isinstance(coll, str) else f"mongo.{event.command_name}"
+        self._pending[event.request_id] = name
+
+    def succeeded(self, event):
+        self._done(event)
+
+    def failed(self, event):
+        self._done(event)
+
+    def _done(self, event):
+        name = self._pending.pop(event.request_id, None)
+        if name:
+            record(name, event.duration_micros / 1e6)
@@ -0,0 +1,75 @@
+"""
+MinHash signatures and LSH band keys for near-duplicate resumes.
+
+A resume is reduced to the set of its word 5-shingles; its signature is the
+minimum of PERMS universal hashes over that set, so the fraction of equal
+slots in two signatures estimates the Jaccard similarity of the shingle sets.
+LSH cuts the signature into BANDS bands of ROWS slots and hashes each band to
+a key: resumes sharing any key are candidates, and only candidates are
+compared. With 128 slots in 16 bands of 8, a pair at Jaccard 0.85 shares a
+band with probability ~0.994, a pair at 0.5 with ~0.06.
+"""
+import hashlib
+import re
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # optional: near-duplicate detection is simply off without numpy
+    np = None
+
+from app.config import Config
+
+PERMS = Config.DEDUP_PERMS
+BANDS = Config.DEDUP_BANDS
+ROWS = PERMS // BANDS if BANDS else 0
+SHINGLE = 5  # words per shingle
+_P = (1 << 31) - 1  # Mersenne prime; a * x stays below 2**62
+_TOKEN = re.compile(r"[a-z0-9#+]+")
+# keys from other signature shapes never collide with these
+_TAG = f"{PERMS}x{BANDS}"
+
+
+def _coeff(name: str, i: int) -> int:
+    # fixed hash coefficients: signatures are stored and compared across processes and releases
+    return int.from_bytes(hashlib.blake2b(f"{name}{i}".encode(), digest_size=8).digest(), "little") % _P
+
+
+if np is not None:
+    _A = np.array([_coeff("a", i) or 1 for i in range(PERMS)], dtype=np.uint64)[:, None]
+    _B = np.array([_coeff("b", i) for i in range(PERMS)], dtype=np.uint64)[:, None]
+
+
+def available() -> bool:
+    return Config.DEDUP_ENABLED and np is not None and PERMS > 0 and BANDS > 0 and PERMS % BANDS == 0
+
+
+def shingles(text: str) -> set:
+    """crc32 of each run of SHINGLE consecutive words (the whole text when shorter)."""
+    toks = _TOKEN.findall((text or "").lower())
+    if not toks:
+        return set()
+    n = max(1, len(toks) - SHINGLE + 1)
+    return {zlib.crc32(" ".join(toks[i:i + SHINGLE]).encode()) for i in range(n)}
+
+
+def signature(text: str) -> bytes | None:
+    """PERMS little-endian uint32 minima, or None for a text without words."""
+    sh = shingles(text)
+    if not sh:
+        return None
+    x = np.fromiter(sh, dtype=np.uint64, count=len(sh)) % _P
+    return ((_A * x[None, :] + _B) % _P).min(axis=1).astype("<u4").tobytes()
+
+
+def band_keys(sig: bytes) -> list[str]:
+    step = 4 * ROWS
+    return [f"{_TAG}:{b}:{hashlib.blake2b(sig[b * step:(b + 1) * step], digest_size=8).hexdigest()}"
+            for b in range(BANDS)]
+
+
+def similarity(a: bytes, b: bytes) -> float:
+    """Estimated Jaccard similarity of two signatures (0.0 when their shapes differ)."""
+    if not a or not b or len(a) != len(b):
+        return 0.0
+    return float((np.frombuffer(a, dtype="<u4") == np.frombuffer(b, dtype="<u4")).mean())
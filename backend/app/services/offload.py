@@ -0,0 +1,48 @@
+"""
+Bounded thread pool for blocking CPU work.
+
+bcrypt and the scoring helpers would stall the event loop if awaited
+inline; run_cpu() hands them to a small pool instead. The pool is sized by
+CPU_WORKERS, so a burst of logins queues up rather than spawning a thread
+per request. (bcrypt releases the GIL, so its hashes really run in parallel.)
+Sync routes use call_cpu() for the same cap: however many request threads
+a server runs, at most CPU_WORKERS hashes run at once.
+"""
+import asyncio
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import Config
+
+log = logging.getLogger("resume_backend")
+
+_pool = None
+_pid = None
+_lock = threading.Lock()
+
+
+def get_pool() -> ThreadPoolExecutor:
+    """Shared pool, created lazily per process (threads do not survive a fork)."""
+    global _pool, _pid
+    with _lock:
+        if _pool is None or _pid != os.getpid():
+            _pool = ThreadPoolExecutor(max_workers=max(1, Config.CPU_WORKERS), thread_name_prefix="cpu")
+            _pid = os.getpid()
+            log.info("cpu_pool_started workers=%s", Config.CPU_WORKERS)
+        return _pool
+
+
+def call_cpu(fn, *args, **kwargs):
+    """fn(*args) on the pool, waiting for the result; inline when already on a pool thread."""
+    if threading.current_thread().name.startswith("cpu"):
+        return fn(*args, **kwargs)
+    return get_pool().submit(fn, *args, **kwargs).result()
+
+
+async def run_cpu(fn, *args, **kwargs):
+    """`await run_cpu(fn, x)` runs fn(x) on the pool and returns its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_pool(), functools.partial(fn, *args, **kwargs))
@@ -0,0 +1,28 @@
+"""
+Password hashing with a configurable bcrypt cost.
+
+New hashes use BCRYPT_ROUNDS. A successful login against a hash with a lower
+cost also returns a fresh hash at the current cost, which the caller stores,
+so raising BCRYPT_ROUNDS upgrades users as they sign in. The functions are
+blocking (bcrypt is the point); routes run them on the bounded CPU pool in
+app.services.offload so a burst of logins queues instead of oversubscribing
+the cores.
+"""
+from passlib.context import CryptContext
+
+from app.config import Config
+
+_CTX = CryptContext(
+    schemes=["bcrypt"],
+    bcrypt__default_rounds=Config.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=Config.BCRYPT_ROUNDS,  # anything cheaper is rehashed on login
+)
+
+
+def hash_password(password: str) -> str:
+    return _CTX.hash(password)
+
+
+def verify(password: str, password_hash: str) -> tuple[bool, str | None]:
+    """(matches, replacement hash when the stored cost is below BCRYPT_ROUNDS)."""
+    return _CTX.verify_and_update(password, password_hash)
@@ -0,0 +1,50 @@
+"""
+Compiled-pattern registry.
+
+Every regex the scan path uses is compiled here once and reused, instead of
+going through re's internal cache on each call (that cache is small and
+shared process-wide, so a busy worker keeps evicting and recompiling).
+Skill/variant phrases don't go through here: each taxonomy snapshot already
+compiles them into its SkillMatcher once per version.
+"""
+import re
+
+
+class PatternRegistry:
+    def __init__(self):
+        self._compiled = {}
+        # plain counters; approximate under threads, good enough for a hit rate
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, pattern: str, flags: int = 0) -> re.Pattern:
+        key = (pattern, flags)
+        p = self._compiled.get(key)
+        if p is None:
+            self.misses += 1
+            p = self._compiled[key] = re.compile(pattern, flags)
+        else:
+            self.hits += 1
+        return p
+
+    def literal(self, text: str, flags: int = 0) -> re.Pattern:
+        """Pattern matching text verbatim."""
+        return self.get(re.escape(text), flags)
+
+    def __len__(self):
+        return len(self._compiled)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "patterns": len(self._compiled),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+        }
+
+    def reset_stats(self):
+        self.hits = self.misses = 0
+
+
+PATTERNS = PatternRegistry()
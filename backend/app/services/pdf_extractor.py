@@ -1,16 +1,91 @@
-import fitz  # PyMuPDF
 from io import BytesIO
+import logging
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
-   
-    text_parts = []
-    with fitz.open(stream=BytesIO(file_bytes), filetype="pdf") as doc:
-        for page in doc:
-            page_text = page.get_text("text")  # extract plain text
-            if page_text:
-                text_parts.append(page_text)
-
-    # join pages and clean whitespace
-    text = "\n".join(text_parts).strip()
-    text = " ".join(text.split())  
-    return text
+log = logging.getLogger("resume_backend")
+
+# Each backend knows how to count pages and extract a page range from raw
+# PDF bytes. Libraries are imported lazily so a missing optional backend
+# only matters if it is selected.
+
+
+def _pymupdf_pages(data: bytes, start: int = 0, stop: int | None = None) -> list[str]:
+    import pymupdf  # PyMuPDF
+    with pymupdf.open(stream=data, filetype="pdf") as doc:
+        stop = len(doc) if stop is None else min(stop, len(doc))
+        return [doc[i].get_text("text") or "" for i in range(start, stop)]
+
+
+def _pymupdf_count(data: bytes) -> int:
+    import pymupdf
+    with pymupdf.open(stream=data, filetype="pdf") as doc:
+        return len(doc)
+
+
+def _pypdf_pages(data: bytes, start: int = 0, stop: int | None = None) -> list[str]:
+    from pypdf import PdfReader
+    pages = PdfReader(BytesIO(data)).pages
+    stop = len(pages) if stop is None else min(stop, len(pages))
+    return [pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def _pypdf_count(data: bytes) -> int:
+    from pypdf import PdfReader
+    return len(PdfReader(BytesIO(data)).pages)
+
+
+def _pypdf2_pages(data: bytes, start: int = 0, stop: int | None = None) -> list[str]:
+    from PyPDF2 import PdfReader
+    pages = PdfReader(BytesIO(data)).pages
+    stop = len(pages) if stop is None else min(stop, len(pages))
+    return [pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def _pypdf2_count(data: bytes) -> int:
+    from PyPDF2 import PdfReader
+    return len(PdfReader(BytesIO(data)).pages)
+
+
+BACKENDS = {
+    "pymupdf": (_pymupdf_count, _pymupdf_pages),
+    "pypdf": (_pypdf_count, _pypdf_pages),
+    "pypdf2": (_pypdf2_count, _pypdf2_pages),
+}
+
+
+def parse_backends(spec) -> list[str]:
+    """'pymupdf, pypdf2' -> ['pymupdf', 'pypdf2'] (unknown names dropped)."""
+    if isinstance(spec, str):
+        spec = spec.split(",")
+    names = [n.strip().lower() for n in (spec or []) if n and n.strip()]
+    return [n for n in names if n in BACKENDS] or list(BACKENDS)
+
+
+def _first_working(backends, op: int, *args):
+    errors = []
+    for name in parse_backends(backends):
+        try:
+            return BACKENDS[name][op](*args)
+        except ImportError:
+            errors.append(f"{name}: not installed")
+        except Exception as e:
+            errors.append(f"{name}: {e}")
+            log.warning("pdf_backend_fallback backend=%s error=%s", name, e)
+    raise RuntimeError("; ".join(errors))
+
+
+def page_count(data: bytes, backends=None) -> int:
+    return _first_working(backends, 0, data)
+
+
+def extract_pages(data: bytes, start: int = 0, stop: int | None = None, backends=None) -> list[str]:
+    """
+    Page texts for [start, stop), from the first backend in the chain that
+    can parse the file (a broken or missing backend falls through to the next).
+    """
+    return _first_working(backends, 1, data, start, stop)
+
+
+def extract_text_from_pdf(file_bytes: bytes, backends=None) -> str:
+    # whole document as one whitespace-normalized string
+    text = "\n".join(p for p in extract_pages(file_bytes, backends=backends) if p).strip()
+    return " ".join(text.split())
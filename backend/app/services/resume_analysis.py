@@ -0,0 +1,50 @@
+import json
+
+
+class ResumeAnalysis:
+    """
+    Everything the rubric needs from a resume, independent of any JD:
+    detected skills with evidence, the per-skill occurrence table (offset,
+    section), expanded title tokens and years. Stored under a resume id so a
+    rescan against a new JD only has to parse the JD.
+    """
+
+    __slots__ = ("text", "skills", "evidence", "table", "title", "years", "version", "vector")
+
+    def __init__(self, text: str, skills: list, evidence: dict, table: dict, title: set,
+                 years: int | None, version: str = ""):
+        self.text = text
+        self.skills = list(skills)  # sorted canonical skills
+        self.evidence = evidence  # skill -> snippet
+        self.table = table  # skill -> [(offset, section), ...] in counting order
+        self.title = frozenset(title)  # expanded first-line tokens
+        self.years = years
+        self.version = version  # taxonomy version it was analysed with
+        self.vector = None  # semantic embedding, filled lazily (never stored)
+
+    def to_doc(self) -> dict:
+        # skill keys contain dots ("node.js"), so the maps travel as one JSON string
+        return {
+            "text": self.text,
+            "taxonomy_version": self.version,
+            "analysis": json.dumps({
+                "skills": self.skills,
+                "evidence": self.evidence,
+                "table": self.table,
+                "title_tokens": sorted(self.title),
+                "years": self.years,
+            }),
+        }
+
+    @classmethod
+    def from_doc(cls, doc: dict) -> "ResumeAnalysis":
+        a = json.loads(doc.get("analysis") or "{}")
+        return cls(
+            doc.get("text", ""),
+            a.get("skills", []),
+            a.get("evidence", {}),
+            {k: [tuple(r) for r in rows] for k, rows in a.get("table", {}).items()},
+            a.get("title_tokens", []),
+            a.get("years"),
+            doc.get("taxonomy_version", ""),
+        )
@@ -0,0 +1,62 @@
+"""
+CPU-only semantic similarity from hashed character n-grams.
+
+No model files or network: each text becomes a fixed-size vector of hashed
+3-5 character n-grams over its word tokens (sublinear counts, L2 normalized),
+so "reactjs developer" and "react engineer" share most of their grams.
+Vectors are built with NumPy ops and a batch of resumes is compared to a
+JD in a single matrix-vector product.
+"""
+import re
+
+try:
+    import numpy as np
+except ImportError:  # optional: semantic scoring is simply off without numpy
+    np = None
+
+DIM_BITS = 14
+DIM = 1 << DIM_BITS  # a power of two: a bucket is the top DIM_BITS bits of the hash
+NGRAMS = (3, 4, 5)
+_TOKEN = re.compile(r"[a-z0-9#+]+")
+_HASH_BITS = 64  # uint64 arithmetic, wrapping
+_MULT = 0x9E3779B97F4A7C15  # 64-bit golden ratio multiplier (Fibonacci hashing)
+_SHIFT = _HASH_BITS - DIM_BITS
+
+
+def available() -> bool:
+    return np is not None
+
+
+def _grams(b):
+    # rolling polynomial hash of every n-gram, folded into DIM buckets
+    b = b.astype(np.uint64)
+    out = []
+    with np.errstate(over="ignore"):
+        for n in NGRAMS:
+            if len(b) < n:
+                continue
+            h = np.zeros(len(b) - n + 1, dtype=np.uint64)
+            for k in range(n):
+                h = h * np.uint64(257) + b[k:len(b) - n + 1 + k]
+            h = (h + np.uint64(n)) * np.uint64(_MULT)
+            out.append(h >> np.uint64(_SHIFT))
+    return np.concatenate(out) if out else np.zeros(0, dtype=np.uint64)
+
+
+def embed(text: str, stop=frozenset()):
+    """Unit-length float32 vector of size DIM (all zeros for empty text)."""
+    toks = [t for t in _TOKEN.findall((text or "").lower()) if t not in stop]
+    data = (" " + "  ".join(toks) + " ").encode("utf-8") if toks else b""
+    v = np.zeros(DIM, dtype=np.float32)
+    if data:
+        counts = np.bincount(_grams(np.frombuffer(data, dtype=np.uint8)).astype(np.intp), minlength=DIM)
+        v = np.log1p(counts, dtype=np.float32)
+        norm = float(np.linalg.norm(v))
+        if norm:
+            v /= norm
+    return v
+
+
+def similarity(resume_vecs, jd_vec):
+    """Cosine similarity of each resume row with the JD vector (rows are unit length)."""
+    return resume_vecs @ jd_vec
@@ -0,0 +1,105 @@
+"""
+In-memory feature matrix of one user's saved scans (the talent pool).
+
+Built from the `features` record every saved scan carries (see
+pool_features in routes/scan.py) and kept per worker, so ranking a new JD
+against the whole pool is a handful of NumPy passes and no Mongo reads:
+
+- skills: (n, words) uint64 bitsets; matched counts are popcounts of
+  bits & JD mask
+- occ: sparse (row, key, capped count) triplets; the distribution sum is a
+  bincount of JD weight * count
+- title: sparse (row, token id) pairs over a pool vocabulary
+- years: float array, nan where the resume states none
+
+New saves are appended by building a new pool from the old one plus the
+new rows; a pool in use is never modified.
+"""
+import numpy as np
+
+# set bits per byte, for popcounts over the uint8 view of the bitsets
+_POP8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class TalentPool:
+    def __init__(self, version: str, nkeys: int):
+        self.version = version
+        self.nkeys = nkeys
+        self.words = -(-nkeys // 64)
+        self.ids = []
+        self.last_id = None
+        self.vocab = {}  # title token -> id
+        self.bits = np.zeros((0, self.words), dtype=np.uint64)
+        self.years = np.zeros(0)
+        self.occ_row = np.zeros(0, dtype=np.int64)
+        self.occ_key = np.zeros(0, dtype=np.int64)
+        self.occ_val = np.zeros(0)
+        self.title_row = np.zeros(0, dtype=np.int64)
+        self.title_tok = np.zeros(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def extended(self, rows: list) -> "TalentPool":
+        """
+        A new pool with (scan _id, features) rows appended. Pools are never
+        changed in place, so requests still scoring the old one are unaffected.
+        """
+        out = TalentPool(self.version, self.nkeys)
+        out.ids, out.last_id, out.vocab = list(self.ids), self.last_id, dict(self.vocab)
+        nbytes = 8 * self.words
+        bits = bytearray()
+        years = []
+        o_row, o_key, o_val, t_row, t_tok = [], [], [], [], []
+        for n, (sid, f) in enumerate(rows, len(self.ids)):
+            out.ids.append(sid)
+            bits += bytes(f["skills"])[:nbytes].ljust(nbytes, b"\0")
+            years.append(np.nan if f.get("years") is None else f["years"])
+            for k, v in f.get("occ", ()):
+                o_row.append(n)
+                o_key.append(k)
+                o_val.append(v)
+            for tok in f.get("title", ()):
+                t_row.append(n)
+                t_tok.append(out.vocab.setdefault(tok, len(out.vocab)))
+        new_bits = np.frombuffer(bytes(bits), dtype="<u8").astype(np.uint64).reshape(len(rows), self.words)
+        out.bits = np.concatenate([self.bits, new_bits])
+        out.years = np.concatenate([self.years, np.array(years, dtype=float)])
+        out.occ_row = np.concatenate([self.occ_row, np.array(o_row, dtype=np.int64)])
+        out.occ_key = np.concatenate([self.occ_key, np.array(o_key, dtype=np.int64)])
+        out.occ_val = np.concatenate([self.occ_val, np.array(o_val, dtype=float)])
+        out.title_row = np.concatenate([self.title_row, np.array(t_row, dtype=np.int64)])
+        out.title_tok = np.concatenate([self.title_tok, np.array(t_tok, dtype=np.int64)])
+        if rows:
+            top = max(sid for sid, _ in rows)
+            out.last_id = top if out.last_id is None else max(out.last_id, top)
+        return out
+
+    def mask(self, incidence) -> np.ndarray:
+        """(words,) uint64 mask from a 0/1 vector over key_index."""
+        flags = np.zeros(self.words * 64, dtype=np.uint8)
+        flags[:self.nkeys] = np.asarray(incidence[:self.nkeys]) > 0
+        return np.frombuffer(np.packbits(flags, bitorder="little").tobytes(), dtype="<u8").astype(np.uint64)
+
+    def matches(self, mask: np.ndarray) -> np.ndarray:
+        """(n,) number of set bits each resume shares with the mask."""
+        both = np.ascontiguousarray(self.bits & mask)
+        return _POP8[both.view(np.uint8)].reshape(len(self.ids), -1).sum(1, dtype=np.int64).astype(float)
+
+    def distribution_raw(self, weights: np.ndarray) -> np.ndarray:
+        """(n,) sum of weight[key] * capped count per resume."""
+        return np.bincount(self.occ_row, weights=weights[self.occ_key] * self.occ_val, minlength=len(self.ids))
+
+    def title_hits(self, tokens) -> np.ndarray:
+        """(n,) size of each resume's title token set intersected with `tokens`."""
+        in_jd = np.zeros(len(self.vocab) + 1)
+        for t in tokens:
+            i = self.vocab.get(t)
+            if i is not None:
+                in_jd[i] = 1.0
+        return np.bincount(self.title_row, weights=in_jd[self.title_tok], minlength=len(self.ids))
+
+    def skill_keys(self, row: int, keys: list) -> set:
+        """Keys whose bit is set for one resume (for explaining a top-K hit)."""
+        flags = np.unpackbits(self.bits[row].astype("<u8").view(np.uint8), bitorder="little")
+        return {keys[i] for i in np.flatnonzero(flags[:self.nkeys])}
@@ -0,0 +1,224 @@
+"""
+Skill taxonomy: skills, synonyms, aliases, soft skills and blocklist from one
+versioned JSON file (Config.TAXONOMY_PATH), compiled into matchers once.
+
+A loaded taxonomy is an immutable snapshot. Reloading builds a complete new
+snapshot and swaps the module reference in one assignment, so readers see
+either the old or the new one, never a mix. Request handlers (and job
+workers) pin the snapshot for their app context through active().
+
+Workers pick up file changes on their own (the file's mtime is checked at
+most every TAXONOMY_POLL_S seconds), so an edit or an admin upload reaches
+every process without a restart.
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+from flask import g, has_app_context
+
+from app.config import Config
+from app.services.cache import version_tag
+from app.services.matcher import SkillMatcher
+
+log = logging.getLogger("resume_backend")
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "taxonomy.json")
+
+
+def _str_list(data: dict, key: str) -> list[str]:
+    v = data.get(key, [])
+    if not isinstance(v, list) or not all(isinstance(s, str) for s in v):
+        raise ValueError(f"{key} must be a list of strings")
+    return [s.strip().lower() for s in v if s.strip()]
+
+
+def _str_map(data: dict, key: str, list_values: bool) -> dict:
+    v = data.get(key, {})
+    if not isinstance(v, dict):
+        raise ValueError(f"{key} must be an object")
+    out = {}
+    for k, val in v.items():
+        if list_values:
+            if not isinstance(val, list) or not all(isinstance(s, str) for s in val):
+                raise ValueError(f"{key}.{k} must be a list of strings")
+            out[k.strip().lower()] = [s.strip().lower() for s in val if s.strip()]
+        else:
+            if not isinstance(val, str):
+                raise ValueError(f"{key}.{k} must be a string")
+            out[k.strip().lower()] = val.strip().lower()
+    return out
+
+
+class Taxonomy:
+    __slots__ = (
+        "skills", "synonyms", "aliases", "blocklist", "include_soft_skills",
+        "soft_skills", "soft_synonyms", "distrib_extras",
+        "version", "source", "loaded_at",
+        "skill_matcher", "soft_matcher", "distrib_matcher", "key_index", "key_tag",
+    )
+
+    def __init__(self, data: dict, source: str = ""):
+        if not isinstance(data, dict):
+            raise ValueError("taxonomy must be a json object")
+        self.skills = _str_list(data, "skills")
+        if not self.skills:
+            raise ValueError("skills must not be empty")
+        self.synonyms = _str_map(data, "synonyms", True)
+        self.aliases = _str_map(data, "aliases", False)
+        self.blocklist = frozenset(_str_list(data, "blocklist"))
+        self.include_soft_skills = bool(data.get("include_soft_skills", True))
+        self.soft_skills = _str_list(data, "soft_skills")
+        self.soft_synonyms = _str_map(data, "soft_synonyms", True)
+        self.distrib_extras = _str_map(data, "distrib_extras", True)
+        self.version = version_tag(self.to_dict())
+        self.source = source
+        self.loaded_at = time.time()
+        self.skill_matcher = self._build_skill_matcher()
+        self.soft_matcher = self._build_soft_matcher()
+        self.distrib_matcher = self._build_distrib_matcher()
+        # position of every key a JD or resume can produce; bit/column order for feature vectors
+        self.key_index = {k: i for i, k in enumerate(dict.fromkeys(self.distrib_matcher.keys))}
+        # changes whenever any key moves: records built on another key_index can't be read positionally
+        self.key_tag = version_tag(list(self.key_index))
+
+    def to_dict(self) -> dict:
+        return {
+            "skills": self.skills,
+            "synonyms": self.synonyms,
+            "aliases": self.aliases,
+            "blocklist": sorted(self.blocklist),
+            "include_soft_skills": self.include_soft_skills,
+            "soft_skills": self.soft_skills,
+            "soft_synonyms": self.soft_synonyms,
+            "distrib_extras": self.distrib_extras,
+        }
+
+    def _build_skill_matcher(self) -> SkillMatcher:
+        # order matters: skills first, then synonyms, then aliases (evidence priority)
+        entries = [(s, s) for s in self.skills if s not in self.blocklist]
+        for canon, variants in self.synonyms.items():
+            entries.extend((v, canon) for v in variants)
+        entries.extend(self.aliases.items())
+        return SkillMatcher(entries)
+
+    def _build_soft_matcher(self) -> SkillMatcher:
+        entries = [(s, s) for s in self.soft_skills]
+        for canon, variants in self.soft_synonyms.items():
+            entries.extend((v, canon) for v in variants)
+        return SkillMatcher(entries)
+
+    def variants(self, sk: str) -> list[str]:
+        # spellings counted for distribution/section lookup (not the full alias map);
+        # duplicates are kept on purpose: each listed variant is counted
+        return [sk] + self.synonyms.get(sk, []) + self.distrib_extras.get(sk, [])
+
+    def _build_distrib_matcher(self) -> SkillMatcher:
+        # every key a JD can produce, each with its variants in counting order
+        keys = dict.fromkeys(self.skill_matcher.keys + self.soft_matcher.keys)
+        return SkillMatcher((v, k) for k in keys for v in self.variants(k))
+
+    def summary(self) -> dict:
+        return {
+            "version": self.version,
+            "source": self.source,
+            "loaded_at": self.loaded_at,
+            "skills": len(self.skills),
+            "synonyms": len(self.synonyms),
+            "aliases": len(self.aliases),
+            "soft_skills": len(self.soft_skills),
+            "phrases": len(self.skill_matcher) + len(self.soft_matcher),
+        }
+
+
+def _path() -> str:
+    return Config.TAXONOMY_PATH or DEFAULT_PATH
+
+
+def load(path: str | None = None) -> Taxonomy:
+    path = path or _path()
+    with open(path, "r", encoding="utf-8") as f:
+        return Taxonomy(json.load(f), source=path)
+
+
+_current: Taxonomy | None = None
+_mtime = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def _stat(path: str):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def current() -> Taxonomy:
+    """Latest loaded snapshot (loaded on first use)."""
+    if _current is None:
+        reload()
+    return _current
+
+
+def reload(path: str | None = None) -> tuple[Taxonomy, bool]:
+    """
+    Load the file and swap it in. Returns (taxonomy, changed).
+    A broken file raises and leaves the running taxonomy untouched.
+    """
+    global _current, _mtime, _checked_at
+    path = path or _path()
+    with _lock:
+        mtime = _stat(path)
+        new = load(path)
+        _mtime, _checked_at = mtime, time.monotonic()
+        if _current is not None and new.version == _current.version:
+            return _current, False
+        old, _current = _current, new
+    log.info("taxonomy_loaded version=%s previous=%s skills=%d",
+             new.version, old.version if old else None, len(new.skills))
+    return new, True
+
+
+def maybe_reload():
+    """Cheap check, meant for every request: reload when the file changed."""
+    global _checked_at, _mtime
+    poll = Config.TAXONOMY_POLL_S
+    if poll <= 0 or _current is None or time.monotonic() - _checked_at < poll:
+        return
+    _checked_at = time.monotonic()
+    mtime = _stat(_path())
+    if mtime == _mtime:
+        return
+    try:
+        reload()
+    except Exception as e:
+        _mtime = mtime  # report a broken file once, keep serving the last good taxonomy
+        log.error("taxonomy_reload_failed error=%s", e)
+
+
+def save(data: dict, path: str | None = None) -> Taxonomy:
+    """Validate, write atomically (tmp + rename) and load. Other workers see the new mtime."""
+    path = path or _path()
+    tax = Taxonomy(data, source=path)  # raises ValueError before anything is written
+    tmp = f"{path}.tmp.{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"schema": 1, **tax.to_dict()}, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    os.replace(tmp, path)
+    return reload(path)[0]
+
+
+def active() -> Taxonomy:
+    """
+    The snapshot pinned to the current app context (request, streamed response
+    or job), so a reload half way through a scan can't mix two versions.
+    """
+    if not has_app_context():
+        return current()
+    tax = g.get("taxonomy")
+    if tax is None:
+        tax = g.taxonomy = current()
+    return tax
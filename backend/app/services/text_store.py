@@ -0,0 +1,120 @@
+"""
+Content-addressed, compressed storage for the resume / JD bodies of saved scans.
+
+A body is stored once in `resume_texts` or `jd_texts` as {_id: sha256 of the
+text, z: zlib bytes, n: length}; a scan keeps only `resume_ref` / `jd_ref`.
+A JD shared by thousands of scans is one small document, and history pages,
+which never read bodies, stop paging them into memory. Bodies are immutable
+(same hash, same text), so writes are idempotent upserts and decompressed
+bodies are cached per worker. Scans written before the move still carry
+resume_text / jd_text inline; readers accept both.
+"""
+import zlib
+from datetime import datetime
+
+from pymongo import UpdateOne
+
+from app.config import Config
+from app.services.cache import TTLCache, content_hash
+
+# scan field -> (reference field, body collection)
+FIELDS = {"resume_text": ("resume_ref", "resume_texts"), "jd_text": ("jd_ref", "jd_texts")}
+
+_TEXTS = TTLCache(maxsize=Config.TEXT_CACHE_SIZE, ttl=Config.TEXT_CACHE_TTL_S)  # hash -> text
+_STORED = TTLCache(maxsize=Config.TEXT_CACHE_SIZE, ttl=Config.TEXT_CACHE_TTL_S)  # collection:hash known written
+
+
+def compress(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), Config.TEXT_ZLIB_LEVEL)
+
+
+def decompress(z: bytes) -> str:
+    return zlib.decompress(z).decode("utf-8")
+
+
+def pack(docs: list) -> dict:
+    """
+    Swap each doc's inline bodies for references, in place. Returns the body
+    upserts still to write: {collection: {hash: body doc}}, skipping bodies
+    this worker already wrote.
+    """
+    out = {}
+    for d in docs:
+        for field, (ref, coll) in FIELDS.items():
+            text = d.pop(field, None)
+            if text is None:
+                continue
+            h = content_hash(text)
+            d[ref] = h
+            _TEXTS.set(h, text)
+            if _STORED.get(f"{coll}:{h}") is None:
+                out.setdefault(coll, {})[h] = {"z": compress(text), "n": len(text), "created_at": datetime.utcnow()}
+    return out
+
+
+def _upserts(bodies: dict) -> list:
+    return [UpdateOne({"_id": h}, {"$setOnInsert": b}, upsert=True) for h, b in bodies.items()]
+
+
+def _written(bodies_by_coll: dict):
+    for coll, bodies in bodies_by_coll.items():
+        for h in bodies:
+            _STORED.set(f"{coll}:{h}", True)
+
+
+def save(db, bodies_by_coll: dict):
+    """Write pack()'s bodies; call before inserting the scans that reference them."""
+    for coll, bodies in bodies_by_coll.items():
+        db[coll].bulk_write(_upserts(bodies), ordered=False)
+    _written(bodies_by_coll)
+
+
+async def save_async(db, bodies_by_coll: dict):
+    for coll, bodies in bodies_by_coll.items():
+        await db[coll].bulk_write(_upserts(bodies), ordered=False)
+    _written(bodies_by_coll)
+
+
+def _lookup(docs: list, fields) -> tuple[dict, dict]:
+    # (bodies already in memory, {collection: hashes} still to read) for docs without the inline body
+    texts, wanted = {}, {}
+    for d in docs:
+        for field in fields:
+            ref, coll = FIELDS[field]
+            h = d.get(ref)
+            if field in d or not h or h in texts:
+                continue
+            text = _TEXTS.get(h)
+            if text is None:
+                wanted.setdefault(coll, set()).add(h)
+            else:
+                texts[h] = text
+    return texts, wanted
+
+
+def _fill(docs: list, fields, texts: dict, found: list):
+    for b in found:
+        texts[b["_id"]] = decompress(b["z"])
+        _TEXTS.set(b["_id"], texts[b["_id"]])
+    for d in docs:
+        for field in fields:
+            h = d.get(FIELDS[field][0])
+            if field not in d and h:
+                d[field] = texts.get(h, "")
+
+
+def hydrate(db, docs: list, fields=tuple(FIELDS)) -> list:
+    """Put the referenced bodies back on docs (in place), one $in read per collection."""
+    texts, wanted = _lookup(docs, fields)
+    found = [b for coll, hs in wanted.items() for b in db[coll].find({"_id": {"$in": list(hs)}}, {"z": 1})]
+    _fill(docs, fields, texts, found)
+    return docs
+
+
+async def hydrate_async(db, docs: list, fields=tuple(FIELDS)) -> list:
+    texts, wanted = _lookup(docs, fields)
+    found = []
+    for coll, hs in wanted.items():
+        found += await db[coll].find({"_id": {"$in": list(hs)}}, {"z": 1}).to_list(None)
+    _fill(docs, fields, texts, found)
+    return docs
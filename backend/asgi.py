@@ -0,0 +1,23 @@
+"""
+ASGI entry point (async serving mode).
+
+    cd backend && uvicorn asgi:application --host 0.0.0.0 --port 5050 --workers 4
+
+The users/scans hot paths (login, register, save/list/get scans) are served
+natively async with Motor (app/routes/async_api.py). Every other route runs
+the unchanged Flask app on a pool of ASGI_THREADS threads, with PDF parsing
+on its own process pool as before. gunicorn + run:app remains the sync
+deployment; both serve the same API.
+"""
+from a2wsgi import WSGIMiddleware
+
+from app.config import Config
+from app.routes.async_api import AsyncRoutes
+from run import _norm_origin, allowed_origins, app
+
+application = AsyncRoutes(
+    app,
+    fallback=WSGIMiddleware(app, workers=Config.ASGI_THREADS),
+    allowed_origins=allowed_origins,
+    norm_origin=_norm_origin,
+)
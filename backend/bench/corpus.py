@@ -0,0 +1,80 @@
+"""
+Deterministic synthetic resumes and JDs built from the real taxonomy
+(app/taxonomy.json: skills, synonyms, soft skills) and the _HEADINGS patterns,
+so the benchmark exercises the same matching paths as production traffic.
+"""
+import random
+import re
+
+from app.routes import scan as S
+from app.services import taxonomy
+
+_TITLES = ["Software Engineer", "Backend Engineer", "Frontend Engineer", "Data Engineer",
+           "Data Scientist", "ML Engineer", "Full Stack Developer", "Platform Engineer"]
+_VERBS = ["Built", "Designed", "Led", "Shipped", "Migrated", "Maintained", "Owned", "Scaled"]
+_NOUNS = ["services", "pipelines", "dashboards", "APIs", "test suites", "deployments", "data models"]
+_FILLER = ["for 2M users", "cutting latency by 40%", "with a team of five", "across three regions",
+           "ahead of schedule", "in an agile team", "with strong communication"]
+
+
+def heading_variants() -> dict:
+    """section -> heading spellings accepted by the _HEADINGS regexes."""
+    out = {}
+    for name, pat in S._HEADINGS:
+        alts = re.search(r"\((.*)\)", pat).group(1).split("|")
+        out[name] = [a.replace(r"\s+", " ") for a in alts]
+    return out
+
+
+def _skill_mention(rnd, sk):
+    # sometimes use a synonym/alias spelling instead of the canonical name
+    tax = taxonomy.current()
+    variants = tax.synonyms.get(sk, []) + [a for a, c in tax.aliases.items() if c == sk]
+    if variants and rnd.random() < 0.3:
+        return rnd.choice(variants)
+    return sk
+
+
+def make_resume(rnd: random.Random, skills: list, years: int) -> str:
+    heads = heading_variants()
+    lines = [rnd.choice(_TITLES), f"{years}+ years of experience"]
+    middle = ["experience", "projects", "skills"]
+    rnd.shuffle(middle)
+    sections = ["summary"] + middle + ["education", "certifications"]
+    for sec in sections:
+        lines.append(rnd.choice(heads[sec]).title())
+        for _ in range(rnd.randint(2, 6)):
+            used = rnd.sample(skills, k=min(len(skills), rnd.randint(1, 3)))
+            lines.append(f"- {rnd.choice(_VERBS)} {rnd.choice(_NOUNS)} using "
+                         f"{', '.join(_skill_mention(rnd, s) for s in used)} {rnd.choice(_FILLER)}")
+    return "\n".join(lines)
+
+
+def make_jd(rnd: random.Random, required: list, optional: list, years: int) -> str:
+    title = rnd.choice(_TITLES)
+    style = rnd.randrange(3)
+    if style == 0:
+        return f"{title}\nSkills: {', '.join(required + optional)}\n{years}+ years required"
+    if style == 1:
+        return (f"{title}\nAbout the role: {rnd.choice(_VERBS).lower()} {rnd.choice(_NOUNS)}.\n"
+                f"Must-have: {', '.join(required)}, {years}+ years\n"
+                f"Nice to have: {', '.join(optional)}\nWhat you'll do: ship things.")
+    return f"{title} with {years} years of experience in {', '.join(required)} and ideally {', '.join(optional)}."
+
+
+def make_corpus(n: int = 50, seed: int = 7) -> list:
+    """[(id, resume_text, jd_text)]; same n/seed -> same corpus."""
+    rnd = random.Random(seed)
+    tax = taxonomy.current()
+    pool = [s for s in tax.skills if s not in tax.blocklist]
+    out = []
+    for i in range(n):
+        jd_skills = rnd.sample(pool, k=rnd.randint(4, 10))
+        split = rnd.randint(2, len(jd_skills))
+        required, optional = jd_skills[:split], jd_skills[split:]
+        overlap = rnd.sample(jd_skills, k=rnd.randint(0, len(jd_skills)))
+        resume_skills = overlap + rnd.sample(pool, k=rnd.randint(2, 8)) + rnd.sample(tax.soft_skills, k=2)
+        resume = make_resume(rnd, resume_skills, rnd.randint(0, 12))
+        jd = make_jd(rnd, required, optional, rnd.randint(1, 8))
+        out.append((f"case-{i:03d}", resume, jd))
+    return out
@@ -0,0 +1,102 @@
+"""
+Near-duplicate detection benchmark: MinHash/LSH linking vs exact Jaccard.
+
+    cd backend && python -m bench.dedup [--distinct 300] [--copies 3] [--edit 0.03]
+
+Saves --distinct synthetic resumes plus --copies edited copies of each (a
+fraction --edit of the words replaced) in shuffled order, linking every save
+through link_duplicates against an in-memory LSH bucket index, as save_scan
+does against Mongo. Reports signature cost, candidates compared per save
+(vs every earlier resume for a full scan) and, against exact shingle
+Jaccard, copies missed and false links. Exit code 1 when recall drops below 0.95.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("JOB_WORKERS", "0")
+os.environ.setdefault("MONGO_URI", "mongodb://127.0.0.1:27017/resume_screener?serverSelectionTimeoutMS=300")
+
+from bson import ObjectId  # noqa: E402
+
+from app.config import Config  # noqa: E402
+from app.routes.scans import link_duplicates  # noqa: E402
+from app.services import minhash  # noqa: E402
+from bench.corpus import make_corpus  # noqa: E402
+from bench.pipeline import pct  # noqa: E402
+
+
+def _edit(rng: random.Random, text: str, rate: float) -> str:
+    words = text.split(" ")
+    for i in range(len(words)):
+        if rng.random() < rate:
+            words[i] = rng.choice(["strong", "various", "several", "key", "new", "core"])
+    return " ".join(words)
+
+
+def _jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--distinct", type=int, default=300)
+    ap.add_argument("--copies", type=int, default=3)
+    ap.add_argument("--edit", type=float, default=0.03, help="fraction of words replaced per copy")
+    ap.add_argument("--threshold", type=float, default=Config.DEDUP_THRESHOLD)
+    args = ap.parse_args()
+    if not minhash.available():
+        raise SystemExit("dedup needs numpy and DEDUP_ENABLED=1")
+
+    rng = random.Random(5)
+    texts = [r for _, r, _ in make_corpus(args.distinct)]
+    texts += [_edit(rng, texts[i], args.edit) for i in range(args.distinct) for _ in range(args.copies)]
+    rng.shuffle(texts)
+
+    t = time.perf_counter()
+    docs = []
+    for text in texts:
+        sig = minhash.signature(text)
+        docs.append({"_id": ObjectId(), "minhash": sig, "lsh": minhash.band_keys(sig)})
+    sig_ms = (time.perf_counter() - t) * 1000 / len(docs)
+
+    buckets, compared = {}, []
+    t = time.perf_counter()
+    for d in docs:
+        cands = {id(c): c for k in d["lsh"] for c in buckets.get(k, ())}
+        compared.append(len(cands))
+        link_duplicates([d], list(cands.values()), args.threshold)
+        for k in d["lsh"]:
+            buckets.setdefault(k, []).append(d)
+    link_ms = (time.perf_counter() - t) * 1000 / len(docs)
+
+    # exact: the best Jaccard of each save against everything saved before it
+    sh = [minhash.shingles(x) for x in texts]
+    missed = false = should = 0
+    margin = 0.05  # MinHash estimates within a few points of the true Jaccard
+    for i, d in enumerate(docs):
+        best = max((_jaccard(sh[i], sh[j]) for j in range(i)), default=0.0)
+        if best >= args.threshold + margin:
+            should += 1
+            missed += "dup_of" not in d
+        if "dup_of" in d and best < args.threshold - margin:
+            false += 1
+
+    n = len(docs)
+    print(f"{n} saves ({args.distinct} distinct, {args.copies} copies each at {args.edit:.0%} edits), "
+          f"{minhash.PERMS} slots / {minhash.BANDS} bands, threshold {args.threshold}")
+    print(f"signature {sig_ms:.2f} ms/save, link {link_ms:.3f} ms/save")
+    print(f"candidates compared per save: p50={pct(compared, 50)} p99={pct(compared, 99)} max={max(compared)} "
+          f"(full scan: {(n - 1) / 2:.0f} on average)")
+    linked = sum("dup_of" in d for d in docs)
+    recall = 1 - missed / should if should else 1.0
+    print(f"linked {linked}; copies above threshold+{margin}: {should}, missed {missed} (recall {recall:.3f}); "
+          f"false links below threshold-{margin}: {false}")
+    if recall < 0.95:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
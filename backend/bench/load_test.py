@@ -0,0 +1,228 @@
+"""
+Concurrent-user load test: sync (gunicorn + run:app) vs async (uvicorn + asgi:application).
+
+    cd backend && python -m bench.load_test                       # spawn both, compare
+    cd backend && python -m bench.load_test --spawn asgi --users 16,64
+    cd backend && python -m bench.load_test --url http://127.0.0.1:5050   # an already running server
+
+Needs a reachable MongoDB (MONGO_URI); the spawned servers inherit the
+environment. Each virtual user keeps one keep-alive connection and loops
+over a weighted mix: login (bcrypt), history page, open a scan, save a scan
+and a JSON scan (scoring). Reports throughput and p50/p95/p99 per request
+kind and overall for every concurrency level. Both deployments get the same
+number of processes (--procs); the sync one has one thread per process,
+which is what the current gunicorn config runs.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+
+from bench.corpus import make_corpus
+from bench.pipeline import pct
+
+# (kind, weight); history views dominate real traffic, logins are rare but expensive
+MIX = [("list", 40), ("get", 20), ("save", 15), ("scan", 15), ("login", 10)]
+
+USERNAME, PASSWORD = "loadtest_user", "loadtest-password-1"
+
+
+class Client:
+    def __init__(self, base: str):
+        u = urllib.parse.urlparse(base)
+        self.host, self.port = u.hostname, u.port or 80
+        self.conn = None
+        self.token = None
+
+    def request(self, method: str, path: str, body=None) -> tuple[int, dict]:
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection(self.host, self.port, timeout=60)
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        try:
+            self.conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+            r = self.conn.getresponse()
+            raw = r.read()
+        except (OSError, http.client.HTTPException):
+            self.conn.close()
+            self.conn = None
+            raise
+        try:
+            return r.status, json.loads(raw or b"{}")
+        except ValueError:
+            return r.status, {}
+
+
+def setup(base: str, corpus) -> tuple[str, list]:
+    """Register (or reuse) the load-test user, log in, seed a few saved scans."""
+    c = Client(base)
+    c.request("POST", "/api/auth/register", {"username": USERNAME, "password": PASSWORD})
+    status, body = c.request("POST", "/api/auth/login", {"username": USERNAME, "password": PASSWORD})
+    if status != 200:
+        raise SystemExit(f"login failed: HTTP {status} {body}")
+    c.token = body["data"]["access_token"]
+    ids = []
+    for _, resume, jd_text in corpus[:20]:
+        status, body = c.request("POST", "/api/scans/", {
+            "resume_text": resume, "jd_text": jd_text, "result": {"score": 0.5, "matched_skills": [], "missing_skills": []},
+        })
+        if status == 201:
+            ids.append(body["data"]["id"])
+    if not ids:
+        raise SystemExit("could not seed scans")
+    return c.token, ids
+
+
+def _one(c: Client, kind: str, corpus, ids, rng) -> int:
+    _, resume, jd_text = rng.choice(corpus)
+    if kind == "login":
+        return c.request("POST", "/api/auth/login", {"username": USERNAME, "password": PASSWORD})[0]
+    if kind == "list":
+        return c.request("GET", "/api/scans/?limit=20")[0]
+    if kind == "get":
+        return c.request("GET", f"/api/scans/{rng.choice(ids)}")[0]
+    if kind == "save":
+        return c.request("POST", "/api/scans/", {
+            "resume_text": resume, "jd_text": jd_text, "result": {"score": 0.5, "matched_skills": [], "missing_skills": []},
+        })[0]
+    return c.request("POST", "/api/scan/", {"resume_text": resume, "jd_text": jd_text})[0]
+
+
+def run_level(base: str, token: str, ids: list, corpus, users: int, duration: float, seed: int) -> dict:
+    kinds = [k for k, w in MIX for _ in range(w)]
+    lat = {k: [] for k, _ in MIX}
+    errors = {k: 0 for k, _ in MIX}
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def user(i):
+        rng = random.Random(seed + i)
+        c = Client(base)
+        c.token = token
+        mine = {k: [] for k, _ in MIX}
+        bad = {k: 0 for k, _ in MIX}
+        while time.monotonic() < deadline:
+            kind = rng.choice(kinds)
+            t = time.perf_counter()
+            try:
+                status = _one(c, kind, corpus, ids, rng)
+            except Exception:
+                status = 0
+            ms = (time.perf_counter() - t) * 1000
+            if status >= 400 or status == 0:
+                bad[kind] += 1
+            else:
+                mine[kind].append(ms)
+        with lock:
+            for k in lat:
+                lat[k].extend(mine[k])
+                errors[k] += bad[k]
+
+    t0 = time.monotonic()
+    threads = [threading.Thread(target=user, args=(i,)) for i in range(users)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return {"elapsed": time.monotonic() - t0, "lat": lat, "errors": errors}
+
+
+def report(label: str, users: int, res: dict):
+    every = [ms for v in res["lat"].values() for ms in v]
+    n, el = len(every), res["elapsed"]
+    errs = sum(res["errors"].values())
+    print(f"\n[{label}] users={users} requests={n} errors={errs} throughput={n / el:.1f} req/s")
+    print(f"{'kind':>8} {'n':>7} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for kind, vals in list(res["lat"].items()) + [("all", every)]:
+        print(f"{kind:>8} {len(vals):>7} {len(vals) / el:>8.1f} {pct(vals, 50):>8.1f} "
+              f"{pct(vals, 95):>8.1f} {pct(vals, 99):>8.1f}")
+
+
+# ---- servers ----
+def _command(mode: str, port: int, procs: int) -> list[str]:
+    if mode == "sync":
+        return [sys.executable, "-m", "gunicorn", "-w", str(procs), "-b", f"127.0.0.1:{port}", "run:app"]
+    return [sys.executable, "-m", "uvicorn", "asgi:application", "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(procs), "--no-access-log"]
+
+
+def spawn(mode: str, port: int, procs: int) -> subprocess.Popen:
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {**os.environ, "JOB_WORKERS": "0"}
+    p = subprocess.Popen(_command(mode, port, procs), cwd=backend, env=env,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    c = Client(f"http://127.0.0.1:{port}")
+    for _ in range(150):
+        if p.poll() is not None:
+            raise SystemExit(f"{mode} server exited with code {p.returncode}")
+        try:
+            if c.request("GET", "/api/health")[0] == 200:
+                return p
+        except OSError:
+            pass
+        time.sleep(0.2)
+    p.terminate()
+    raise SystemExit(f"{mode} server did not come up on port {port}")
+
+
+def bench(label: str, base: str, corpus, levels, duration, seed):
+    token, ids = setup(base, corpus)
+    run_level(base, token, ids, corpus, 2, min(2.0, duration), seed)  # warm caches and pools
+    out = {}
+    for users in levels:
+        res = run_level(base, token, ids, corpus, users, duration, seed)
+        report(label, users, res)
+        out[users] = res
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--url", help="benchmark a running server instead of spawning")
+    ap.add_argument("--spawn", default="both", choices=("sync", "asgi", "both"))
+    ap.add_argument("--procs", type=int, default=2, help="server processes (gunicorn -w / uvicorn --workers)")
+    ap.add_argument("--port", type=int, default=5061)
+    ap.add_argument("--users", default="1,8,32,64", help="comma separated concurrency levels")
+    ap.add_argument("--duration", type=float, default=10.0, help="seconds per level")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    levels = [int(x) for x in args.users.split(",") if x.strip()]
+    corpus = make_corpus(50)
+
+    if args.url:
+        bench(args.url, args.url, corpus, levels, args.duration, args.seed)
+        return
+
+    modes = ("sync", "asgi") if args.spawn == "both" else (args.spawn,)
+    results = {}
+    for i, mode in enumerate(modes):
+        port = args.port + i
+        proc = spawn(mode, port, args.procs)
+        try:
+            results[mode] = bench(mode, f"http://127.0.0.1:{port}", corpus, levels, args.duration, args.seed)
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+    if len(results) == 2:
+        print(f"\nsync vs asgi, {args.procs} processes each")
+        print(f"{'users':>6} {'sync req/s':>11} {'asgi req/s':>11} {'sync p99':>9} {'asgi p99':>9}")
+        for users in levels:
+            row = []
+            for mode in ("sync", "asgi"):
+                res = results[mode][users]
+                every = [ms for v in res["lat"].values() for ms in v]
+                row.append((len(every) / res["elapsed"], pct(every, 99)))
+            print(f"{users:>6} {row[0][0]:>11.1f} {row[1][0]:>11.1f} {row[0][1]:>9.1f} {row[1][1]:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
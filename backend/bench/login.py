@@ -0,0 +1,112 @@
+"""
+Login throughput per worker: bcrypt verify inline in every request thread vs
+on the bounded CPU pool, at the old and the configured cost.
+
+    cd backend && python -m bench.login [--threads 1,8,32] [--rounds 10,12] [--duration 5]
+    cd backend && python -m bench.login --url http://127.0.0.1:5050 --threads 8,32   # a running server
+
+In-process mode simulates one worker with N request threads logging in
+back to back. "inline" is the old login (passlib bcrypt.verify on the
+request thread, so N hashes compete for the cores); "pool" is the new one
+(passwords.verify through offload.call_cpu, at most CPU_WORKERS at once).
+--rounds compares costs; a hash below BCRYPT_ROUNDS also shows the one-off
+rehash. --url drives POST /api/auth/login over HTTP instead (bench.load_test
+user; needs MongoDB behind the server).
+"""
+import argparse
+import os
+import threading
+import time
+
+os.environ.setdefault("JOB_WORKERS", "0")
+
+from passlib.context import CryptContext  # noqa: E402
+from passlib.hash import bcrypt  # noqa: E402
+
+from app.config import Config  # noqa: E402
+from app.services import passwords  # noqa: E402
+from app.services.offload import call_cpu  # noqa: E402
+from bench.pipeline import pct  # noqa: E402
+
+PASSWORD = "bench-password-1"
+
+
+def run(login, threads: int, duration: float) -> tuple[float, list]:
+    lat, lock = [], threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def user():
+        mine = []
+        while time.monotonic() < deadline:
+            t = time.perf_counter()
+            login()
+            mine.append((time.perf_counter() - t) * 1000)
+        with lock:
+            lat.extend(mine)
+
+    t0 = time.monotonic()
+    ts = [threading.Thread(target=user) for _ in range(threads)]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    return time.monotonic() - t0, lat
+
+
+def report(label: str, threads: int, elapsed: float, lat: list):
+    print(f"{label:>16} threads={threads:<3} logins/s={len(lat) / elapsed:7.1f} "
+          f"p50={pct(lat, 50):7.1f} p99={pct(lat, 99):7.1f} ms")
+
+
+def in_process(levels, rounds, duration):
+    print(f"CPU_WORKERS={Config.CPU_WORKERS} BCRYPT_ROUNDS={Config.BCRYPT_ROUNDS} cores={os.cpu_count()}")
+    for r in rounds:
+        stored = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=r).hash(PASSWORD)
+        t = time.perf_counter()
+        _, new_hash = passwords.verify(PASSWORD, stored)
+        if new_hash:
+            print(f"cost {r}: below BCRYPT_ROUNDS, rehashed on first login in "
+                  f"{(time.perf_counter() - t) * 1000:.0f} ms (verify + new hash)")
+        # the old path keeps the stored cost forever; the new one verifies the upgraded hash
+        current = new_hash or stored
+        for threads in levels:
+            report(f"inline cost={r}", threads, *run(lambda: bcrypt.verify(PASSWORD, stored), threads, duration))
+            report(f"pool cost={max(r, Config.BCRYPT_ROUNDS)}", threads,
+                   *run(lambda: call_cpu(passwords.verify, PASSWORD, current), threads, duration))
+
+
+def over_http(url, levels, duration):
+    from bench.load_test import PASSWORD as PW, USERNAME, Client
+
+    c = Client(url)
+    c.request("POST", "/api/auth/register", {"username": USERNAME, "password": PW})
+    local = threading.local()
+
+    def login():
+        if not hasattr(local, "c"):
+            local.c = Client(url)
+        status, _ = local.c.request("POST", "/api/auth/login", {"username": USERNAME, "password": PW})
+        if status != 200:
+            raise RuntimeError(f"login failed: HTTP {status}")
+
+    login()  # upgrades a cheaper stored hash before timing
+    for threads in levels:
+        report(url, threads, *run(login, threads, duration))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--url", help="benchmark a running server instead")
+    ap.add_argument("--threads", default="1,8,32", help="comma separated request threads")
+    ap.add_argument("--rounds", default=f"10,{Config.BCRYPT_ROUNDS}", help="stored hash costs to compare")
+    ap.add_argument("--duration", type=float, default=5.0, help="seconds per run")
+    args = ap.parse_args()
+    levels = [int(x) for x in args.threads.split(",") if x.strip()]
+    if args.url:
+        over_http(args.url, levels, args.duration)
+    else:
+        in_process(levels, [int(x) for x in args.rounds.split(",") if x.strip()], args.duration)
+
+
+if __name__ == "__main__":
+    main()
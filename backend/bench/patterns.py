@@ -0,0 +1,140 @@
+"""
+Pattern registry micro-benchmark.
+
+    cd backend && python -m bench.patterns [--n 200] [--rounds 5]
+
+1. Registry hit rate: runs JD parsing + scoring over the synthetic corpus and
+   reports how many pattern lookups were served from app.services.patterns
+   without compiling.
+2. Time saved per scan on the regex/text-prep work (sections, JD blocks,
+   years, title tokens, cleaning): the per-call `re.*` + per-helper
+   clean/lowercase style the helpers used before, against the registry +
+   shared _Text. "thrashed" purges re's own cache before every scan, which
+   is what a busy worker with many live patterns sees.
+Skill matching is left out of part 2; it is the same trie matcher either way.
+"""
+import argparse
+import os
+import re
+import statistics
+import time
+
+os.environ.setdefault("SCAN_CACHE_SIZE", "0")
+os.environ.setdefault("SCAN_CACHE_SHARED", "0")
+os.environ.setdefault("PDF_WORKERS", "0")
+os.environ.setdefault("JOB_WORKERS", "0")
+os.environ.setdefault("MONGO_URI", "mongodb://127.0.0.1:27017/resume_screener?serverSelectionTimeoutMS=300")
+
+from app.routes import scan as S  # noqa: E402
+from app.services.patterns import PATTERNS  # noqa: E402
+from bench.corpus import make_corpus  # noqa: E402
+
+_BLOCK_KEYS = [
+    ("must-have", "nice to have", "requirements", "preferred", "what you’ll", "what you'll"),
+    ("nice to have", "must-have", "preferred", "requirements", "what you’ll", "what you'll"),
+]
+
+
+# ---- the previous helper style: string patterns, every helper re-cleans its input ----
+def _legacy_clean(s):
+    return re.sub(r"\s+", " ", (s or "")).strip()
+
+
+def _legacy_slice(text_lc, start_key, *end_keys):
+    m = re.search(re.escape(start_key.lower()), text_lc)
+    if not m:
+        return None
+    start, end = m.end(), len(text_lc)
+    for k in end_keys:
+        m2 = re.search(re.escape(k.lower()), text_lc[start:])
+        if m2:
+            end = start + m2.start()
+            break
+    return text_lc[start:end].strip() or None
+
+
+def _legacy_tokens(text):
+    line = (_legacy_clean(text).split("\n") or [""])[0][:120].lower()
+    return {t for t in re.split(r"[^a-z0-9#+]+", line) if t and t not in S._STOP}
+
+
+def _legacy_years(text):
+    return [int(m.group(1)) for m in re.finditer(r"(\d+)\s*(\+)?\s*(years|year|yrs)", (text or "").lower())]
+
+
+def legacy_scan(resume, jd_text):
+    # JD side
+    t = _legacy_clean(jd_text).lower()
+    re.search(r"\bskills?\s*:\s*([^\n]+)", t)
+    for keys in _BLOCK_KEYS:
+        _legacy_slice(t, *keys)
+    _legacy_clean(jd_text).lower()  # fallback skill pass
+    _legacy_years(jd_text)
+    _legacy_tokens(jd_text)
+    _legacy_clean(jd_text).lower()  # jd_hash
+    # resume side
+    _legacy_clean(resume).lower()  # skill extraction
+    lc = resume.lower()
+    for _, pat in S._HEADINGS:
+        list(re.finditer(pat, lc, flags=re.MULTILINE))
+    S._lc_keep_offsets(resume)  # occurrence table
+    _legacy_tokens(resume)
+    _legacy_years(resume)
+
+
+def registry_scan(resume, jd_text):
+    jd = S._Text(jd_text)
+    t = jd.clean_lc
+    S._SKILLS_LINE.search(t)
+    for keys in _BLOCK_KEYS:
+        S._slice_block(t, *keys)
+    S._extract_years(jd)
+    S._first_line_tokens(jd)
+    S.jd_hash(jd)
+    doc = S._Text(resume)
+    doc.clean_lc
+    S._section_spans(doc)
+    doc.lc_offsets
+    S._first_line_tokens(doc)
+    S._extract_years(doc)
+
+
+def _per_scan_ms(fn, corpus, rounds, purge):
+    out = []
+    for _ in range(rounds):
+        for _, resume, jd_text in corpus:
+            if purge:
+                re.purge()
+            t = time.perf_counter()
+            fn(resume, jd_text)
+            out.append((time.perf_counter() - t) * 1000)
+    return statistics.mean(out)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=200)
+    ap.add_argument("--rounds", type=int, default=5)
+    args = ap.parse_args()
+    corpus = make_corpus(args.n)
+
+    # warm up matchers/taxonomy so only steady-state lookups are counted
+    for _, resume, jd_text in corpus[:5]:
+        S._score_resume(resume, S.build_job_profile(jd_text))
+    PATTERNS.reset_stats()
+    for _, resume, jd_text in corpus:
+        S._score_resume(resume, S.build_job_profile(jd_text))
+    st = PATTERNS.stats()
+    print(f"registry: {st['patterns']} patterns, {st['hits']} hits / {st['misses']} misses "
+          f"(hit rate {st['hit_rate']}), {st['hits'] / len(corpus):.1f} lookups per scan")
+
+    print(f"\nregex + text prep per scan (ms), {len(corpus)} cases x {args.rounds}")
+    print(f"{'':>10} {'legacy':>9} {'registry':>9} {'saved':>7}")
+    for label, purge in (("warm", False), ("thrashed", True)):
+        old = _per_scan_ms(legacy_scan, corpus, args.rounds, purge)
+        new = _per_scan_ms(registry_scan, corpus, args.rounds, purge)
+        print(f"{label:>10} {old:9.4f} {new:9.4f} {100 * (old - new) / old:6.1f}%")
+
+
+if __name__ == "__main__":
+    main()
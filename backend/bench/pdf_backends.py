@@ -0,0 +1,113 @@
+"""
+Compare PDF backends: pages/sec, peak RSS and text correctness.
+
+    cd backend && python -m bench.pdf_backends [--corpus DIR] [--rounds 3]
+
+Each backend runs in its own fresh process so peak RSS is not shared.
+Without --corpus a synthetic set of resumes (1-3 pages) plus one 20 page
+document is used and correctness is the share of source words found in the
+extracted text. With --corpus DIR (*.pdf) correctness is the share of
+documents whose detected skills match the pypdf2 baseline (the old path).
+"""
+import argparse
+import glob
+import logging
+import multiprocessing
+import os
+import resource
+import time
+from collections import Counter
+
+from app.services import pdf_extractor
+from bench.samples import make_pdf, sample_pages
+
+
+def _synthetic():
+    docs = []
+    for i, pages in enumerate([1, 2, 2, 3, 1, 2, 3, 20]):
+        words = Counter(" ".join(" ".join(p) for p in sample_pages(pages, seed=i)).split())
+        docs.append((make_pdf(pages, seed=i), words))
+    return docs
+
+
+def _skills(text):
+    from app.routes.scan import _extract_skills_with_evidence
+    return _extract_skills_with_evidence(text)[0]
+
+
+def _run(backend, corpus_dir, rounds, baseline):
+    logging.disable(logging.WARNING)  # fallback/parser warnings are counted, not printed
+    if corpus_dir:
+        docs = [(open(p, "rb").read(), None) for p in sorted(glob.glob(os.path.join(corpus_dir, "*.pdf")))]
+    else:
+        docs = _synthetic()
+
+    try:
+        pdf_extractor.extract_pages(make_pdf(1), backends=[backend])  # import + warm up
+    except RuntimeError as e:
+        return {"backend": backend, "error": str(e)}
+
+    pages, failed, score, t0 = 0, 0, [], time.perf_counter()
+    for r in range(rounds):
+        for i, (data, words) in enumerate(docs):
+            try:
+                texts = pdf_extractor.extract_pages(data, backends=[backend])
+            except RuntimeError:
+                failed += r == 0
+                continue
+            pages += len(texts)
+            if r:
+                continue
+            got = "\n".join(texts)
+            if words is not None:
+                found = Counter(got.split())
+                score.append(sum(min(c, found[w]) for w, c in words.items()) / max(1, sum(words.values())))
+            elif baseline is not None:
+                score.append(1.0 if _skills(got) == baseline[i] else 0.0)
+    elapsed = time.perf_counter() - t0
+    return {
+        "backend": backend,
+        "pages_per_sec": pages / elapsed if elapsed else 0.0,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "correct": sum(score) / len(score) if score else None,
+        "failed": failed,
+    }
+
+
+def _baseline(corpus_dir):
+    logging.disable(logging.WARNING)
+    out = []
+    for p in sorted(glob.glob(os.path.join(corpus_dir, "*.pdf"))):
+        try:
+            out.append(_skills("\n".join(pdf_extractor.extract_pages(open(p, "rb").read(), backends=["pypdf2"]))))
+        except RuntimeError:
+            out.append(None)
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", help="directory of sample resume PDFs")
+    ap.add_argument("--rounds", type=int, default=3)
+    ap.add_argument("--backends", default=",".join(pdf_extractor.BACKENDS))
+    args = ap.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    baseline = None
+    if args.corpus:
+        with ctx.Pool(1) as p:
+            baseline = p.apply(_baseline, (args.corpus,))
+
+    print(f"{'backend':>8} {'pages/s':>9} {'peak MB':>8} {'correct':>8} {'failed':>6}")
+    for name in pdf_extractor.parse_backends(args.backends):
+        with ctx.Pool(1, maxtasksperchild=1) as p:
+            r = p.apply(_run, (name, args.corpus, args.rounds, baseline))
+        if "error" in r:
+            print(f"{name:>8}  {r['error']}")
+            continue
+        correct = "-" if r["correct"] is None else f"{r['correct']:.3f}"
+        print(f"{name:>8} {r['pages_per_sec']:>9.1f} {r['peak_rss_mb']:>8.1f} {correct:>8} {r['failed']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Latency of PDF extraction for 1, 20 and 200 page documents.
+
+    cd backend && python -m bench.pdf_extraction [--workers 4] [--runs 5]
+
+inline  = configured backend (PDF_BACKEND) in the calling thread
+pool    = whole document in one pool worker
+split   = pages split across all pool workers
+wall is what the request waits; cpu is what the request thread itself
+burns (time the gunicorn worker holds the GIL).
+"""
+import argparse
+import statistics
+import time
+
+from app.config import Config
+from app.services import extraction
+from bench.samples import make_pdf
+
+
+def _measure(fn, runs):
+    walls, cpus = [], []
+    fn()  # warm up (backend imports in this process and in every pool worker)
+    for _ in range(runs):
+        w0, c0 = time.perf_counter(), time.thread_time()
+        fn()
+        cpus.append(time.thread_time() - c0)
+        walls.append(time.perf_counter() - w0)
+    return statistics.median(walls) * 1000, statistics.median(cpus) * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--pages", type=int, nargs="*", default=[1, 20, 200])
+    args = ap.parse_args()
+
+    Config.PDF_WORKERS = args.workers
+    extraction.get_pool().submit(int).result()  # spawn workers before timing
+
+    print(f"workers={args.workers} runs={args.runs} (median ms)")
+    print(f"{'pages':>6} {'mode':>7} {'wall':>9} {'cpu':>9}")
+    for n in args.pages:
+        doc = make_pdf(n)
+        modes = {
+            "inline": lambda: extraction._extract_pages(doc),
+            "pool": lambda: extraction.extract_pdf_text(doc, split_pages=0),
+            "split": lambda: extraction.extract_pdf_text(doc, split_pages=1),
+        }
+        for name, fn in modes.items():
+            wall, cpu = _measure(fn, args.runs)
+            print(f"{n:>6} {name:>7} {wall:>9.1f} {cpu:>9.1f}")
+    extraction.shutdown_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Scan pipeline benchmark with a golden score file.
+
+    cd backend && python -m bench.pipeline            # timings + golden check
+    cd backend && python -m bench.pipeline --update   # accept current scores as golden
+
+Per-stage timings call the scan.py helpers directly on a synthetic corpus
+(bench/corpus.py). End-to-end latency goes through the Flask test client
+with the result cache and the resume analysis store off. Scores for every corpus case are compared with
+bench/golden.json so speed work can't silently change results. Exit code 1
+on any golden mismatch.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+# no mongo needed: cache tiers and the resume analysis store off (every scan
+# analyses its resume), fail fast if anything still tries to connect
+os.environ.setdefault("SCAN_CACHE_SIZE", "0")
+os.environ.setdefault("SCAN_CACHE_SHARED", "0")
+os.environ.setdefault("RESUME_CACHE_SIZE", "0")
+os.environ.setdefault("RESUME_STORE_SHARED", "0")
+os.environ.setdefault("PDF_WORKERS", "0")
+os.environ.setdefault("JOB_WORKERS", "0")
+os.environ.setdefault("MONGO_URI", "mongodb://127.0.0.1:27017/resume_screener?serverSelectionTimeoutMS=300")
+
+from app.routes import scan as S  # noqa: E402
+from app.services import extraction  # noqa: E402
+from bench.corpus import make_corpus  # noqa: E402
+from bench.samples import pdf_from_pages  # noqa: E402
+
+GOLDEN = os.path.join(os.path.dirname(__file__), "golden.json")
+
+
+def pct(values, p):
+    if not values:
+        return 0.0
+    s = sorted(values)
+    return s[min(len(s) - 1, int(round(p / 100 * (len(s) - 1))))]
+
+
+def _timed(fn, *args):
+    t = time.perf_counter()
+    out = fn(*args)
+    return out, (time.perf_counter() - t) * 1000
+
+
+def stage_timings(corpus, rounds):
+    stages = {k: [] for k in ("pdf_parse", "skills", "jd_parse", "sections", "distribution",
+                              "title_years", "semantic", "score_total")}
+    pdfs = [pdf_from_pages([resume.split("\n")]) for _, resume, _ in corpus]
+    for _ in range(rounds):
+        for (_, resume, jd_text), pdf in zip(corpus, pdfs):
+            _, ms = _timed(extraction.extract_pdf_text, pdf)
+            stages["pdf_parse"].append(ms)
+            _, ms = _timed(S._extract_skills_with_evidence, resume)
+            stages["skills"].append(ms)
+            prof, ms = _timed(S.build_job_profile, jd_text)  # uncached on purpose
+            stages["jd_parse"].append(ms)
+            spans, ms = _timed(S._section_spans, resume)
+            stages["sections"].append(ms)
+            _, ms = _timed(S._occurrence_table, resume, spans)
+            stages["distribution"].append(ms)
+            t = time.perf_counter()  # as analyze_resume + _score_analysis do it
+            S._title_overlap(S._expand_roles(S._first_line_tokens(resume)), prof.title)
+            S._years_fit(S._extract_years(resume), prof.years)
+            stages["title_years"].append((time.perf_counter() - t) * 1000)
+            _, ms = _timed(S._semantic_sims, [resume], prof)
+            stages["semantic"].append(ms)
+            _, ms = _timed(S._score_resume, resume, prof)
+            stages["score_total"].append(ms)
+    return stages
+
+
+def end_to_end(corpus, rounds):
+    from flask_jwt_extended import create_access_token
+    from run import app
+
+    client = app.test_client()
+    with app.app_context():
+        token = create_access_token(identity="000000000000000000000000")
+    headers = {"Authorization": f"Bearer {token}"}
+    lat, scores = [], {}
+    for _ in range(rounds):
+        for cid, resume, jd_text in corpus:
+            t = time.perf_counter()
+            r = client.post("/api/scan/", json={"resume_text": resume, "jd_text": jd_text}, headers=headers)
+            lat.append((time.perf_counter() - t) * 1000)
+            if r.status_code != 200:
+                raise SystemExit(f"{cid}: HTTP {r.status_code} {r.get_data(as_text=True)[:200]}")
+            d = r.get_json()["data"]
+            scores[cid] = {"score": d["score"], "breakdown": d["breakdown"]}
+    return lat, scores
+
+
+def check_golden(scores) -> list:
+    if not os.path.exists(GOLDEN):
+        print("no golden file yet; run with --update")
+        return []
+    with open(GOLDEN, "r", encoding="utf-8") as f:
+        golden = json.load(f)
+    if golden.get("taxonomy_version") != S.taxonomy_version():
+        print(f"note: golden taxonomy {golden.get('taxonomy_version')} != current {S.taxonomy_version()}")
+    bad = []
+    for cid, want in golden["cases"].items():
+        got = scores.get(cid)
+        if got != want:
+            bad.append((cid, want, got))
+    return bad
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cases", type=int, default=50)
+    ap.add_argument("--rounds", type=int, default=5)
+    ap.add_argument("--update", action="store_true", help="write current scores as the golden file")
+    args = ap.parse_args()
+
+    corpus = make_corpus(args.cases)
+
+    print(f"per-stage (ms) over {args.cases} cases x {args.rounds} rounds")
+    print(f"{'stage':>13} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for name, vals in stage_timings(corpus, args.rounds).items():
+        print(f"{name:>13} {pct(vals, 50):>8.3f} {pct(vals, 95):>8.3f} {pct(vals, 99):>8.3f}")
+
+    lat, scores = end_to_end(corpus, args.rounds)
+    print(f"\nend-to-end POST /api/scan/ (ms): p50={pct(lat, 50):.2f} "
+          f"p95={pct(lat, 95):.2f} p99={pct(lat, 99):.2f} mean={statistics.mean(lat):.2f}")
+
+    if args.update:
+        with open(GOLDEN, "w", encoding="utf-8") as f:
+            json.dump({"taxonomy_version": S.taxonomy_version(), "semantic": S.USE_SEMANTIC,
+                       "cases": scores}, f, indent=1, sort_keys=True)
+            f.write("\n")
+        print(f"\nwrote {len(scores)} golden cases to {GOLDEN}")
+        return
+
+    bad = check_golden(scores)
+    for cid, want, got in bad[:10]:
+        print(f"GOLDEN MISMATCH {cid}: want {want} got {got}")
+    if bad:
+        sys.exit(1)
+    print("\ngolden: all cases match")
+
+
+if __name__ == "__main__":
+    main()
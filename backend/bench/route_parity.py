@@ -0,0 +1,154 @@
+"""
+PDF-path scoring check: what the scan routes return for an uploaded PDF.
+
+    cd backend && python -m bench.route_parity [--cases 40]
+
+Each synthetic resume (bench/corpus.py) is rendered to a PDF and posted to
+POST /api/scan through the Flask test client (caches and the analysis store
+off). The result must equal _score_resume on the text as extracted: section
+headings only survive in its line breaks, so the check also counts the cases
+where scoring the whitespace-collapsed text would have changed the section
+weighting (distribution), to show the comparison is sensitive to it.
+
+Then the same PDFs go against one JD to /api/scan one at a time, and as one
+multipart upload to /api/scan/batch and /api/scan/batch/stream; every
+resume must score the same on all three. Last, /batch/stream must rank like
+/batch: its final top-K (ids, scores, tie order) equals /batch?top=K, for
+the multipart PDFs and for the same resumes as a JSON body. Exit code 1 on
+any mismatch.
+"""
+import argparse
+import io
+import json
+import os
+import sys
+
+os.environ.setdefault("SCAN_CACHE_SIZE", "0")
+os.environ.setdefault("SCAN_CACHE_SHARED", "0")
+os.environ.setdefault("RESUME_CACHE_SIZE", "0")
+os.environ.setdefault("RESUME_STORE_SHARED", "0")
+os.environ.setdefault("PDF_WORKERS", "0")
+os.environ.setdefault("JOB_WORKERS", "0")
+os.environ.setdefault("MONGO_URI", "mongodb://127.0.0.1:27017/resume_screener?serverSelectionTimeoutMS=300")
+
+from app.routes import scan as S  # noqa: E402
+from app.services import extraction  # noqa: E402
+from bench.corpus import make_corpus  # noqa: E402
+from bench.samples import pdf_from_pages  # noqa: E402
+
+
+def _scored(d: dict) -> dict:
+    return {"score": d["score"], "breakdown": d["breakdown"]}
+
+
+def _client():
+    from flask_jwt_extended import create_access_token
+    from run import app
+
+    with app.app_context():
+        token = create_access_token(identity="000000000000000000000000")
+    return app.test_client(), {"Authorization": f"Bearer {token}"}
+
+
+def scan_pdf(client, headers, pdf: bytes, jd_text: str) -> dict:
+    r = client.post("/api/scan/", headers=headers, content_type="multipart/form-data",
+                    data={"jd_text": jd_text, "file": (io.BytesIO(pdf), "resume.pdf", "application/pdf")})
+    if r.status_code != 200:
+        raise SystemExit(f"/api/scan: HTTP {r.status_code} {r.get_data(as_text=True)[:200]}")
+    return _scored(r.get_json()["data"])
+
+
+def _files(pdfs: dict) -> list:
+    return [(io.BytesIO(pdf), f"{cid}.pdf", "application/pdf") for cid, pdf in pdfs.items()]
+
+
+def _post(client, headers, route: str, pdfs: dict | None, texts: dict | None, jd_text: str):
+    # the same resumes as a multipart PDF upload or a JSON body
+    if pdfs is not None:
+        r = client.post(route, headers=headers, content_type="multipart/form-data",
+                        data={"jd_text": jd_text, "files": _files(pdfs)})
+    else:
+        r = client.post(route, headers=headers, json={
+            "jd_text": jd_text, "resumes": [{"id": cid, "resume_text": t} for cid, t in texts.items()]})
+    if r.status_code != 200:
+        raise SystemExit(f"{route}: HTTP {r.status_code} {r.get_data(as_text=True)[:200]}")
+    return r
+
+
+def batch(client, headers, jd_text: str, k: int, pdfs=None, texts=None) -> tuple[dict, list]:
+    """({id: score}, top-k [(id, score)]) from /api/scan/batch."""
+    results = _post(client, headers, "/api/scan/batch", pdfs, texts, jd_text).get_json()["data"]["results"]
+    return ({d["id"].removesuffix(".pdf"): _scored(d) for d in results},
+            [(d["id"], d["score"]) for d in results[:k]])
+
+
+def stream(client, headers, jd_text: str, k: int, pdfs=None, texts=None) -> tuple[dict, list]:
+    """Same from /api/scan/batch/stream?top=k: result events and the final leaderboard."""
+    r = _post(client, headers, f"/api/scan/batch/stream?top={k}", pdfs, texts, jd_text)
+    events = [json.loads(line) for line in r.get_data(as_text=True).splitlines() if line.strip()]
+    done = next(e for e in events if e["event"] == "done")
+    return ({e["id"].removesuffix(".pdf"): _scored(e) for e in events if e["event"] == "result"},
+            [(t["id"], t["score"]) for t in done["top"]])
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cases", type=int, default=40)
+    args = ap.parse_args()
+
+    corpus = make_corpus(args.cases)
+    client, headers = _client()
+    bad, sectioned = [], 0
+    for cid, resume, jd_text in corpus:
+        pdf = pdf_from_pages([resume.split("\n")])
+        text = extraction.extract_pdf_text(pdf)
+        prof = S.job_profile(S._clean(jd_text))
+        want = _scored(S._score_resume(text, prof))
+        flat = S._score_resume(S._clean(text), prof)["breakdown"]["distribution"]
+        sectioned += flat != want["breakdown"]["distribution"]
+        got = scan_pdf(client, headers, pdf, jd_text)
+        if got != want:
+            bad.append((cid, want, got))
+
+    print(f"{len(corpus)} PDF uploads: section weighting decides the distribution score in {sectioned}")
+    for cid, want, got in bad[:10]:
+        print(f"PDF MISMATCH {cid} /api/scan: want {want} got {got}")
+
+    jd_text = corpus[0][2]
+    pdfs = {cid: pdf_from_pages([resume.split("\n")]) for cid, resume, _ in corpus}
+    single = {cid: scan_pdf(client, headers, pdf, jd_text) for cid, pdf in pdfs.items()}
+    k = 10
+    (b_scores, b_top), (s_scores, s_top) = (batch(client, headers, jd_text, k, pdfs=pdfs),
+                                            stream(client, headers, jd_text, k, pdfs=pdfs))
+    routes = {"/api/scan/batch": b_scores, "/api/scan/batch/stream": s_scores}
+    differ = 0
+    for route, got in routes.items():
+        for cid, want in single.items():
+            if got.get(cid) != want:
+                differ += 1
+                if differ <= 10:
+                    print(f"ROUTE MISMATCH {cid} {route}: /api/scan {want} got {got.get(cid)}")
+    print(f"{len(pdfs)} PDFs against one JD: /api/scan, /batch and /batch/stream "
+          + ("agree" if not differ else f"disagree on {differ} scores"))
+
+    texts = {cid: resume for cid, resume, _ in corpus}
+    tops = {"multipart PDF": (b_top, s_top),
+            "JSON text": (batch(client, headers, jd_text, k, texts=texts)[1],
+                          stream(client, headers, jd_text, k, texts=texts)[1])}
+    ranked = 0
+    for body, (want, got) in tops.items():
+        if got != want:
+            ranked += 1
+            print(f"RANK MISMATCH {body}: /batch top {k} {want}, /batch/stream {got}")
+    print(f"/batch/stream top {k} " + ("matches /batch" if not ranked else "differs from /batch")
+          + f" for {', '.join(tops)}")
+
+    if bad or differ or ranked or not sectioned:
+        if not sectioned:
+            print("no case depends on section headings; check the corpus")
+        sys.exit(1)
+    print("PDFs are scored on the extracted text, headings intact, the same on every route")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# synthetic sample documents for the benchmarks (no external fixtures needed)
+import random
+
+_WORDS = [
+    "built", "designed", "shipped", "maintained", "services", "pipelines", "team",
+    "python", "flask", "docker", "kubernetes", "react", "postgresql", "aws", "api",
+    "latency", "tests", "customers", "platform", "migrated", "owned", "improved",
+]
+
+
+def _esc(s: str) -> str:
+    return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def sample_pages(pages: int, lines_per_page: int = 45, seed: int = 0) -> list[list[str]]:
+    """The text lines make_pdf writes on each page (same args -> same text)."""
+    rnd = random.Random(seed)
+    return [
+        [f"Page {p + 1}"] + [" ".join(rnd.choice(_WORDS) for _ in range(12)) for _ in range(lines_per_page)]
+        for p in range(pages)
+    ]
+
+
+def make_pdf(pages: int, lines_per_page: int = 45, seed: int = 0) -> bytes:
+    """A plain-text PDF (Helvetica, one content stream per page)."""
+    return pdf_from_pages(sample_pages(pages, lines_per_page, seed))
+
+
+def pdf_from_pages(page_lines: list[list[str]]) -> bytes:
+    """PDF with the given lines on each page (latin-1 text only)."""
+    objs = []  # bodies; object n is objs[n-1]
+
+    def add(body: bytes) -> int:
+        objs.append(body)
+        return len(objs)
+
+    catalog = add(b"")  # filled in below
+    pages_id = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    kids = []
+    for lines in page_lines:
+        ops = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+        ops += [f"({_esc(line)}) '" for line in lines]
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", "replace")
+        content = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        kids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_id, font, content)
+        ))
+    objs[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+    objs[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids), len(kids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (i, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+    for off in offsets:
+        out += b"%010d 00000 n \n" % off
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs) + 1, catalog, xref)
+    return bytes(out)
@@ -0,0 +1,83 @@
+"""
+Resume x JD matrix benchmark: M x N calls to the scan rubric vs one score_matrix.
+
+    cd backend && python -m bench.score_matrix [--resumes 200] [--jds 20]
+
+The per-pair path is what M x N POST /api/scan/ requests cost without caches:
+analyse the resume and parse the JD for every cell. The matrix path analyses
+each resume and parses each JD once, then scores the whole grid with
+score_matrix (plus semantic_grid when semantic scoring is on). Every cell is
+checked against _score_analysis; exit code 1 means the grid drifted.
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SCAN_CACHE_SIZE", "0")
+os.environ.setdefault("SCAN_CACHE_SHARED", "0")
+os.environ.setdefault("PDF_WORKERS", "0")
+os.environ.setdefault("JOB_WORKERS", "0")
+os.environ.setdefault("MONGO_URI", "mongodb://127.0.0.1:27017/resume_screener?serverSelectionTimeoutMS=300")
+
+from app.routes import scan as S  # noqa: E402
+from bench.corpus import make_corpus  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--resumes", type=int, default=200)
+    ap.add_argument("--jds", type=int, default=20)
+    ap.add_argument("--pairs", type=int, default=400, help="cells timed on the per-pair path (extrapolated)")
+    args = ap.parse_args()
+
+    corpus = make_corpus(max(args.resumes, args.jds))
+    resumes = [r for _, r, _ in corpus[:args.resumes]]
+    jd_texts = [j for _, _, j in corpus[:args.jds]]
+    cells = len(resumes) * len(jd_texts)
+
+    # per pair: analyse + parse every time, as independent scan requests would
+    n = min(args.pairs, cells)
+    t = time.perf_counter()
+    for c in range(n):
+        i, j = divmod(c, len(jd_texts))
+        a = S.analyze_resume(resumes[i])
+        prof = S.build_job_profile(jd_texts[j])
+        S._score_analysis(a, prof, S._analysis_sim(a, prof) if S.USE_SEMANTIC else None)
+    per_cell = (time.perf_counter() - t) / n
+    print(f"per pair: {per_cell * 1000:.2f} ms/cell, {per_cell * cells:.1f} s for {len(resumes)} x {len(jd_texts)}"
+          f"{' (extrapolated)' if n < cells else ''}")
+
+    t = time.perf_counter()
+    analyses = [S.analyze_resume(r) for r in resumes]
+    profiles = [S.build_job_profile(j) for j in jd_texts]
+    t_extract = time.perf_counter() - t
+    t = time.perf_counter()
+    sem = S.semantic_grid(analyses, profiles)
+    parts, jd = S.score_matrix(analyses, profiles, sem)
+    t_grid = time.perf_counter() - t
+    total = t_extract + t_grid
+    print(f"matrix: extract {t_extract * 1000:.0f} ms + grid {t_grid * 1000:.1f} ms = {total:.2f} s "
+          f"({per_cell * cells / total:.0f}x)")
+
+    bad = edge = 0
+    for i, a in enumerate(analyses):
+        for j, prof in enumerate(profiles):
+            want = S._score_analysis(a, prof, None if sem is None else float(sem[i, j]))
+            want = {"score": want["score"], **want["breakdown"]}
+            got = {"score": round(float(parts["score"][i, j]), 4), **S.grid_breakdown(parts, i, j, jd)}
+            if got != want:
+                # the scalar rubric sums in set order, so a value on a rounding edge may be one unit off
+                drift = max(abs(got[k] - want[k]) for k in want) if got.keys() == want.keys() else 1.0
+                if drift > 1.5e-4:
+                    bad += 1
+                else:
+                    edge += 1
+    if bad:
+        print(f"MISMATCH: {bad} of {cells} cells differ from _score_analysis")
+        sys.exit(1)
+    print(f"all {cells} cells match _score_analysis ({edge} one rounding unit apart)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Talent-pool ranking benchmark: one JD against a large pool of saved resumes.
+
+    cd backend && python -m bench.talent_pool [--size 100000] [--distinct 500] [--jds 10] [--top 20]
+
+Feature records are built as a save builds them (summary_fields on the raw
+text; every other resume saved as extracted from a PDF) from --distinct
+synthetic resumes (bench/corpus.py); the pool repeats them up to --size rows. Reports pool build time, then per JD the vectorized
+rubric + top-K time and, for semantic mode, how many rows the lexical bounds
+leave for the exact rerank. Scores (with semantic similarity when enabled)
+are checked against what /api/scan returns for every distinct resume
+(_score_analysis of analysis_text); exit code 1 means the pool and the
+scan disagree.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SCAN_CACHE_SIZE", "0")
+os.environ.setdefault("SCAN_CACHE_SHARED", "0")
+os.environ.setdefault("PDF_WORKERS", "0")
+os.environ.setdefault("JOB_WORKERS", "0")
+os.environ.setdefault("MONGO_URI", "mongodb://127.0.0.1:27017/resume_screener?serverSelectionTimeoutMS=300")
+
+import numpy as np  # noqa: E402
+
+from app.routes import pool as P  # noqa: E402
+from app.routes import scan as S  # noqa: E402
+from app.routes.scans import summary_fields  # noqa: E402
+from app.services import semantic, taxonomy  # noqa: E402
+from app.services.talent_pool import TalentPool  # noqa: E402
+from bench.corpus import make_corpus  # noqa: E402
+from bench.pipeline import pct  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=100000)
+    ap.add_argument("--distinct", type=int, default=500)
+    ap.add_argument("--jds", type=int, default=10)
+    ap.add_argument("--top", type=int, default=20)
+    args = ap.parse_args()
+
+    corpus = make_corpus(max(args.distinct, args.jds))
+    resumes = [resume for _, resume, _ in corpus[:args.distinct]]
+    sources = ["pdf" if i % 2 else "text" for i in range(len(resumes))]
+    analyses = [S.analyze_resume(S.analysis_text(r, src)) for r, src in zip(resumes, sources)]  # as /api/scan sees them
+    feats = [summary_fields(r, "", {}, src)["features"] for r, src in zip(resumes, sources)]  # as a save stores them
+    vecs = np.stack([semantic.embed(a.text, S._STOP) for a in analyses]) if S.USE_SEMANTIC else None
+
+    rng = random.Random(3)
+    picks = [rng.randrange(len(feats)) for _ in range(args.size)]
+    picks[:len(feats)] = range(len(feats))  # every distinct resume at least once, at its own row
+    t = time.perf_counter()
+    pool = TalentPool(S.taxonomy_version(), len(taxonomy.current().key_index)).extended(
+        [(n, feats[i]) for n, i in enumerate(picks)])
+    print(f"pool: {len(pool)} rows built in {(time.perf_counter() - t) * 1000:.0f} ms "
+          f"({pool.bits.nbytes + pool.occ_val.nbytes * 3 + pool.title_tok.nbytes * 2 + pool.years.nbytes >> 20} MB)")
+
+    lat, cands, bad, edge = [], [], 0, 0
+    for _, _, jd_text in corpus[:args.jds]:
+        prof = S.build_job_profile(jd_text)
+        t = time.perf_counter()
+        jd = S.jd_arrays([prof])
+        parts = P._pool_grid(pool, jd, prof)
+        P._top(parts["score"][:, 0], args.top)
+        lat.append((time.perf_counter() - t) * 1000)
+
+        if S.USE_SEMANTIC:
+            lo = P._pool_grid(pool, jd, prof, sem=np.zeros(len(pool)))["score"][:, 0]
+            hi = P._pool_grid(pool, jd, prof, sem=np.full(len(pool), S._SEM_FULL_AT))["score"][:, 0]
+            kth = -np.partition(-lo, args.top - 1)[args.top - 1]
+            cands.append(int((hi >= kth).sum()))
+
+        # every distinct resume (rows 0..distinct-1) must score exactly as its scan did
+        sims = semantic.similarity(vecs, S._jd_vector(prof)).astype(float) if vecs is not None else None
+        check = P._pool_grid(pool, jd, prof, rows=np.arange(len(analyses)), sem=sims)
+        for row, a in enumerate(analyses):
+            want = S._score_analysis(a, prof, None if sims is None else float(sims[row]))
+            got = {"score": round(float(check["score"][row, 0]), 4), **S.grid_breakdown(check, row, 0, jd)}
+            want = {"score": want["score"], **want["breakdown"]}
+            if got != want:
+                # sums run in a different order than the scalar loop (set order), so a
+                # value sitting on a rounding edge may land one unit apart
+                drift = max(abs(got[k] - want[k]) for k in want) if got.keys() == want.keys() else 1.0
+                if drift > 1.5e-4:
+                    bad += 1
+                else:
+                    edge += 1
+
+    print(f"rank {len(pool)} rows, top {args.top}, {len(lat)} JDs (ms): "
+          f"p50={pct(lat, 50):.1f} max={max(lat):.1f}")
+    if cands:
+        print(f"semantic rerank candidates per JD: p50={pct(cands, 50)} max={max(cands)} "
+              f"(cap POOL_RERANK_MAX={P.Config.POOL_RERANK_MAX})")
+    if bad:
+        print(f"MISMATCH: {bad} pool scores differ from the scan scores")
+        sys.exit(1)
+    print(f"scores match the scan scores for {len(analyses)} resumes x {len(lat)} JDs "
+          f"({edge} one rounding unit apart)")
+
+
+if __name__ == "__main__":
+    main()
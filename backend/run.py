@@ -4,8 +4,11 @@ from flask import request, make_response
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from pymongo import MongoClient
+from app.services import metrics, taxonomy
 from app.routes.scan import scan_bp
 from app.config import Config
+from app.utils.responses import fail
+import hmac
 import logging
 from app.routes.scans import scans_bp
 import os
@@ -40,11 +43,29 @@ CORS(
     resources={r"/api/*": {"origins": list(allowed_origins)}},
     supports_credentials=False,  # using Bearer tokens, not cookies
     methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["Content-Type", "Authorization"],
-    expose_headers=["Authorization"],
+    allow_headers=["Content-Type", "Authorization", "X-Admin-Token"],
+    expose_headers=["Authorization", "X-Cache", "X-Cache-Tier", "Server-Timing"],
 )
 
 
+@app.before_request
+def _start_timer():
+    metrics.start_request()
+
+
+@app.before_request
+def _refresh_taxonomy():
+    # picks up an edited/uploaded taxonomy file without restarting workers
+    taxonomy.maybe_reload()
+
+
+@app.after_request
+def _record_timing(resp):
+    # route template, not the raw path, keeps label cardinality bounded
+    rule = request.url_rule.rule if request.url_rule else "unmatched"
+    return metrics.finish_request(resp, rule, request.method)
+
+
 @app.after_request
 def _add_cors_headers(resp):
     try:
@@ -53,7 +74,7 @@ def _add_cors_headers(resp):
             resp.headers["Access-Control-Allow-Origin"] = origin
             # Tells caches that responses vary by Origin (prevents caching bugs)
             resp.headers["Vary"] = "Origin"
-            resp.headers["Access-Control-Allow-Headers"] = "Authorization, Content-Type"
+            resp.headers["Access-Control-Allow-Headers"] = "Authorization, Content-Type, X-Admin-Token"
             resp.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
     finally:
         return resp
@@ -73,7 +94,7 @@ jwt = JWTManager(app)
 
 # --- Mongo connection ---
 mongo_uri = app.config["MONGO_URI"]
-client = MongoClient(mongo_uri)
+client = MongoClient(mongo_uri, event_listeners=[metrics.MongoTimingListener()] if metrics.ENABLED else [])
 
 # Prefer explicit name from config; otherwise parse from URI and strip any query part
 db_name = app.config.get("MONGO_DB_NAME")
@@ -83,6 +104,9 @@ if not db_name:
 
 app.config["MONGO_DB"] = client[db_name]
 
+# --- Skill taxonomy (fail fast on a broken file) ---
+taxonomy.current()
+
 # --- Ensure indexes (inside app context) ---
 try:
     from app.models.db import ensure_indexes
@@ -94,7 +118,25 @@ except Exception as e:
 # --- Health + home routes ---
 @app.get("/api/health")
 def health():
-    return jsonify({"status": "ok"}), 200
+    from app.models.db import missing_indexes
+    try:
+        indexes = {"missing": missing_indexes()}
+    except Exception as e:
+        indexes = {"error": str(e)}
+    status = "ok" if indexes.get("missing") == [] else "degraded"
+    return jsonify({"status": status, "indexes": indexes, "taxonomy_version": taxonomy.current().version}), 200
+
+@app.get("/api/metrics")
+def metrics_endpoint():
+    # same shared-secret gate as /api/admin; scrapers can send it as a bearer token
+    token = app.config.get("METRICS_TOKEN") or app.config.get("ADMIN_TOKEN") or ""
+    if not token:
+        return fail("metrics are disabled", 403)
+    sent = request.headers.get("X-Admin-Token") or request.headers.get("Authorization", "").removeprefix("Bearer ")
+    if not hmac.compare_digest(sent, token):
+        return fail("forbidden", 403)
+    # prometheus text exposition format
+    return metrics.render(), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
 
 @app.get("/")
 def home():
@@ -102,9 +144,20 @@ def home():
 
 # --- Blueprints ---
 from app.routes.auth import auth_bp
+from app.routes.postings import postings_bp
+from app.routes.jobs import jobs_bp, QUEUE as scan_jobs
+from app.routes.admin import admin_bp
+from app.routes.pool import pool_bp
 app.register_blueprint(auth_bp)
 app.register_blueprint(scan_bp)
 app.register_blueprint(scans_bp)
+app.register_blueprint(postings_bp)
+app.register_blueprint(jobs_bp)
+app.register_blueprint(admin_bp)
+app.register_blueprint(pool_bp)
+
+# background scan workers; also picks up jobs left queued by a previous run
+scan_jobs.start(app)
 
 if __name__ == "__main__":
     print(app.url_map)
@@ -0,0 +1,67 @@
+"""
+Backfill the write-time fields (skills, score, counts, previews, pool features,
+MinHash/LSH keys) on older scans.
+
+    cd backend && python -m scripts.backfill_scan_fields [--batch 500] [--dry-run]
+
+Safe to re-run: only documents missing one of the fields are touched. Scans
+getting their first MinHash are linked to near-duplicates like new saves,
+in _id (save) order.
+"""
+import argparse
+import logging
+
+from pymongo import UpdateOne
+
+from app.routes.scans import find_duplicates, summary_fields
+from app.services import minhash, text_store
+
+log = logging.getLogger("resume_backend")
+
+_MISSING = {"$or": [{"skills": {"$exists": False}}, {"resume_preview": {"$exists": False}},
+                    {"features": {"$exists": False}}]}
+if minhash.available():
+    _MISSING["$or"].append({"minhash": {"$exists": False}})
+_PROJECTION = {"user_id": 1, "minhash": 1, "resume_text": 1, "jd_text": 1, "resume_ref": 1, "jd_ref": 1, "result.score": 1,
+               "result.matched_skills": 1, "result.missing_skills": 1, "resume_source": 1}
+
+
+def backfill(col, batch: int = 500, dry_run: bool = False) -> int:
+    done, last_id = 0, None
+    while True:
+        q = dict(_MISSING)
+        if last_id is not None:
+            q["_id"] = {"$gt": last_id}
+        docs = list(col.find(q, _PROJECTION).sort("_id", 1).limit(batch))
+        if not docs:
+            return done
+        text_store.hydrate(col.database, docs)
+        fields = [{"_id": d["_id"], **summary_fields(d.get("resume_text", ""), d.get("jd_text", ""), d.get("result") or {},
+                                                     d.get("resume_source", "text"))}
+                  for d in docs]
+        by_user = {}
+        for d, f in zip(docs, fields):
+            if "minhash" not in d and "minhash" in f:
+                by_user.setdefault(d["user_id"], []).append(f)
+        for uid, new in by_user.items():
+            find_duplicates(col, uid, new)  # sets dup_of / dup_score on the matches
+        ops = [UpdateOne({"_id": f.pop("_id")}, {"$set": f}) for f in fields]
+        if not dry_run:
+            col.bulk_write(ops, ordered=False)
+        done += len(ops)
+        last_id = docs[-1]["_id"]
+        log.info("backfill_scan_fields batch=%s total=%s", len(ops), done)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--batch", type=int, default=500)
+    ap.add_argument("--dry-run", action="store_true")
+    args = ap.parse_args()
+
+    from run import app
+    from app.models.db import scans_col
+
+    with app.app_context():
+        n = backfill(scans_col(), args.batch, args.dry_run)
+    print(f"backfilled {n} scans" + (" (dry run)" if args.dry_run else ""))
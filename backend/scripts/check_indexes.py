@@ -0,0 +1,73 @@
+"""
+Verify that every query path in scans.py / auth.py / postings.py / jobs.py / pool.py
+and the scan text store is served by an index.
+
+    cd backend && python -m scripts.check_indexes
+
+Runs explain() on each query shape against the configured database and
+exits non-zero if any winning plan contains a COLLSCAN or an in-memory SORT.
+"""
+import sys
+from datetime import datetime
+
+from bson import ObjectId
+
+from app.routes.scans import _DEDUP_PROJECTION
+
+
+def _stages(plan):
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for v in plan.values():
+            yield from _stages(v)
+    elif isinstance(plan, list):
+        for v in plan:
+            yield from _stages(v)
+
+
+def query_paths(db):
+    uid, oid = ObjectId(), ObjectId()
+    return {
+        "auth.login/register": db.users.find({"username": "someone"}).limit(1),
+        "scans.list_scans": db.scans.find({"user_id": uid}).sort([("created_at", -1), ("_id", -1)]).limit(21),
+        "scans.list_scans_cursor": db.scans.find({"user_id": uid, "$or": [
+            {"created_at": {"$lt": datetime.utcnow()}},
+            {"created_at": datetime.utcnow(), "_id": {"$lt": oid}},
+        ]}).sort([("created_at", -1), ("_id", -1)]).limit(21),
+        "scans.get_scan": db.scans.find({"_id": oid, "user_id": uid}).limit(1),
+        "scans.search_scans": db.scans.find({"user_id": uid, "skills": {"$all": ["python", "docker"]}})
+                                     .sort("created_at", -1).limit(21),
+        "scans.dedup_lookup": db.scans.find({"user_id": uid, "lsh": {"$in": ["0:ab", "1:cd"]}}, _DEDUP_PROJECTION),
+        "pool.load": db.scans.find({"user_id": uid, "_id": {"$gt": oid}}, {"features": 1}).sort("_id", 1),
+        "text_store.hydrate": db.resume_texts.find({"_id": {"$in": ["a" * 64, "b" * 64]}}, {"z": 1}),
+        "scan_cache.get": db.scan_cache.find({"_id": "v:a:b"}).limit(1),
+        "resume_analyses.load": db.resume_analyses.find({"_id": "r", "user_id": str(uid)}).limit(1),
+        "postings.list": db.postings.find({"user_id": uid}).sort("created_at", -1).limit(100),
+        "postings.register": db.postings.find({"user_id": uid, "jd_hash": "x"}).limit(1),
+        "postings.get": db.postings.find({"_id": oid, "user_id": uid}).limit(1),
+        "scan_jobs.sweep": db.scan_jobs.find({"status": "queued", "run_after": {"$lte": datetime.utcnow()}, "$or": [
+            {"dispatched_until": {"$exists": False}}, {"dispatched_until": {"$lt": datetime.utcnow()}},
+        ]}, {"_id": 1}).sort("run_after", 1).limit(100),
+    }
+
+
+def check(db) -> list[str]:
+    bad = []
+    for name, cursor in query_paths(db).items():
+        plan = cursor.explain().get("queryPlanner", {}).get("winningPlan", {})
+        stages = set(_stages(plan))
+        flagged = stages & {"COLLSCAN", "SORT"}
+        print(f"{'FAIL' if flagged else 'ok  '} {name}: {', '.join(sorted(stages))}")
+        if flagged:
+            bad.append(name)
+    return bad
+
+
+if __name__ == "__main__":
+    from run import app
+    from app.models.db import get_db
+
+    with app.app_context():
+        failed = check(get_db())
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,85 @@
+"""
+Import saved scans from a JSON array or NDJSON file (or stdin).
+
+    cd backend && python -m scripts.import_scans scans.ndjson --user alice [--chunk 500] [--dry-run]
+    cd backend && cat export.json | python -m scripts.import_scans - --user 652f0c...
+
+Each record is {resume_text, jd_text, result[, created_at]}, validated and
+truncated like POST /api/scans/. NDJSON is read line by line, so the file
+never has to fit in memory. Writes go straight to Mongo with
+insert_many(ordered=False) in --chunk sized batches; failed records are
+listed by their position in the input.
+"""
+import argparse
+import json
+import sys
+import time
+
+from bson import ObjectId
+
+from app.routes.scans import insert_scans, ndjson_records
+
+
+def _records(f, fmt: str):
+    if fmt == "auto":
+        head = f.read(1)
+        while head and head.isspace():
+            head = f.read(1)
+        fmt = "json" if head == "[" else "ndjson"
+        lines = _prepend(head, f)
+    else:
+        lines = f
+    if fmt == "json":
+        data = json.loads("".join(lines))
+        if not isinstance(data, list):
+            raise SystemExit("expected a json array of scans")
+        return ((r, None) for r in data)
+    return ndjson_records(lines)
+
+
+def _prepend(first: str, f):
+    # give back the character auto-detection consumed
+    line = f.readline()
+    yield first + line
+    yield from f
+
+
+def _user_id(users, ref: str) -> str:
+    if ObjectId.is_valid(ref) and users.find_one({"_id": ObjectId(ref)}, {"_id": 1}):
+        return ref
+    u = users.find_one({"username": ref.strip().lower()}, {"_id": 1})
+    if not u:
+        raise SystemExit(f"no such user: {ref}")
+    return str(u["_id"])
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("path", help="json/ndjson file, or - for stdin")
+    ap.add_argument("--user", required=True, help="owner: username or user id")
+    ap.add_argument("--format", default="auto", choices=("auto", "json", "ndjson"))
+    ap.add_argument("--chunk", type=int, default=None, help="documents per insert_many (default BULK_CHUNK_SIZE)")
+    ap.add_argument("--dry-run", action="store_true", help="validate only")
+    ap.add_argument("--show-errors", type=int, default=20)
+    args = ap.parse_args()
+
+    from run import app
+    from app.models.db import scans_col, users_col
+
+    f = sys.stdin if args.path == "-" else open(args.path, "r", encoding="utf-8")
+    with app.app_context():
+        uid = _user_id(users_col(), args.user)
+        chunk = args.chunk or app.config["BULK_CHUNK_SIZE"]
+        t0 = time.perf_counter()
+        results, inserted = insert_scans(scans_col(), uid, _records(f, args.format), chunk, args.dry_run)
+        elapsed = time.perf_counter() - t0
+    if f is not sys.stdin:
+        f.close()
+
+    errors = [r for r in results if "error" in r]
+    for r in errors[:args.show_errors]:
+        print(f"record {r['index']}: {r['error']}", file=sys.stderr)
+    verb = "validated" if args.dry_run else "imported"
+    print(f"{verb} {inserted} scans, {len(errors)} failed, {elapsed:.1f}s "
+          f"({inserted / elapsed * 60 if elapsed else 0:.0f}/min, chunk={chunk})")
+    sys.exit(1 if errors else 0)
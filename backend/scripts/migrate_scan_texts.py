@@ -0,0 +1,125 @@
+"""
+Move the resume / JD bodies of saved scans into the content-addressed text collections.
+
+    cd backend && python -m scripts.migrate_scan_texts [--batch 500] [--dry-run]
+    cd backend && python -m scripts.migrate_scan_texts --inline     # undo: copy bodies back onto scans
+
+Scans are rewritten in _id order, --batch at a time: bodies are upserted
+first (idempotent), then each scan gets resume_ref / jd_ref and loses
+resume_text / jd_text, so a run can be stopped and started again at any
+point. Prints collection sizes (collStats) before and after, and the BSON
+bytes of the rewritten scans plus the compressed bodies written.
+"""
+import argparse
+import logging
+
+import bson
+from pymongo import UpdateOne
+
+from app.services import text_store
+
+log = logging.getLogger("resume_backend")
+
+_INLINE = {"$or": [{"resume_text": {"$exists": True}}, {"jd_text": {"$exists": True}}]}
+_REFS = {"$or": [{"resume_ref": {"$exists": True, "$ne": None}}, {"jd_ref": {"$exists": True, "$ne": None}}]}
+_COLLECTIONS = ("scans", "resume_texts", "jd_texts")
+
+
+def sizes(db) -> dict:
+    """collection -> (documents, data bytes, storage bytes); None where collStats is unavailable."""
+    out = {}
+    for name in _COLLECTIONS:
+        try:
+            s = db.command("collStats", name)
+            out[name] = (s.get("count", 0), s.get("size", 0), s.get("storageSize", 0))
+        except Exception:
+            out[name] = None
+    return out
+
+
+def migrate(db, batch: int = 500, dry_run: bool = False) -> dict:
+    col = db["scans"]
+    stats = {"scans": 0, "before": 0, "after": 0, "bodies": 0, "body_bytes": 0}
+    seen = set()  # collection:hash counted so far; a dry run never marks bodies written, so pack() repeats them
+    last_id = None
+    while True:
+        q = dict(_INLINE)
+        if last_id is not None:
+            q["_id"] = {"$gt": last_id}
+        docs = list(col.find(q).sort("_id", 1).limit(batch))
+        if not docs:
+            return stats
+        stats["before"] += sum(len(bson.encode(d)) for d in docs)
+        bodies = text_store.pack(docs)  # docs now hold refs instead of bodies
+        stats["after"] += sum(len(bson.encode(d)) for d in docs)
+        for coll, coll_bodies in bodies.items():
+            for h, b in coll_bodies.items():
+                if f"{coll}:{h}" not in seen:
+                    seen.add(f"{coll}:{h}")
+                    stats["bodies"] += 1
+                    stats["body_bytes"] += len(b["z"])
+        ops = [UpdateOne({"_id": d["_id"]}, {
+            "$set": {ref: d[ref] for ref, _ in text_store.FIELDS.values() if ref in d},
+            "$unset": {field: "" for field in text_store.FIELDS},
+        }) for d in docs]
+        if not dry_run:
+            text_store.save(db, bodies)
+            col.bulk_write(ops, ordered=False)
+        stats["scans"] += len(docs)
+        last_id = docs[-1]["_id"]
+        log.info("migrate_scan_texts batch=%d total=%d", len(docs), stats["scans"])
+
+
+def inline(db, batch: int = 500, dry_run: bool = False) -> int:
+    col = db["scans"]
+    done, last_id = 0, None
+    while True:
+        q = {**_REFS, "resume_text": {"$exists": False}}
+        if last_id is not None:
+            q["_id"] = {"$gt": last_id}
+        docs = list(col.find(q, {"resume_ref": 1, "jd_ref": 1}).sort("_id", 1).limit(batch))
+        if not docs:
+            return done
+        text_store.hydrate(db, docs)
+        ops = [UpdateOne({"_id": d["_id"]}, {
+            "$set": {field: d[field] for field in text_store.FIELDS if field in d},
+            "$unset": {ref: "" for ref, _ in text_store.FIELDS.values()},
+        }) for d in docs]
+        if not dry_run:
+            col.bulk_write(ops, ordered=False)
+        done += len(docs)
+        last_id = docs[-1]["_id"]
+        log.info("inline_scan_texts batch=%d total=%d", len(docs), done)
+
+
+def _print_sizes(label: str, s: dict):
+    for name, v in s.items():
+        print(f"{label:>7} {name:<13} " + ("collStats n/a" if v is None else
+              f"docs={v[0]} size={v[1] / 2**20:.1f}MB storage={v[2] / 2**20:.1f}MB"))
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--batch", type=int, default=500)
+    ap.add_argument("--dry-run", action="store_true", help="measure only, write nothing")
+    ap.add_argument("--inline", action="store_true", help="copy bodies back onto the scans (undo)")
+    args = ap.parse_args()
+
+    from run import app
+    from app.models.db import get_db
+
+    with app.app_context():
+        db = get_db()
+        _print_sizes("before", sizes(db))
+        if args.inline:
+            n = inline(db, args.batch, args.dry_run)
+            print(f"inlined {n} scans" + (" (dry run)" if args.dry_run else ""))
+        else:
+            st = migrate(db, args.batch, args.dry_run)
+            saved = st["before"] - st["after"]
+            print(f"rewrote {st['scans']} scans" + (" (dry run)" if args.dry_run else "") +
+                  f": {st['before'] / 2**20:.1f}MB -> {st['after'] / 2**20:.1f}MB of scan documents "
+                  f"(-{saved / 2**20:.1f}MB), {st['bodies']} distinct bodies written "
+                  f"({st['body_bytes'] / 2**20:.1f}MB compressed)")
+        if not args.dry_run:
+            _print_sizes("after", sizes(db))
@@ -4,29 +4,35 @@ import api from "../api";
 
 export default function History() {
   const [items, setItems] = useState([]);
+  const [cursor, setCursor] = useState(null);
   const [err, setErr] = useState("");
   const nav = useNavigate();
 
-const handleLoadInScanner=(item)=>{
-  const prefill={
-    mode:"text",
-    resumetext:item.resume_text || "",
-    jdText:item.jd_text || "",
+  // list returns summaries only; full texts come from /api/scans/<id>
+  const loadPage = async (after) => {
+    try {
+      const { data } = await api.get("/api/scans/", { params: { limit: 50, cursor: after || undefined } });
+      const raw = data?.data ?? data;
+      const page = Array.isArray(raw?.items) ? raw.items : [];
+      setItems((prev) => (after ? [...prev, ...page] : page));
+      setCursor(raw?.next_cursor || null);
+    } catch (e) {
+      setErr(e?.friendly || "Could not load history");
+    }
+  };
+
+  const loadInScanner = async (id) => {
+    try {
+      const { data } = await api.get(`/api/scans/${id}`);
+      const it = data?.data ?? data;
+      nav("/scan", { state: { resume_text: it.resume_text, jd_text: it.jd_text }});
+    } catch (e) {
+      setErr(e?.friendly || "Could not load scan");
+    }
   };
-  
-  Navigate("/scan",{state:{prefill}});
-}
 
   useEffect(() => {
-    (async () => {
-      try {
-        const { data } = await api.get("/api/scans/?limit=50");
-        const raw = data?.data ?? data;
-        setItems(Array.isArray(raw?.items) ? raw.items : []);
-      } catch (e) {
-        setErr(e?.friendly || "Could not load history");
-      }
-    })();
+    loadPage(null);
   }, []);
   
   
@@ -51,15 +57,16 @@ const handleLoadInScanner=(item)=>{
                     </div>
                   </div>
                   <div style={{ display: "flex", alignItems: "center", gap: 8 }}>
-                    <button onClick={() => {
-                      nav("/scan", { state: { resume_text: it.resume_text, jd_text: it.jd_text }});
-                    }}>Load in scanner</button>
+                    <button onClick={() => loadInScanner(it.id)}>Load in scanner</button>
                   </div>
                 </div>
               </li>
             ))}
           </ul>
         )}
+        {cursor && (
+          <button style={{ marginTop: 8 }} onClick={() => loadPage(cursor)}>Load more</button>
+        )}
       </div>
     </div>
   );
@@ -11,6 +11,8 @@ export default function Scan() {
   const [busy, setBusy] = useState(false);
   const [err, setErr] = useState("");
   const [res, setRes] = useState(null);
+  // server-side analysis of the last scanned resume; rescans with only a new JD reuse it
+  const [resumeRef, setResumeRef] = useState(null);
 
   const location = useLocation(); // <-- add this
 
@@ -39,10 +41,23 @@ export default function Scan() {
     setErr("");
     setRes(null);
     setBusy(true);
+    const inputKey = mode === "pdf" ? file : resumeText;
     try {
       let axiosResp;
 
-      if (mode === "pdf") {
+      if (resumeRef && resumeRef.mode === mode && resumeRef.key === inputKey) {
+        try {
+          axiosResp = await api.post(
+            "/api/scan/",
+            { resume_id: resumeRef.id, jd_text: jdText },
+            { headers: { "Content-Type": "application/json" } }
+          );
+        } catch (e) {
+          if (e?.response?.status !== 404) throw e; // expired: send the resume again below
+        }
+      }
+
+      if (!axiosResp && mode === "pdf") {
         if (!file) {
           setBusy(false);
           return setErr("Choose a PDF");
@@ -53,7 +68,7 @@ export default function Scan() {
         axiosResp = await api.post("/api/scan/", fd, {
           headers: { "Content-Type": "multipart/form-data" },
         });
-      } else {
+      } else if (!axiosResp) {
         const body = { resume_text: resumeText, jd_text: jdText };
         axiosResp = await api.post("/api/scan/", body, {
           headers: { "Content-Type": "application/json" },
@@ -71,6 +86,7 @@ export default function Scan() {
         }
       }
       if (!raw) throw new Error("Bad response format from server");
+      if (raw.resume_id) setResumeRef({ mode, key: inputKey, id: raw.resume_id });
 
       const normalized = {
         score: Number(raw.score ?? 0),